@@ -0,0 +1,6 @@
+"""Reproducible performance benchmarks for prycat.
+
+Run ``python -m benchmarks`` from a checkout; see ``--help``. ``fakeadb``
+is the synthetic logcat source the ingest benchmarks (and manual testing
+with ``prycat --adb-path benchmarks/fakeadb.py``) read from.
+"""
@@ -0,0 +1,46 @@
+"""Run the benchmark suite: python -m benchmarks [-o results.json]"""
+
+import argparse
+import dataclasses
+import sys
+
+from .suite import BENCHMARKS, Config, run, to_json
+
+
+def main() -> int:
+    defaults = Config()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measure prycat's ingest, model, refilter and export performance",
+    )
+    parser.add_argument("-o", "--output", default=None, metavar="PATH", help="Write the JSON results to PATH (default: stdout)")
+    parser.add_argument(
+        "--only", default="", metavar="NAMES", help=f"Comma-separated benchmarks to run: {', '.join(BENCHMARKS)}"
+    )
+    parser.add_argument("--lines", type=int, default=defaults.lines, help=f"Lines per run and model size (default: {defaults.lines})")
+    parser.add_argument("--batch", type=int, default=defaults.batch, help=f"Lines per append_batch (default: {defaults.batch})")
+    parser.add_argument("--tags", type=int, default=defaults.tags, help=f"Distinct tags (default: {defaults.tags})")
+    parser.add_argument(
+        "--message-length", type=int, default=defaults.message_length,
+        help=f"Median message length (default: {defaults.message_length})",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help=f"Random seed (default: {defaults.seed})")
+    parser.add_argument("--repeat", type=int, default=defaults.repeat, help=f"Refilter repetitions (default: {defaults.repeat})")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    config = Config(**{f.name: getattr(args, f.name) for f in dataclasses.fields(Config)})
+
+    document = to_json(run(config, names))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(document + "\n")
+    else:
+        print(document)
+    return 0
+
+
+sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""A stand-in ``adb`` that emits synthetic logcat, for benchmarks and demos.
+
+Point prycat at it with ``--adb-path benchmarks/fakeadb.py``. It answers
+``devices``, ``track-devices``, ``shell pidof``, ``shell getprop
+persist.sys.timezone`` (UTC) and ``logcat`` (threadtime text, or
+``logger_entry`` records for ``exec-out logcat -B``; ``--pid`` is
+honoured, other logcat options are ignored). prycat builds the adb
+command line itself, so the stream is configured through the
+environment:
+
+    PRYCAT_FAKE_RATE      lines per second; 0 writes as fast as the pipe takes (default: 2000)
+    PRYCAT_FAKE_LINES     lines to write before exiting; 0 runs until killed (default: 0)
+    PRYCAT_FAKE_TAGS      number of distinct tags (default: 200)
+    PRYCAT_FAKE_MESSAGE   median message length in characters (default: 80)
+    PRYCAT_FAKE_SEED      random seed; equal settings give equal output (default: 1)
+    PRYCAT_FAKE_DEVICES   comma-separated serials to report (default: fake-0001)
+    PRYCAT_FAKE_PACKAGE   package whose PID ``pidof`` reports (default: com.example.app)
+
+Run directly it also works as a generator, e.g.
+``PRYCAT_FAKE_LINES=1000000 PRYCAT_FAKE_RATE=0 benchmarks/fakeadb.py logcat > capture.log``.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import struct
+import sys
+import time
+
+_EPOCH = 1_700_000_000  # 2023-11-14 22:13:20 UTC, so timestamps are stable
+_POOL = 1 << 14         # distinct lines generated before the stream repeats
+_CHUNK = 512            # lines per write
+
+# Real tags first, so small cardinalities still look like a device
+_COMMON_TAGS = [
+    "ActivityManager", "PackageManager", "WindowManager", "InputDispatcher", "chatty",
+    "Zygote", "SurfaceFlinger", "AudioFlinger", "ConnectivityService", "wpa_supplicant",
+    "OkHttp", "System.err", "AndroidRuntime", "libc", "Choreographer", "BluetoothAdapter",
+]
+_WORDS = (
+    "start stop resume pause bind unbind request response timeout retry connect "
+    "disconnect socket buffer frame vsync surface layer binder thread handler looper "
+    "callback intent activity service provider receiver package process memory heap "
+    "alloc free cache hit miss load store key value token session user config update"
+).split()
+# Share of lines per priority V, D, I, W, E, F
+_PRIORITY_WEIGHTS = [10, 38, 33, 12, 6, 1]
+
+
+def _processes(rng: random.Random) -> list[int]:
+    """PIDs of the logging processes; the first is the package's."""
+    return [rng.randrange(1000, 32000) for _ in range(48)]
+
+
+class LogcatGenerator:
+    """Deterministic synthetic logcat lines.
+
+    Tags follow a Zipf distribution over ``tags`` names, as a handful of
+    system tags dominate real logs; message lengths are log-normal around
+    ``message_length``, capped at the 4 KB logger limit; a few dozen
+    processes with several threads each do the logging. A pool of line
+    bodies is generated once and cycled with fresh timestamps, so the
+    generator itself is never the bottleneck.
+    """
+
+    def __init__(self, tags: int = 200, message_length: int = 80, seed: int = 1, package: str = "com.example.app"):
+        rng = random.Random(seed)
+        names = _COMMON_TAGS[:tags] + [f"Tag{i:04d}" for i in range(max(0, tags - len(_COMMON_TAGS)))]
+        zipf = [1 / (rank + 1) for rank in range(len(names))]
+        pids = _processes(rng)
+        self.package = package
+        self.entries: list[tuple[int, int, int, str, str]] = []  # (pid, tid, priority, tag, message)
+        for _ in range(_POOL):
+            pid = rng.choice(pids)
+            tid = pid + rng.randrange(0, 24)
+            priority = rng.choices(range(6), _PRIORITY_WEIGHTS)[0]
+            tag = rng.choices(names, zipf)[0]
+            length = min(4000, max(8, int(rng.lognormvariate(math.log(message_length), 0.6))))
+            words = []
+            size = 0
+            while size < length:
+                word = rng.choice(_WORDS) if rng.random() < 0.8 else str(rng.randrange(100_000))
+                words.append(word)
+                size += len(word) + 1
+            self.entries.append((pid, tid, priority, tag, " ".join(words)[:length]))
+        self._text = [f"{pid:5d} {tid:5d} {'VDIWEF'[p]} {tag}: {msg}\n" for pid, tid, p, tag, msg in self.entries]
+
+    def text(self, start: int, count: int, rate: float) -> str:
+        """Lines ``start`` to ``start + count`` of the stream as threadtime text."""
+        step = 1 / rate if rate > 0 else 0.0001
+        out = []
+        pool = self._text
+        second, stamp = -1, ""
+        for i in range(start, start + count):
+            t = i * step
+            if int(t) != second:
+                second = int(t)
+                stamp = time.strftime("%m-%d %H:%M:%S", time.gmtime(_EPOCH + second))
+            out.append(f"{stamp}.{int((t - second) * 1000):03d} {pool[i % len(pool)]}")
+        return "".join(out)
+
+    def binary(self, start: int, count: int, rate: float) -> bytes:
+        """The same lines as ``logger_entry`` v4 records (``logcat -B``)."""
+        step = 1 / rate if rate > 0 else 0.0001
+        header = struct.Struct("<HHiiIIII")
+        out = []
+        for i in range(start, start + count):
+            pid, tid, priority, tag, message = self.entries[i % len(self.entries)]
+            t = i * step
+            payload = bytes([priority + 2]) + tag.encode() + b"\0" + message.encode() + b"\0"
+            out.append(header.pack(len(payload), 28, pid, tid, _EPOCH + int(t), int((t % 1) * 1e9), 0, 10000 + pid % 100))
+            out.append(payload)
+        return b"".join(out)
+
+    def only_pid(self, pid: int) -> None:
+        """Keep just the lines of ``pid``, as ``logcat --pid`` does."""
+        keep = [i for i, entry in enumerate(self.entries) if entry[0] == pid]
+        self.entries = [self.entries[i] for i in keep]
+        self._text = [self._text[i] for i in keep]
+
+    @classmethod
+    def from_environment(cls) -> LogcatGenerator:
+        return cls(
+            tags=int(os.environ.get("PRYCAT_FAKE_TAGS", 200)),
+            message_length=int(os.environ.get("PRYCAT_FAKE_MESSAGE", 80)),
+            seed=int(os.environ.get("PRYCAT_FAKE_SEED", 1)),
+            package=os.environ.get("PRYCAT_FAKE_PACKAGE", "com.example.app"),
+        )
+
+
+def _logcat(argv: list[str], binary: bool) -> None:
+    generator = LogcatGenerator.from_environment()
+    if "--pid" in argv:
+        generator.only_pid(int(argv[argv.index("--pid") + 1]))
+    rate = float(os.environ.get("PRYCAT_FAKE_RATE", 2000))
+    total = int(os.environ.get("PRYCAT_FAKE_LINES", 0))
+    out = sys.stdout.buffer
+    started = time.monotonic()
+    sent = 0
+    while not total or sent < total:
+        count = _CHUNK if not total else min(_CHUNK, total - sent)
+        if rate > 0:
+            # Sleep until this chunk is due, so the rate holds on average
+            due = started + (sent + count) / rate
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        out.write(generator.binary(sent, count, rate) if binary else generator.text(sent, count, rate).encode())
+        out.flush()
+        sent += count
+
+
+def main(argv: list[str]) -> int:
+    devices = [d for d in os.environ.get("PRYCAT_FAKE_DEVICES", "fake-0001").split(",") if d]
+    if "-s" in argv:  # the serial doesn't change what is emitted
+        i = argv.index("-s")
+        del argv[i : i + 2]
+    command = argv[0] if argv else ""
+    try:
+        if command == "devices":
+            print("List of devices attached")
+            for serial in devices:
+                print(f"{serial}\tdevice")
+        elif command == "track-devices":
+            payload = "".join(f"{serial}\tdevice\n" for serial in devices)
+            sys.stdout.write(f"{len(payload):04x}{payload}")
+            sys.stdout.flush()
+            while True:
+                time.sleep(3600)
+        elif command == "shell" and argv[1:2] == ["pidof"]:
+            if argv[2:] == [os.environ.get("PRYCAT_FAKE_PACKAGE", "com.example.app")]:
+                print(_processes(random.Random(int(os.environ.get("PRYCAT_FAKE_SEED", 1))))[0])
+            else:
+                return 1
+        elif command == "shell" and argv[1:] == ["getprop", "persist.sys.timezone"]:
+            print("UTC")  # the zone threadtime stamps are printed in
+        elif command == "logcat":
+            _logcat(argv, binary=False)
+        elif command == "exec-out" and argv[1:3] == ["logcat", "-B"]:
+            _logcat(argv, binary=True)
+        else:
+            print(f"fakeadb: unsupported command: {' '.join(argv)}", file=sys.stderr)
+            return 1
+    except (BrokenPipeError, KeyboardInterrupt):
+        # Reader stopped; don't let interpreter shutdown complain on flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
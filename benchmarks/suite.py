@@ -0,0 +1,371 @@
+"""The benchmarks: ingest, model append/evict, refilter and export.
+
+Each benchmark takes the run's ``Config`` and returns a flat dict of
+numbers, which ``run()`` collects into one JSON document together with
+the versions it ran against, so results can be compared across releases.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from importlib import metadata
+
+import numpy as np
+
+from .fakeadb import LogcatGenerator
+
+FAKE_ADB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakeadb.py")
+SCHEMA = 1
+
+
+@dataclass
+class Config:
+    lines: int = 500_000          # lines per ingest/export run, and the model size
+    batch: int = 2_000            # lines per append_batch, as the GUI drains
+    tags: int = 200
+    message_length: int = 80
+    seed: int = 1
+    repeat: int = 3               # refilter repetitions; the median is reported
+
+
+def _generator(config: Config) -> LogcatGenerator:
+    return LogcatGenerator(config.tags, config.message_length, config.seed)
+
+
+def _records(config: Config, symbols, count: int) -> list:
+    """``count`` parsed LogRecords of the synthetic stream."""
+    from prycat.reader import AdbReader
+
+    reader = AdbReader(queue.Queue(), symbols=symbols)
+    generator = _generator(config)
+    records = []
+    for start in range(0, count, 50_000):
+        records.extend(reader._parse_chunk(generator.text(start, min(50_000, count - start), 0)))
+    return records
+
+
+def _qt_app():
+    # Widgets too, for the view benchmark; nothing needs to be seen, so
+    # offscreen unless a platform is given
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+# ── Ingest ──────────────────────────────────────────────
+def bench_ingest(config: Config, binary: bool) -> dict:
+    """AdbReader reading the fake adb unthrottled, text or ``logcat -B``."""
+    from prycat.reader import AdbReader
+    from prycat.spill import SpillBuffer
+
+    env = {
+        "PRYCAT_FAKE_RATE": "0",
+        "PRYCAT_FAKE_LINES": str(config.lines),
+        "PRYCAT_FAKE_TAGS": str(config.tags),
+        "PRYCAT_FAKE_MESSAGE": str(config.message_length),
+        "PRYCAT_FAKE_SEED": str(config.seed),
+    }
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        out: queue.Queue = queue.Queue()  # unbounded: measures the reader alone
+        spill = SpillBuffer(enabled=False)
+        reader = AdbReader(out, adb_path=FAKE_ADB, binary=binary, spill=spill)
+        started = time.perf_counter()
+        cpu = time.process_time()
+        reader.start()
+        lines = batches = 0
+        while (batch := out.get()[1]) is not None:
+            lines += len(batch)
+            batches += 1
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return {
+        "lines": lines,
+        "seconds": elapsed,
+        "lines_per_s": lines / elapsed,
+        "reader_cpu_us_per_line": cpu / lines * 1e6 if lines else 0.0,
+        "lines_per_batch": lines / batches if batches else 0.0,
+    }
+
+
+def bench_parse(config: Config) -> dict:
+    """Threadtime parsing alone, on bytes already in memory."""
+    from prycat.reader import AdbReader
+
+    reader = AdbReader(queue.Queue())
+    generator = _generator(config)
+    count = min(config.lines, 200_000)
+    # About the 64 KB the reader parses per read
+    chunks = [generator.text(start, min(400, count - start), 0) for start in range(0, count, 400)]
+    started = time.perf_counter()
+    lines = sum(len(reader._parse_chunk(chunk)) for chunk in chunks)
+    elapsed = time.perf_counter() - started
+    size = sum(map(len, chunks))
+    return {"lines": lines, "lines_per_s": lines / elapsed, "mb_per_s": size / elapsed / 1e6}
+
+
+# ── Model ───────────────────────────────────────────────
+def bench_append(config: Config, filtered: bool, compression: str | None = None) -> dict:
+    """append_batch while the buffer fills, then while every batch evicts.
+
+    With ``filtered`` a proxy with a level filter listens, as in the GUI;
+    with ``compression`` older rows are kept compressed (see ColdStore).
+    """
+    from prycat.models import LogcatFilterProxy, LogcatModel
+
+    _qt_app()
+    model = LogcatModel(maxlen=config.lines, compression=compression)
+    proxy = None
+    if filtered:
+        proxy = LogcatFilterProxy()
+        proxy.setSourceModel(model)
+        proxy.set_min_priority("I")
+    records = _records(config, model.symbols, config.lines)
+    batches = [records[i : i + config.batch] for i in range(0, len(records), config.batch)]
+
+    def feed() -> float:
+        started = time.perf_counter()
+        for batch in batches:
+            model.append_batch(batch)
+        return time.perf_counter() - started
+
+    fill = feed()    # empty to full
+    evict = feed()   # full: each batch evicts as many rows as it adds
+    result = {
+        "fill_ns_per_line": fill / len(records) * 1e9,
+        "evict_ns_per_line": evict / len(records) * 1e9,
+        "bytes_per_entry": model.bytes_per_entry,
+    }
+    if proxy is not None:
+        proxy.shutdown()
+    if model.cold is not None:
+        model.cold.close()
+    return result
+
+
+# ── Refilter ────────────────────────────────────────────
+def bench_refilter(config: Config) -> dict:
+    """Latency of each LogcatFilterProxy setter over a full buffer.
+
+    ``*_ms`` is the setter itself (the view's reset); for text and regex,
+    which finish on the background matcher, ``*_complete_ms`` is the time
+    until every match is in.
+    """
+    from PySide6.QtCore import QCoreApplication
+
+    from prycat.models import LogcatFilterProxy, LogcatModel
+
+    _qt_app()
+    model = LogcatModel(maxlen=config.lines)
+    records = _records(config, model.symbols, config.lines)
+    for i in range(0, len(records), 50_000):
+        model.append_batch(records[i : i + 50_000])
+    proxy = LogcatFilterProxy()
+    proxy.setSourceModel(model)
+
+    generator = _generator(config)
+    top_tags = [tag for tag, _ in Counter(e[3] for e in generator.entries).most_common(2)]
+    top_pid = Counter(e[0] for e in generator.entries).most_common(1)[0][0]
+    cases = {
+        "level": (proxy.set_min_priority, ("W",), ("V",)),
+        "pid": (proxy.set_pid_filter, (str(top_pid),), ("",)),
+        "tags": (proxy.set_tag_filter, (set(top_tags),), (set(),)),
+        "package": (proxy.set_package_pids, ({-1: {top_pid}},), (None,)),  # -1: the default device
+        "text": (proxy.set_text_filter, ("timeout",), ("",)),
+        "regex": (proxy.set_text_filter, (r"retry \d+", True), ("", False)),
+    }
+    result = {"rows": model.rowCount()}
+    for name, (setter, on, off) in cases.items():
+        sync, complete = [], []
+        for _ in range(config.repeat):
+            started = time.perf_counter()
+            setter(*on)
+            sync.append(time.perf_counter() - started)
+            while proxy.is_filtering:
+                QCoreApplication.processEvents()
+                time.sleep(0.001)
+            complete.append(time.perf_counter() - started)
+            result[f"{name}_accepted"] = proxy.rowCount()
+            setter(*off)
+        result[f"{name}_ms"] = statistics.median(sync) * 1000
+        if name in ("text", "regex"):
+            result[f"{name}_complete_ms"] = statistics.median(complete) * 1000
+    proxy.shutdown()
+    return result
+
+
+# ── View ────────────────────────────────────────────────
+def bench_scroll(config: Config, frames: int = 300) -> dict:
+    """Frame times of LogTableView scrolling through a full buffer.
+
+    ``jump`` moves a screenful per frame, as dragging the scroll bar
+    does, so every visible row is new; ``wheel`` moves three rows, as a
+    notch of the mouse wheel does.
+    ``stock_jump`` paints the same jumps through QTableView's per-cell
+    path, for comparison. A frame is the scroll plus the paint it causes.
+    """
+    from PySide6.QtWidgets import QTableView
+
+    from prycat.models import LogcatFilterProxy, LogcatModel
+    from prycat.theme import get_stylesheet
+    from prycat.widgets.log_table import LogTableView
+
+    class StockView(LogTableView):
+        paintEvent = QTableView.paintEvent
+
+    app = _qt_app()
+    app.setStyle("Fusion")
+    app.setStyleSheet(get_stylesheet())
+    model = LogcatModel(maxlen=config.lines)
+    records = _records(config, model.symbols, config.lines)
+    for i in range(0, len(records), 50_000):
+        model.append_batch(records[i : i + 50_000])
+    proxy = LogcatFilterProxy()
+    proxy.setSourceModel(model)
+
+    def frame_times(view_class, step: int) -> np.ndarray:
+        view = view_class()
+        view.setModel(proxy)
+        view.apply_column_widths()
+        view.resize(1200, 900)
+        view.show()
+        app.processEvents()
+        bar = view.verticalScrollBar()
+        step = step or view.viewport().height()
+        times = []
+        for i in range(frames):
+            started = time.perf_counter()
+            bar.setValue((i + 1) * step % bar.maximum())
+            app.processEvents()  # paints what the scroll left dirty
+            times.append(time.perf_counter() - started)
+        view.close()
+        return np.array(times) * 1000
+
+    row_height = 22
+    result = {"rows": proxy.rowCount()}
+    for name, view_class, step in (
+        ("jump", LogTableView, 0),
+        ("wheel", LogTableView, 3 * row_height),
+        ("stock_jump", StockView, 0),
+    ):
+        times = frame_times(view_class, step)
+        result[f"{name}_p50_ms"] = float(np.percentile(times, 50))
+        result[f"{name}_p95_ms"] = float(np.percentile(times, 95))
+        result[f"{name}_max_ms"] = float(times.max())
+    result["jump_fps_p95"] = 1000 / result["jump_p95_ms"]
+    proxy.shutdown()
+    return result
+
+
+# ── Export ──────────────────────────────────────────────
+def bench_export(config: Config) -> dict:
+    """Exporter writing the whole buffer in every format it supports."""
+    from prycat.export import Exporter
+    from prycat.storage import LogStorage
+
+    storage = LogStorage(config.lines)
+    storage.extend(_records(config, storage.symbols, config.lines))
+    result = {"in_memory_bytes_per_entry": storage.bytes_per_entry}
+    with tempfile.TemporaryDirectory(prefix="prycat-bench-") as directory:
+        for name in ("txt", "csv", "jsonl", "csv.gz", "jsonl.xz"):
+            path = os.path.join(directory, f"export.{name}")
+            exporter = Exporter(storage, range(storage.first_seq, storage.first_seq + len(storage)), path)
+            started = time.perf_counter()
+            exporter.start()
+            while exporter.running:
+                time.sleep(0.005)
+            elapsed = time.perf_counter() - started
+            if exporter.error is not None:
+                raise exporter.error
+            key = name.replace(".", "_")
+            result[f"{key}_lines_per_s"] = exporter.written / elapsed
+            result[f"{key}_bytes_per_entry"] = os.path.getsize(path) / exporter.written
+    return result
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "ingest_text": lambda config: bench_ingest(config, binary=False),
+    "ingest_binary": lambda config: bench_ingest(config, binary=True),
+    "append": lambda config: bench_append(config, filtered=False),
+    "append_filtered": lambda config: bench_append(config, filtered=True),
+    "append_compressed": lambda config: bench_append(config, filtered=False, compression="zlib"),
+    "refilter": bench_refilter,
+    "scroll": bench_scroll,
+    "export": bench_export,
+}
+
+
+def _version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _commit() -> str | None:
+    """The checkout's git commit, for runs from a source tree."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(FAKE_ADB),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(config: Config, names: list[str] | None = None, log=sys.stderr) -> dict:
+    """Run ``names`` (default: all) and return the results document."""
+    import prycat
+
+    results = {}
+    for name in names or list(BENCHMARKS):
+        print(f"{name} ...", end=" ", file=log, flush=True)
+        started = time.perf_counter()
+        results[name] = BENCHMARKS[name](config)
+        print(f"{time.perf_counter() - started:.1f}s", file=log)
+    return {
+        "schema": SCHEMA,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "versions": {
+            "prycat": _version("prycat"),
+            "prycat_path": os.path.dirname(os.path.abspath(prycat.__file__)),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pyside6": _version("PySide6"),
+        },
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "config": asdict(config),
+        "results": results,
+    }
+
+
+def to_json(document: dict) -> str:
+    return json.dumps(document, indent=2, sort_keys=True)
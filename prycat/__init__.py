@@ -20,7 +20,8 @@ def main():
         "--adb-path", default="adb", help="Path to adb executable (default: adb)"
     )
     parser.add_argument(
-        "-s", "--device", default=None, help="Target device serial number"
+        "-s", "--device", default=None,
+        help="Target device serial number; comma-separated serials capture several devices at once"
     )
     parser.add_argument(
         "-p", "--package", default=None, help="Package name to filter by PID"
@@ -43,12 +44,109 @@ def main():
     parser.add_argument(
         "--buffer-size",
         type=int,
-        default=500_000,
-        help="Max log entries to keep in memory (default: 500000)",
+        default=None,
+        help="Max log entries to keep in memory (default: 500000, or no limit with --memory-limit)",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Memory the log buffer may use, indexes included; the oldest lines are evicted by size",
+    )
+    parser.add_argument(
+        "--compress",
+        nargs="?",
+        const="zlib",
+        default=None,
+        choices=["zlib", "lzma"],
+        help="Keep all but the newest lines compressed in memory, to hold several times more "
+        "of them; lzma packs tighter but is slower (default: zlib)",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Ingest binary logcat (logcat -B) instead of parsing threadtime text",
+    )
+    parser.add_argument(
+        "--file",
+        default=None,
+        metavar="PATH",
+        help="Open a saved threadtime capture (e.g. adb logcat -d output) instead of a device",
+    )
+    parser.add_argument(
+        "--no-spill",
+        dest="spill",
+        action="store_false",
+        help="Drop lines when the display falls behind instead of spilling them to disk",
+    )
+    parser.add_argument(
+        "--no-follow",
+        dest="follow",
+        action="store_false",
+        help="Filter the package with logcat --pid, fixed at connect, instead of following it across restarts",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Archive lines evicted from the buffer to disk so they can still be scrolled and searched",
+    )
+    parser.add_argument(
+        "--history-dir",
+        default=None,
+        metavar="DIR",
+        help="Directory for history segments (default: system temp; implies --history)",
+    )
+    parser.add_argument(
+        "--history-quota",
+        type=int,
+        default=2048,
+        metavar="MB",
+        help="Disk space history may use before the oldest lines are dropped (default: 2048)",
+    )
+
+    headless = parser.add_argument_group(
+        "headless", "Stream filtered lines to stdout or a file instead of opening a window"
+    )
+    headless.add_argument(
+        "--headless", action="store_true", help="Run without the GUI (no Qt needed)"
+    )
+    headless.add_argument(
+        "-o", "--output",
+        default=None,
+        metavar="PATH",
+        help="Write to PATH instead of stdout; .csv/.jsonl pick the format, .gz/.xz compress",
+    )
+    headless.add_argument(
+        "--format",
+        default=None,
+        choices=["txt", "csv", "jsonl"],
+        help="Output format (default: from --output, else txt)",
+    )
+    headless.add_argument(
+        "--search", default="", metavar="TEXT", help="Only lines whose tag or message contains TEXT"
+    )
+    headless.add_argument(
+        "--regex", action="store_true", help="Treat --search as a regular expression"
+    )
+    headless.add_argument(
+        "--filter-tags", default="", metavar="TAGS", help="Only lines with one of these comma-separated tags"
+    )
+    headless.add_argument(
+        "--filter-pid", default="", metavar="PID", help="Only lines from this PID"
     )
 
     args = parser.parse_args()
     args.tag_filters = parse_tags(args.tags)
+    if args.buffer_size is None:
+        args.buffer_size = 500_000 if args.memory_limit is None else sys.maxsize
+    if args.compress and (args.history or args.history_dir is not None):
+        parser.error("--compress and --history are mutually exclusive")
+
+    if args.headless:
+        from .headless import run
+
+        sys.exit(run(args))
 
     from PySide6.QtWidgets import QApplication
     from .app import create_app
@@ -18,5 +18,14 @@ def create_app(app: QApplication, args) -> MainWindow:
         min_level=args.min_level,
         buffer=args.buffer,
         buffer_size=args.buffer_size,
+        memory_limit_mb=args.memory_limit,
+        compression=args.compress,
+        binary=args.binary,
+        spill=args.spill,
+        file=args.file,
+        history=args.history or args.history_dir is not None,
+        history_dir=args.history_dir,
+        history_quota_mb=args.history_quota,
+        follow=args.follow,
     )
     return window
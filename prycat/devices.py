@@ -0,0 +1,180 @@
+"""DeviceWatcher: adb device discovery and PID lookups off the GUI thread."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+from .reader import AdbReader, parse_devices
+
+_RETRY_SECONDS = 2.0  # before restarting a track-devices that ended
+_FOLLOW_SECONDS = 1.0  # between pidof polls of a followed package
+
+
+class DeviceWatcher(QObject):
+    """Runs adb queries on worker threads and reports back through signals.
+
+    ``start()`` keeps an ``adb track-devices`` process open on a thread of
+    its own; adb pushes the full device list whenever it changes, and
+    each list is emitted as ``devices_changed``. Should tracking end (the
+    adb server restarted, or an adb too old to track) the list is fetched
+    once with ``adb devices`` and tracking is retried a little later.
+
+    ``follow()`` polls a package's PIDs on every given device once a
+    second, emitting ``package_pids`` for each answer, until ``unfollow()``.
+
+    ``refresh()`` and ``resolve_pids()`` run on a small thread pool.
+    Signals are emitted from those threads and so reach GUI-thread slots
+    queued, never blocking the caller.
+    """
+
+    devices_changed = Signal(list)      # serials in state "device"
+    pids_resolved = Signal(int, object)  # (request, {serial or None: pid or None})
+    package_pids = Signal(int, object, list)  # (request, serial or None, PIDs running now)
+
+    def __init__(self, adb_path: str = "adb", parent=None):
+        super().__init__(parent)
+        self._adb_path = adb_path
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prycat-adb")
+        self._stop = threading.Event()
+        self._process: subprocess.Popen | None = None
+        self._thread: threading.Thread | None = None
+        self._request = 0
+        self._follow_stop: threading.Event | None = None
+
+    # ── Queries ─────────────────────────────────────────
+    def refresh(self) -> None:
+        """List devices once; the result arrives as ``devices_changed``."""
+        self._submit(lambda: self.devices_changed.emit(AdbReader.list_devices(self._adb_path)))
+
+    def resolve_pids(self, devices: list[str | None], package: str, attempts: int = 3, delay: float = 0.5) -> int:
+        """Look up ``package``'s PID on each device; returns the request number.
+
+        Devices still without a PID are retried up to ``attempts`` times,
+        ``delay`` seconds apart, since adb or the app may need a moment.
+        The outcome arrives as ``pids_resolved`` carrying the request number.
+        """
+        self._request += 1
+        request = self._request
+
+        def resolve() -> None:
+            pids: dict[str | None, str | None] = dict.fromkeys(devices)
+            for attempt in range(attempts):
+                missing = [device for device, pid in pids.items() if not pid]
+                # One pidof per device at a time, so eight phones cost one round trip
+                with ThreadPoolExecutor(max_workers=len(missing)) as lookups:
+                    found = lookups.map(lambda d: AdbReader.get_pid_for_package(self._adb_path, d, package), missing)
+                    pids.update(zip(missing, found))
+                if all(pids.values()) or attempt == attempts - 1 or self._stop.wait(delay):
+                    break
+            self.pids_resolved.emit(request, pids)
+
+        self._submit(resolve)
+        return request
+
+    def _submit(self, task) -> None:
+        if self._stop.is_set():
+            return
+        try:
+            self._pool.submit(task)
+        except RuntimeError:
+            pass  # shut down meanwhile
+
+    # ── Package PIDs ────────────────────────────────────
+    def follow(self, devices: list[str | None], package: str) -> int:
+        """Poll ``package``'s PIDs on ``devices`` until ``unfollow()``.
+
+        Returns the request number ``package_pids`` signals will carry.
+        """
+        self.unfollow()
+        stop = self._follow_stop = threading.Event()
+        self._request += 1
+        request = self._request
+
+        def poll(device: str | None) -> None:
+            while not stop.is_set() and not self._stop.is_set():
+                pids = AdbReader.get_pids_for_package(self._adb_path, device, package)
+                self.package_pids.emit(request, device, pids)
+                stop.wait(_FOLLOW_SECONDS)
+
+        for device in devices:
+            threading.Thread(target=poll, args=(device,), daemon=True, name="prycat-follow").start()
+        return request
+
+    def unfollow(self) -> None:
+        if self._follow_stop is not None:
+            self._follow_stop.set()
+            self._follow_stop = None
+
+    # ── Tracking ────────────────────────────────────────
+    def start(self) -> None:
+        """Start following device changes."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._track, daemon=True, name="prycat-track-devices")
+        self._thread.start()
+
+    def _track(self) -> None:
+        while not self._stop.is_set():
+            if not self._follow():
+                # No tracking right now; answer with a one-off listing
+                self.devices_changed.emit(AdbReader.list_devices(self._adb_path))
+            if self._stop.wait(_RETRY_SECONDS):
+                break
+
+    def _follow(self) -> bool:
+        """Relay ``adb track-devices`` updates until it ends; False if none came."""
+        try:
+            self._process = process = subprocess.Popen(
+                [self._adb_path, "track-devices"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW
+                if hasattr(subprocess, "CREATE_NO_WINDOW")
+                else 0,
+            )
+        except OSError:
+            return False
+        if self._stop.is_set():  # closed while starting
+            self._end_process()
+            return True
+        updated = False
+        stdout = process.stdout
+        # Each update: 4 hex digits giving the length, then the listing
+        while not self._stop.is_set():
+            head = stdout.read(4)
+            try:
+                size = int(head, 16)
+            except ValueError:
+                break  # end of stream, or not the protocol we know
+            payload = stdout.read(size)
+            if len(payload) < size:
+                break
+            self.devices_changed.emit(parse_devices(payload.decode("utf-8", "replace")))
+            updated = True
+        self._end_process()
+        return updated
+
+    def _end_process(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def close(self) -> None:
+        """Stop tracking and drop queued queries; running ones finish unheard."""
+        self._stop.set()
+        self.unfollow()
+        self._end_process()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
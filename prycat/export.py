@@ -0,0 +1,176 @@
+"""Exporter: background export of accepted rows to text, CSV or JSON Lines."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import lzma
+import os
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from .storage import LogEntry
+
+CHUNK_ROWS = 2048
+SLICE_ROWS = 128  # rows read between checks that storage held still; well under a drain tick
+HEADER = ["Time", "PID", "TID", "Level", "Tag", "Message"]
+
+
+def export_format(path: str) -> tuple[str, str | None]:
+    """(format, compression) implied by ``path``, e.g. "a.csv.gz" -> ("csv", "gz")."""
+    base, ext = os.path.splitext(path.lower())
+    compression = None
+    if ext in (".gz", ".xz"):
+        compression = ext[1:]
+        base, ext = os.path.splitext(base)
+    fmt = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext, "txt")
+    return fmt, compression
+
+
+def open_export(path: str, compression: str | None):
+    """Open ``path`` for writing text, compressed as ``export_format`` says."""
+    if compression == "gz":
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    if compression == "xz":
+        return lzma.open(path, "wt", encoding="utf-8", newline="", preset=3)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def entry_writer(f, fmt: str, devices: bool = False) -> Callable[[list[LogEntry]], None]:
+    """A function writing LogEntry lists to ``f`` as ``fmt``; CSV writes its header now.
+
+    With ``devices`` each row leads with the serial of its device.
+    """
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(["Device", *HEADER] if devices else HEADER)
+
+        def write(entries) -> None:
+            writer.writerows((e.device, *e[:6]) if devices else e[:6] for e in entries)
+        return write
+    if fmt == "jsonl":
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+        def write(entries) -> None:
+            for e in entries:
+                record = {
+                    "time": e.timestamp, "pid": int(e.pid), "tid": int(e.tid),
+                    "level": e.priority, "tag": e.tag, "message": e.message,
+                }
+                if devices:
+                    record["device"] = e.device
+                f.write(dumps(record) + "\n")
+        return write
+
+    def write(entries) -> None:
+        f.writelines("\t".join((e.device, *e[:6]) if devices else e[:6]) + "\n" for e in entries)
+    return write
+
+
+class Exporter:
+    """Writes rows, given by sequence number, to a file from a worker thread.
+
+    The GUI keeps ingesting meanwhile, so rows are read from storage a
+    short slice at a time and the slice is read again if anything was
+    evicted while it was being read; rows evicted before their turn are
+    skipped and counted. Output goes to a ``.part`` file renamed into
+    place on success and removed on cancel or error. ``progress``,
+    ``written``, ``skipped`` and ``error`` may be polled from the GUI thread.
+
+    With ``devices`` each row leads with the serial of its device, for
+    captures merged from several.
+    """
+
+    def __init__(self, storage, seqs: np.ndarray | range, path: str, devices: bool = False):
+        self._storage = storage
+        self._seqs = seqs
+        self._path = path
+        self._devices = devices
+        self._format, self._compression = export_format(path)
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.written = 0
+        self.skipped = 0
+        self.error: Exception | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def total(self) -> int:
+        return len(self._seqs)
+
+    @property
+    def progress(self) -> float:
+        total = len(self._seqs)
+        return (self.written + self.skipped) / total if total else 1.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # ── Worker thread ───────────────────────────────────
+    def _run(self) -> None:
+        temp = self._path + ".part"
+        try:
+            with open_export(temp, self._compression) as f:
+                write = entry_writer(f, self._format, self._devices)
+                for lo in range(0, len(self._seqs), CHUNK_ROWS):
+                    if self._cancel.is_set():
+                        break
+                    entries = self._read(np.asarray(self._seqs[lo : lo + CHUNK_ROWS], dtype=np.int64))
+                    write(entries)
+                    self.written += len(entries)
+            if self._cancel.is_set():
+                os.unlink(temp)
+            else:
+                os.replace(temp, self._path)
+        except Exception as e:  # reported to the GUI, which decides how to show it
+            self.error = e
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+
+    def _read(self, seqs: np.ndarray) -> list:
+        entries = []
+        for lo in range(0, len(seqs), SLICE_ROWS):
+            entries += self._read_slice(seqs[lo : lo + SLICE_ROWS])
+        return entries
+
+    def _read_slice(self, seqs: np.ndarray) -> list:
+        storage = self._storage
+        while True:
+            first, generation = storage.first_seq, storage.generation
+            if generation & 1:
+                time.sleep(0.001)  # the ring is being reallocated
+                continue
+            rows = seqs - first
+            live = rows[rows >= 0].tolist()
+            try:
+                entries = [storage.entry(row) for row in live]
+            except (IndexError, KeyError, ValueError, OSError):
+                if (storage.first_seq, storage.generation) == (first, generation):
+                    raise
+                continue  # storage shifted under the read; go again
+            if (storage.first_seq, storage.generation) == (first, generation):
+                self.skipped += len(seqs) - len(live)
+                return entries
@@ -0,0 +1,186 @@
+"""LogFilter: vectorized filter criteria evaluated over LogStorage columns."""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+from .storage import PRIORITY_ORDER, LogStorage
+from .trigram import fold, regex_literals
+
+
+def haystack(storage: LogStorage, row: int) -> str:
+    """The text the text stage searches: "tag message"."""
+    return f"{storage.tag(row)} {storage.message(row)}"
+
+
+class LogFilter:
+    """Priority, PID, tag, device, package and text criteria.
+
+    The cheap stages are combined into one boolean mask over the storage
+    columns. The text stage first narrows that mask with the storage's
+    trigram index (using the query, or the literal runs a regex requires),
+    then runs the exact check on the remaining rows only. Setters return
+    True when the criteria actually changed.
+    """
+
+    def __init__(self):
+        self._text: str = ""
+        self._text_source: str = ""
+        self._text_re: re.Pattern | None = None
+        self._use_regex: bool = False
+        self._needles: list[bytes] = []
+        self._tags: set[str] = set()
+        self._devices: set[str] = set()
+        self._min_priority: int = 0  # V=0 means accept all
+        self._pid: str = ""
+        self._pid_value: int | None = None
+        self._package_pids: dict[int, frozenset[int]] | None = None
+
+    # ── Setters ─────────────────────────────────────────
+    def set_text(self, text: str, use_regex: bool = False) -> bool:
+        if use_regex == self._use_regex and text == self._text_source:
+            return False
+        self._text_source = text
+        self._use_regex = use_regex
+        if use_regex:
+            try:
+                self._text_re = re.compile(text, re.IGNORECASE)
+            except re.error:
+                self._text_re = None
+            self._text = ""
+            literals = regex_literals(text) if self._text_re is not None else []
+        else:
+            self._text = text.lower()
+            self._text_re = None
+            literals = [self._text]
+        self._needles = [n for n in map(fold, literals) if len(n) >= 3]
+        return True
+
+    def set_tags(self, tags: set[str]) -> bool:
+        if tags == self._tags:
+            return False
+        self._tags = set(tags)
+        return True
+
+    def set_devices(self, devices: set[str]) -> bool:
+        if devices == self._devices:
+            return False
+        self._devices = set(devices)
+        return True
+
+    def set_min_priority(self, level: str) -> bool:
+        min_priority = PRIORITY_ORDER.get(level, 0)
+        if min_priority == self._min_priority:
+            return False
+        self._min_priority = min_priority
+        return True
+
+    def set_pid(self, pid: str) -> bool:
+        pid = pid.strip()
+        if pid == self._pid:
+            return False
+        self._pid = pid
+        # A non-numeric PID can never match the integer column
+        self._pid_value = (int(pid) if pid.isdigit() else -1) if pid else None
+        return True
+
+    def set_package_pids(self, pids: dict[int, set[int]] | None) -> bool:
+        """Accept only these PIDs, per device code (-1: the default device).
+
+        None turns the criterion off; an empty mapping accepts nothing.
+        """
+        pids = None if pids is None else {device: frozenset(p) for device, p in pids.items()}
+        if pids == self._package_pids:
+            return False
+        self._package_pids = pids
+        return True
+
+    @property
+    def has_text_stage(self) -> bool:
+        return self._text_re is not None or bool(self._text)
+
+    @property
+    def text_query(self) -> tuple[str, bool]:
+        """(query, is_regex) for the text stage: a lowercased needle or a pattern."""
+        if self._text_re is not None:
+            return self._text_re.pattern, True
+        return self._text, False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self._min_priority
+            or self._pid_value is not None
+            or self._package_pids is not None
+            or self._tags
+            or self._devices
+            or self._text
+            or self._text_re is not None
+        )
+
+    # ── Evaluation ──────────────────────────────────────
+    def accepted_rows(self, storage: LogStorage, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Return the accepted logical rows in [start, stop) as an int64 array."""
+        rows = self.candidate_rows(storage, start, stop)
+
+        # Text search (most expensive — last, only on surviving rows)
+        if self.has_text_stage:
+            keep = np.fromiter(
+                (self._match_text(storage, row) for row in rows.tolist()), dtype=bool, count=len(rows)
+            )
+            rows = rows[keep]
+        return rows
+
+    def candidate_rows(self, storage: LogStorage, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Rows in [start, stop) passing every stage except the exact text check."""
+        stop = len(storage) if stop is None else min(stop, len(storage))
+        if start >= stop:
+            return np.empty(0, dtype=np.int64)
+
+        mask = None
+        if self._min_priority:
+            mask = storage.column("priority", start, stop) >= self._min_priority
+        if self._pid_value is not None:
+            pid_mask = storage.column("pid", start, stop) == self._pid_value
+            mask = pid_mask if mask is None else mask & pid_mask
+        if self._package_pids is not None:
+            package_mask = self._package_mask(storage, start, stop)
+            mask = package_mask if mask is None else mask & package_mask
+        if self._needles:
+            text_mask = storage.text_candidates(self._needles, start, stop)
+            mask = text_mask if mask is None else mask & text_mask
+        if self._tags:
+            codes = np.fromiter(
+                (storage.symbols.intern(t) for t in self._tags), dtype=np.int32, count=len(self._tags)
+            )
+            tag_mask = np.isin(storage.column("tag", start, stop), codes)
+            mask = tag_mask if mask is None else mask & tag_mask
+        if self._devices:
+            codes = np.fromiter(
+                (storage.symbols.intern(d) for d in self._devices), dtype=np.int32, count=len(self._devices)
+            )
+            device_mask = np.isin(storage.column("device", start, stop), codes)
+            mask = device_mask if mask is None else mask & device_mask
+
+        if mask is None:
+            return np.arange(start, stop, dtype=np.int64)
+        return np.flatnonzero(mask).astype(np.int64) + start
+
+    def _package_mask(self, storage: LogStorage, start: int, stop: int) -> np.ndarray:
+        pid = storage.column("pid", start, stop)
+        mask = np.zeros(len(pid), dtype=bool)
+        if not self._package_pids:
+            return mask
+        device = storage.column("device", start, stop)
+        for code, pids in self._package_pids.items():
+            hit = np.isin(pid, np.fromiter(pids, dtype=np.int32, count=len(pids)))
+            mask |= hit & (device == code)
+        return mask
+
+    def _match_text(self, storage: LogStorage, row: int) -> bool:
+        text = haystack(storage, row)
+        if self._text_re is not None:
+            return self._text_re.search(text) is not None
+        return self._text in text.lower()
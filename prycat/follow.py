@@ -0,0 +1,70 @@
+"""PackageFollow: the live set of PIDs a package runs as, per device."""
+
+from __future__ import annotations
+
+import re
+
+from .storage import LogRecord
+from .symbols import SymbolTable
+
+# "Start proc 4321:com.example.app/u0a123 for activity ..." (Android 7+) and
+# "Start proc com.example.app for activity ...: pid=4321 uid=..." (older)
+_START_PROC_RE = re.compile(r"Start proc (?:(\d+):([^\s/]+)|([^\s:]+(?::\S+)?) for .*?pid=(\d+))")
+
+
+class PackageFollow:
+    """PIDs of one package, learned from pidof and from ActivityManager.
+
+    A restarted app gets a new PID; it is added as soon as either source
+    reports it and PIDs are never removed, so the lines of every instance,
+    including one that crashed before pidof could see it, stay matched.
+    ``pids`` maps device codes (-1: the default device) to PID sets, the
+    form ``LogFilter.set_package_pids`` takes.
+    """
+
+    def __init__(self, package: str, symbols: SymbolTable, devices: list[str | None]):
+        self._package = package
+        self._symbols = symbols
+        self._activity_manager = symbols.intern("ActivityManager")
+        self.pids: dict[int, set[int]] = {self._code(device): set() for device in devices}
+
+    @property
+    def package(self) -> str:
+        return self._package
+
+    def _code(self, device: str | None) -> int:
+        return self._symbols.intern(device) if device else -1
+
+    def _owns(self, process: str) -> bool:
+        # Processes of a package are named after it, e.g. "com.x:remote"
+        return process == self._package or process.startswith(self._package + ":")
+
+    def add(self, device: str | None, pids: list[int]) -> bool:
+        """Record PIDs found by pidof on ``device``; True if any was new."""
+        known = self.pids.setdefault(self._code(device), set())
+        new = set(pids) - known
+        known |= new
+        return bool(new)
+
+    def scan(self, records: list[LogRecord]) -> bool:
+        """Pick up "Start proc" announcements in ``records``; True if any was new."""
+        found = False
+        tag = self._activity_manager
+        for record in records:
+            if record.tag != tag or "Start proc" not in record.message:
+                continue
+            m = _START_PROC_RE.search(record.message)
+            if m is None:
+                continue
+            pid, process = (m.group(1), m.group(2)) if m.group(1) else (m.group(4), m.group(3))
+            if self._owns(process):
+                known = self.pids.setdefault(record.device, set())
+                if int(pid) not in known:
+                    known.add(int(pid))
+                    found = True
+        return found
+
+    def describe(self) -> str:
+        """The PIDs seen so far, e.g. "4321, 4410"."""
+        pids = sorted(set().union(*self.pids.values()))
+        return ", ".join(map(str, pids))
@@ -0,0 +1,290 @@
+"""Headless mode: stream logcat through the filter engine to stdout or a file."""
+
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+
+import numpy as np
+
+from .export import entry_writer, export_format, open_export
+from .filtering import LogFilter
+from .follow import PackageFollow
+from .logfile import FileStorage
+from .reader import AdbReader
+from .session import SessionStorage, is_session
+from .spill import SpillBuffer
+from .storage import PRIORITY_LETTERS, LogEntry, LogRecord, format_timestamp
+from .symbols import SymbolTable
+
+_FILE_CHUNK = 1 << 16   # rows filtered per step when reading a file
+_FOLLOW_SECONDS = 1.0   # between pidof polls of a followed package
+_SPILL_TAKE = 20_000    # lines replayed from a spill file at a time
+
+
+class _Batch:
+    """The read side of LogStorage over one list of LogRecords.
+
+    Lets LogFilter evaluate a reader batch directly: columns are built
+    only when a criterion asks for them, and there is no text index, so
+    every row is a text candidate.
+    """
+
+    def __init__(self, records: list[LogRecord], symbols: SymbolTable):
+        self._records = records
+        self._symbols = symbols
+        self._columns: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._symbols
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            field = LogRecord._fields.index(name)
+            values = self._columns[name] = np.fromiter(
+                (r[field] for r in self._records), dtype=np.int64, count=len(self._records)
+            )
+        return values[start:stop]
+
+    def text_candidates(self, needles: list[bytes], start: int = 0, stop: int | None = None) -> np.ndarray:
+        stop = len(self._records) if stop is None else min(stop, len(self._records))
+        return np.ones(max(0, stop - start), dtype=bool)
+
+    def tag(self, row: int) -> str:
+        return self._symbols.lookup(self._records[row].tag)
+
+    def message(self, row: int) -> str:
+        return self._records[row].message
+
+
+def _log_filter(args) -> LogFilter:
+    log_filter = LogFilter()
+    log_filter.set_min_priority(args.min_level)
+    if args.search:
+        log_filter.set_text(args.search, args.regex)
+    if args.filter_tags:
+        log_filter.set_tags({t.strip() for t in args.filter_tags.split(",") if t.strip()})
+    if args.filter_pid:
+        log_filter.set_pid(args.filter_pid)
+    return log_filter
+
+
+def _entries(records: list[LogRecord], rows: Iterable[int], symbols: SymbolTable) -> list[LogEntry]:
+    lookup = symbols.lookup
+    entries = []
+    for row in rows:
+        r = records[row]
+        entries.append(LogEntry(
+            timestamp=format_timestamp(r.timestamp),
+            pid=str(r.pid),
+            tid=str(r.tid),
+            priority=PRIORITY_LETTERS[r.priority],
+            tag=lookup(r.tag),
+            message=r.message,
+            device=lookup(r.device) if r.device >= 0 else "",
+        ))
+    return entries
+
+
+def run(args) -> int:
+    """Run headless with parsed CLI ``args``; returns the exit status.
+
+    Lines are filtered a reader batch at a time and written as they come,
+    so memory stays at the reader queue's bound however long the capture
+    runs. Should the output fall behind, batches spill to disk (or are
+    dropped with ``--no-spill``), as in the GUI. Counts go to stderr.
+
+    Following a package (``-p``), lines are written a couple of seconds
+    late, so that those of a restarted instance that pidof reports late
+    still come out in order.
+    """
+    fmt, compression = export_format(args.output or "")
+    if args.format:
+        fmt = args.format
+    to_stdout = args.output in (None, "-")
+    out = sys.stdout if to_stdout else open_export(args.output, compression)
+    devices = [d.strip() for d in (args.device or "").split(",") if d.strip()]
+    write = entry_writer(out, fmt, devices=len(devices) > 1)
+    log_filter = _log_filter(args)
+
+    try:
+        if args.file:
+            written, read = _run_file(args.file, log_filter, write, out)
+            dropped = 0
+        else:
+            counts = _run_live(args, devices or [None], log_filter, write, out)
+            if counts is None:
+                return 1
+            written, read, dropped = counts
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The consumer went away (e.g. "| head"); not an error for us
+        sys.stdout = None
+        return 0
+    finally:
+        if not to_stdout:
+            out.close()
+
+    summary = f"prycat: {read:,} lines read, {written:,} written"
+    if dropped:
+        summary += f", {dropped:,} dropped"
+    print(summary, file=sys.stderr)
+    return 0
+
+
+def _run_file(path: str, log_filter: LogFilter, write, out) -> tuple[int, int]:
+    symbols = SymbolTable()
+    storage = SessionStorage(path, symbols) if is_session(path) else FileStorage(path, symbols)
+    written = start = 0
+    try:
+        while True:
+            done = not storage.indexing  # checked first so the final rows aren't missed
+            stop = len(storage)
+            for lo in range(start, stop, _FILE_CHUNK):
+                hi = min(lo + _FILE_CHUNK, stop)
+                entries = [storage.entry(row) for row in log_filter.accepted_rows(storage, lo, hi).tolist()]
+                write(entries)
+                written += len(entries)
+            start = stop
+            if done:
+                break
+            threading.Event().wait(0.05)  # let the index grow
+        out.flush()
+        return written, start
+    finally:
+        storage.close()
+
+
+def _run_live(args, devices: list[str | None], log_filter: LogFilter, write, out) -> tuple[int, int, int] | None:
+    symbols = SymbolTable()
+    batches: queue.Queue[tuple[int, list[LogRecord] | None]] = queue.Queue(maxsize=256)
+    spills = [SpillBuffer(enabled=args.spill) for _ in devices]
+    stop = threading.Event()
+
+    pids: dict[str | None, str | None] = dict.fromkeys(devices)
+    follow = None
+    if args.package:
+        if args.follow:
+            follow = PackageFollow(args.package, symbols, devices)
+            log_filter.set_package_pids(follow.pids)
+        else:
+            for device in devices:
+                pids[device] = AdbReader.get_pid_for_package(args.adb_path, device, args.package)
+                if not pids[device]:
+                    print(f"prycat: {args.package} is not running on {device or 'the device'}", file=sys.stderr)
+                    return None
+
+    readers = [
+        AdbReader(
+            out_queue=batches,
+            adb_path=args.adb_path,
+            device=device,
+            buffer=args.buffer,
+            tag_filters=args.tag_filters,
+            pid=pids[device],
+            symbols=symbols,
+            binary=args.binary,
+            spill=spill,
+        )
+        for device, spill in zip(devices, spills)
+    ]
+    follow_lock = threading.Lock()
+    found: list[tuple[str | None, list[int]]] = []  # pidof answers for the main thread
+    if follow is not None:
+        def poll(device: str | None) -> None:
+            while not stop.wait(_FOLLOW_SECONDS):
+                answer = AdbReader.get_pids_for_package(args.adb_path, device, args.package)
+                with follow_lock:
+                    found.append((device, answer))
+
+        for device in devices:
+            threading.Thread(target=poll, args=(device,), daemon=True).start()
+            found.append((device, AdbReader.get_pids_for_package(args.adb_path, device, args.package)))
+
+    for reader in readers:
+        reader.start()
+    left = len(readers)
+    written = read = 0
+
+    # pidof only sees a new instance a moment after it starts logging, so
+    # while following, batches are held for a couple of seconds and written
+    # in order as they leave that window, with every PID found by then
+    held: deque[tuple[float, list[LogRecord]]] = deque()
+
+    def accepted(batch: list[LogRecord]) -> list[int]:
+        if log_filter.is_empty:
+            return list(range(len(batch)))
+        return log_filter.accepted_rows(_Batch(batch, symbols)).tolist()
+
+    def write_batch(batch: list[LogRecord]) -> None:
+        nonlocal written
+        rows = accepted(batch)
+        write(_entries(batch, rows, symbols))
+        written += len(rows)
+
+    def catch_up(everything: bool = False) -> None:
+        """Apply pidof answers, then write the held batches due (or all)."""
+        with follow_lock:
+            answers, found[:] = list(found), []
+        if any([follow.add(device, answer) for device, answer in answers]):
+            log_filter.set_package_pids(follow.pids)
+        due = time.monotonic() - 2 * _FOLLOW_SECONDS
+        while held and (everything or held[0][0] < due):
+            write_batch(held.popleft()[1])
+
+    def emit(batch: list[LogRecord]) -> None:
+        nonlocal read
+        read += len(batch)
+        if follow is None:
+            write_batch(batch)
+            return
+        if follow.scan(batch):
+            log_filter.set_package_pids(follow.pids)
+        held.append((time.monotonic(), batch))
+
+    try:
+        while left:
+            # Spilled batches are newer than anything queued: replay them
+            # once the queue is empty
+            spilling = any(spill.pending for spill in spills)
+            try:
+                _, batch = batches.get_nowait() if spilling else batches.get(timeout=0.5)
+            except queue.Empty:
+                batch = [r for spill in spills for r in spill.take(_SPILL_TAKE)] if spilling else []
+                # A reader's final None that found the queue full
+                left -= sum(spill.take_end() for spill in spills)
+            if follow is not None:
+                catch_up()
+            if batch is None:
+                left -= 1
+            elif batch:
+                emit(batch)
+            out.flush()
+        for spill in spills:
+            while rest := spill.take(_SPILL_TAKE):
+                emit(rest)
+        if follow is not None:
+            catch_up(everything=True)
+        out.flush()
+    except KeyboardInterrupt:
+        if follow is not None:
+            catch_up(everything=True)  # what was read is still written
+            out.flush()
+        raise
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.stop()
+        for spill in spills:
+            spill.close()
+    return written, read, sum(spill.dropped_lines for spill in spills)
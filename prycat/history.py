@@ -0,0 +1,861 @@
+"""Archives of rows evicted from the live buffer: on disk (HistoryStore)
+or compressed in memory (ColdStore), both behind TieredStorage."""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import lzma
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from .storage import PRIORITY_LETTERS, LogEntry, LogRecord, LogStorage, format_timestamp, message_bytes
+from .symbols import SymbolTable
+from .trigram import BLOCK_ROWS as INDEX_ROWS, SIGNATURE_BYTES, signature_hits
+
+BLOCK_ROWS = 8192           # rows buffered before a block is compressed
+_SEGMENT_BYTES = 64 << 20   # segment files roll over at this size
+_CACHE_BLOCKS = 64          # decoded blocks kept
+HOT_ROWS = 1 << 16          # newest rows left uncompressed in front of a ColdStore
+_COLD_CACHE_BLOCKS = 8      # decoded ColdStore blocks kept
+_MAX_SEALING = 4            # ColdStore blocks compressing before appends wait
+
+# Column layout of an encoded block, in order; messages follow
+_FIELDS = (
+    ("timestamp", np.dtype("<i8")),
+    ("pid", np.dtype("<i4")),
+    ("tid", np.dtype("<i4")),
+    ("priority", np.dtype("i1")),
+    ("tag", np.dtype("<i4")),
+    ("uid", np.dtype("<i4")),
+    ("device", np.dtype("<i4")),
+    ("msg_length", np.dtype("<i4")),
+)
+_ROW_BYTES = sum(dtype.itemsize for _, dtype in _FIELDS)
+_HEADER = struct.Struct("<II")  # rows, compressed size
+
+# ColdStore message compression: name -> (compress, decompress). A block's
+# messages are well under a megabyte, so a bigger lzma dictionary buys nothing
+_LZMA_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 6, "dict_size": 1 << 20}]
+_CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, filters=_LZMA_FILTERS), lzma.decompress),
+}
+
+
+class _BlockRef(NamedTuple):
+    """Sparse index entry: which rows a block holds and where it lives."""
+
+    first_seq: int
+    count: int
+    segment: int
+    offset: int
+    size: int
+
+
+class _ColdBlock(NamedTuple):
+    """A ColdStore block: each column and the messages compressed apart."""
+
+    first_seq: int
+    count: int
+    columns: dict[str, bytes]
+    messages: bytes
+    signatures: np.ndarray  # trigram bitmaps of index blocks [first_seq // INDEX_ROWS, ...]
+    raw: int                # bytes the rows took uncompressed
+
+    @property
+    def nbytes(self) -> int:
+        return sum(map(len, self.columns.values())) + len(self.messages) + self.signatures.nbytes + 200
+
+
+class _Rows(NamedTuple):
+    columns: dict[str, np.ndarray]
+    starts: np.ndarray  # message offsets into blob
+    blob: bytes
+
+
+class _Sealing(NamedTuple):
+    """A ColdStore block still being compressed; its rows are read as they are."""
+
+    first_seq: int
+    count: int
+    rows: _Rows
+    signatures: np.ndarray
+    done: Future  # of the _ColdBlock
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.rows.starts) * (_ROW_BYTES + 8) + len(self.rows.blob) + self.signatures.nbytes
+
+
+class _Segment:
+    __slots__ = ("path", "file", "size", "end_seq")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "w+b")
+        self.size = 0
+        self.end_seq = 0  # one past the last row written to it
+
+
+class _Archive(abc.ABC):
+    """Rows addressed by sequence number, kept in blocks of ``BLOCK_ROWS``.
+
+    What the archives share: rows arrive in sequence order as the live
+    buffer evicts them and are buffered until a block's worth has
+    accumulated, then ``_seal()`` stores them. Each block leaves one
+    in-memory index entry, so a row is found by bisection and its block
+    is brought back by ``_decode()`` through a small LRU of decoded blocks.
+    """
+
+    # Whether append() wants the live buffer's trigram signatures
+    indexes_text = False
+    # Rows counted toward the storage's capacity; 0 when a quota of some
+    # other kind bounds the archive
+    max_rows = 0
+    # Memory the archive keeps itself within, if bounded that way; when
+    # None its ``nbytes`` count against the live buffer's budget
+    max_bytes: int | None = None
+
+    def __init__(self, cache_blocks: int):
+        self._cache_blocks = max(1, cache_blocks)
+        self._first_seq = 0
+        self._end_seq = 0
+        self._blocks: list = []
+        self._block_seqs: list[int] = []  # first_seq of each block, for bisect
+        self._cache: OrderedDict[int, _Rows] = OrderedDict()
+        self._pending: list[tuple[dict[str, np.ndarray], bytes]] = []
+        self._pending_rows = 0
+        self._pending_block: _Rows | None = None  # decoded view of _pending
+
+    def __len__(self) -> int:
+        return self._end_seq - self._first_seq
+
+    @property
+    def first_seq(self) -> int:
+        return self._first_seq
+
+    @property
+    def _pending_bytes(self) -> int:
+        return self._pending_rows * _ROW_BYTES + sum(len(blob) for _, blob in self._pending)
+
+    @property
+    def _cached_bytes(self) -> int:
+        return sum(len(rows.blob) + len(rows.starts) * (_ROW_BYTES + 8) for rows in self._cache.values())
+
+    # ── Writing ─────────────────────────────────────────
+    def reset(self, first_seq: int) -> None:
+        """Drop everything; the next appended row has sequence ``first_seq``."""
+        self._blocks.clear()
+        self._block_seqs.clear()
+        self._cache.clear()
+        self._pending.clear()
+        self._pending_rows = 0
+        self._pending_block = None
+        self._first_seq = self._end_seq = first_seq
+
+    def append(
+        self,
+        columns: dict[str, np.ndarray],
+        blob: bytes,
+        signatures: tuple[int, np.ndarray] | None = None,
+    ) -> None:
+        """Archive the rows following the last ones appended (see LogStorage.copy_rows).
+
+        ``signatures`` is the live buffer's trigram index over them (see
+        LogStorage.text_signatures), for archives that ``indexes_text``.
+        """
+        count = len(columns["timestamp"])
+        if not count:
+            return
+        self._pending.append((columns, blob))
+        self._pending_rows += count
+        self._pending_block = None
+        self._end_seq += count
+        if self._pending_rows >= BLOCK_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        first_seq = self._end_seq - self._pending_rows
+        ref = self._seal(first_seq, self._merged_pending())
+        if ref is None:
+            return  # keep the rows pending and retry on the next block
+        self._blocks.append(ref)
+        self._block_seqs.append(first_seq)
+        self._pending.clear()
+        self._pending_rows = 0
+        self._pending_block = None
+
+    @abc.abstractmethod
+    def _seal(self, first_seq: int, rows: _Rows):
+        """Store ``rows``; returns the block's index entry, or None on failure."""
+
+    def _forget(self) -> list:
+        """Drop the index entries of blocks wholly before ``first_seq``; returns them."""
+        keep = bisect.bisect_right(self._block_seqs, self._first_seq)
+        if keep and self._blocks[keep - 1].first_seq + self._blocks[keep - 1].count > self._first_seq:
+            keep -= 1
+        gone = self._blocks[:keep]
+        for ref in gone:
+            self._cache.pop(ref.first_seq, None)
+        del self._blocks[:keep]
+        del self._block_seqs[:keep]
+        return gone
+
+    # ── Reading ─────────────────────────────────────────
+    def _locate(self, row: int) -> tuple[_Rows, int]:
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        seq = self._first_seq + row
+        pending_start = self._end_seq - self._pending_rows
+        if seq >= pending_start:
+            return self._merged_pending(), seq - pending_start
+        b = bisect.bisect_right(self._block_seqs, seq) - 1
+        return self._rows(self._blocks[b]), seq - self._block_seqs[b]
+
+    def _spans(self, start: int, stop: int):
+        """(block index entry, first index, count) pieces covering rows
+        [start, stop); the entry is None for the rows still pending."""
+        seq = self._first_seq + max(0, start)
+        end = self._first_seq + min(stop, len(self))
+        pending_start = self._end_seq - self._pending_rows
+        while seq < end:
+            if seq >= pending_start:
+                yield None, seq - pending_start, end - seq
+                return
+            b = bisect.bisect_right(self._block_seqs, seq) - 1
+            ref = self._blocks[b]
+            i = seq - ref.first_seq
+            n = min(ref.count - i, end - seq)
+            yield ref, i, n
+            seq += n
+
+    def _rows(self, ref) -> _Rows:
+        if ref is None:
+            return self._merged_pending()
+        rows = self._cache.get(ref.first_seq)
+        if rows is not None:
+            self._cache.move_to_end(ref.first_seq)
+            return rows
+        rows = self._cache[ref.first_seq] = self._decode(ref)
+        if len(self._cache) > self._cache_blocks:
+            self._cache.popitem(last=False)
+        return rows
+
+    @abc.abstractmethod
+    def _decode(self, ref) -> _Rows:
+        """The rows of the block ``ref`` indexes."""
+
+    def _merged_pending(self) -> _Rows:
+        if self._pending_block is None:
+            columns = {
+                name: np.concatenate([part[name] for part, _ in self._pending]) for name, _ in _FIELDS
+            }
+            self._pending_block = _Rows(columns, _starts(columns["msg_length"]), b"".join(b for _, b in self._pending))
+        return self._pending_block
+
+    def column(self, name: str, start: int, stop: int) -> np.ndarray:
+        """Values of ``name`` for archive rows [start, stop), paging blocks in."""
+        parts = [self._rows(ref).columns[name][i : i + n] for ref, i, n in self._spans(start, stop)]
+        if not parts:
+            return np.zeros(0, dtype=dict(_FIELDS)[name])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def text_candidates(self, needles: list[bytes], start: int, stop: int) -> np.ndarray:
+        """Mask over archive rows [start, stop) that may contain every needle:
+        all of them, without a text index."""
+        return np.ones(max(0, min(stop, len(self)) - start), dtype=bool)
+
+    def copy_rows(self, start: int, stop: int) -> tuple[dict[str, np.ndarray], bytes]:
+        """Archive rows [start, stop) in the form LogStorage.copy_rows returns."""
+        spans = [(self._rows(ref), i, n) for ref, i, n in self._spans(start, stop)]
+        columns = {
+            name: np.concatenate([rows.columns[name][i : i + n] for rows, i, n in spans] or [np.zeros(0, dtype)])
+            for name, dtype in _FIELDS
+        }
+        blob = b"".join(
+            rows.blob[rows.starts[i] : rows.starts[i + n - 1] + rows.columns["msg_length"][i + n - 1]]
+            for rows, i, n in spans
+        )
+        return columns, blob
+
+    def field(self, name: str, row: int) -> int:
+        rows, i = self._locate(row)
+        return int(rows.columns[name][i])
+
+    def message(self, row: int) -> str:
+        rows, i = self._locate(row)
+        start = int(rows.starts[i])
+        return rows.blob[start : start + int(rows.columns["msg_length"][i])].decode("utf-8", "replace")
+
+
+class HistoryStore(_Archive):
+    """Append-only, segment-based archive on disk.
+
+    Each sealed block is zlib-compressed and appended to the open segment
+    file, which rolls over at ``segment_bytes``; its index entry holds the
+    block's sequence range and file position, and the block is paged back
+    in on demand.
+
+    ``quota_bytes`` bounds the disk used: ``excess_rows()`` reports how
+    many of the oldest rows must go (whole segments) and ``evict()``
+    deletes them. Tags are stored as codes of the session's SymbolTable,
+    so the directory is removed by ``close()``.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        quota_bytes: int = 2 << 30,
+        segment_bytes: int = _SEGMENT_BYTES,
+        cache_blocks: int = _CACHE_BLOCKS,
+    ):
+        super().__init__(cache_blocks)
+        self._directory = tempfile.mkdtemp(prefix="prycat-history-", dir=directory)
+        self._quota = max(1, quota_bytes)
+        # Several segments per quota, so trimming never empties the archive
+        self._segment_bytes = max(1 << 20, min(segment_bytes, self._quota // 4))
+        self._segments: OrderedDict[int, _Segment] = OrderedDict()
+        self._next_segment = 0
+        self._io = threading.Lock()  # a segment's file position is shared by seek+read/write
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def disk_bytes(self) -> int:
+        return sum(segment.size for segment in self._segments.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in memory: index, pending rows and decoded blocks."""
+        return len(self._blocks) * 120 + self._pending_bytes + self._cached_bytes
+
+    # ── Writing ─────────────────────────────────────────
+    def reset(self, first_seq: int) -> None:
+        for segment in self._segments.values():
+            self._remove(segment)
+        self._segments.clear()
+        super().reset(first_seq)
+
+    def _seal(self, first_seq: int, rows: _Rows) -> _BlockRef | None:
+        payload = b"".join(rows.columns[name].astype(dtype, copy=False).tobytes() for name, dtype in _FIELDS)
+        data = zlib.compress(payload + rows.blob, 1)
+        count = len(rows.columns["msg_length"])
+
+        segment = self._open_segment()
+        offset = segment.size
+        try:
+            with self._io:
+                segment.file.seek(offset)
+                segment.file.write(_HEADER.pack(count, len(data)) + data)
+                segment.file.flush()
+        except OSError:
+            return None  # e.g. disk full
+        segment.size += _HEADER.size + len(data)
+        segment.end_seq = self._end_seq
+        return _BlockRef(first_seq, count, self._next_segment - 1, offset + _HEADER.size, len(data))
+
+    def _open_segment(self) -> _Segment:
+        if self._segments:
+            segment = next(reversed(self._segments.values()))
+            if segment.size < self._segment_bytes:
+                return segment
+        path = os.path.join(self._directory, f"segment-{self._next_segment:06d}.bin")
+        segment = self._segments[self._next_segment] = _Segment(path)
+        self._next_segment += 1
+        return segment
+
+    # ── Quota ───────────────────────────────────────────
+    def excess_rows(self, incoming: int = 0) -> int:
+        """Oldest rows to evict so the segments fit the quota again.
+
+        Rows about to be appended (``incoming``) take no disk until
+        their block is written, so they are not counted.
+        """
+        total = self.disk_bytes
+        seq = self._first_seq
+        segments = list(self._segments.values())[:-1]  # never the one being written
+        for segment in segments:
+            if total <= self._quota:
+                break
+            total -= segment.size
+            seq = segment.end_seq
+        return seq - self._first_seq
+
+    def evict(self, count: int) -> None:
+        """Forget the ``count`` oldest rows, deleting segments left unused."""
+        count = min(count, len(self))
+        if count <= 0:
+            return
+        self._first_seq += count
+        while self._segments:
+            number, segment = next(iter(self._segments.items()))
+            if segment.end_seq > self._first_seq or number == self._next_segment - 1:
+                break
+            del self._segments[number]
+            self._remove(segment)
+        self._forget()
+
+    def _remove(self, segment: _Segment) -> None:
+        segment.file.close()
+        try:
+            os.unlink(segment.path)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        self.reset(self._end_seq)
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    # ── Reading ─────────────────────────────────────────
+    def _decode(self, ref: _BlockRef) -> _Rows:
+        segment = self._segments[ref.segment]
+        with self._io:
+            segment.file.seek(ref.offset)
+            data = segment.file.read(ref.size)
+        data = zlib.decompress(data)
+        columns = {}
+        pos = 0
+        for name, dtype in _FIELDS:
+            end = pos + dtype.itemsize * ref.count
+            columns[name] = np.frombuffer(data, dtype=dtype, count=ref.count, offset=pos)
+            pos = end
+        return _Rows(columns, _starts(columns["msg_length"]), data[pos:])
+
+
+class ColdStore(_Archive):
+    """In-memory archive holding evicted rows compressed.
+
+    Each sealed block is compressed column by column, with the messages
+    apart: columns with zlib, as filters decompress them, and messages
+    with ``compression`` ("zlib", or "lzma" to pack tighter but slower).
+    Timestamps are stored as deltas first, which makes them nearly free.
+    Compression runs on a worker thread, so sealing a block never stalls
+    ingest; until it is done the block is read uncompressed, and once
+    ``_MAX_SEALING`` blocks wait appends wait for the oldest.
+
+    Filtering on a column decompresses just that column of each block.
+    Reading a row (for display, text matching or export) decodes its whole
+    block into the LRU, so scrolling through cold rows costs one decode
+    per block. The live buffer's trigram signatures are kept with each
+    block, so only blocks that may contain a search are ever decompressed
+    for it.
+
+    The archive holds at most ``max_rows`` rows and, with ``max_bytes``,
+    at most that many bytes of memory: ``excess_rows()`` counts the
+    oldest rows to evict and ``evict()`` drops them. Whole blocks are
+    released once every row in them has gone.
+    """
+
+    indexes_text = True
+
+    def __init__(
+        self,
+        max_rows: int,
+        max_bytes: int | None = None,
+        compression: str = "zlib",
+        cache_blocks: int = _COLD_CACHE_BLOCKS,
+    ):
+        if compression not in _CODECS:
+            raise ValueError(f"unknown compression: {compression}")
+        super().__init__(cache_blocks)
+        self.max_rows = max(0, max_rows)
+        self.max_bytes = max_bytes
+        self._compress, self._decompress = _CODECS[compression]
+        self._pool: ThreadPoolExecutor | None = None  # started with the first block
+        self._sealing: deque[_Sealing] = deque()
+        self._stored = 0  # bytes of the compressed blocks
+        self._raw = 0     # what they took uncompressed
+        # Index block -> trigram bitmap, for the rows not sealed yet
+        self._pending_signatures: dict[int, np.ndarray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held: compressed blocks, blocks being compressed, pending
+        rows and decoded blocks."""
+        sealing = sum(ref.nbytes for ref in self._sealing)
+        signatures = len(self._pending_signatures) * (SIGNATURE_BYTES + 100)
+        return self._stored + sealing + self._pending_bytes + self._cached_bytes + signatures
+
+    @property
+    def ratio(self) -> float:
+        """Uncompressed size of the compressed rows over what they take now."""
+        return self._raw / self._stored if self._stored else 0.0
+
+    # ── Writing ─────────────────────────────────────────
+    def reset(self, first_seq: int) -> None:
+        super().reset(first_seq)
+        self._sealing.clear()  # results still coming are ignored
+        self._pending_signatures.clear()
+        self._stored = self._raw = 0
+
+    def append(
+        self,
+        columns: dict[str, np.ndarray],
+        blob: bytes,
+        signatures: tuple[int, np.ndarray] | None = None,
+    ) -> None:
+        self._collect()
+        if signatures is not None:
+            # A block the last batch ended in comes again, now with more rows
+            first_block, bits = signatures
+            for block, row in enumerate(bits, first_block):
+                self._pending_signatures[block] = row
+        super().append(columns, blob)
+
+    def _seal(self, first_seq: int, rows: _Rows) -> _Sealing:
+        count = len(rows.starts)
+        first_block = first_seq // INDEX_ROWS
+        last_block = (first_seq + count - 1) // INDEX_ROWS
+        pending = self._pending_signatures
+        signatures = np.full((last_block - first_block + 1, SIGNATURE_BYTES), 0xFF, dtype=np.uint8)
+        for block in range(first_block, last_block + 1):
+            # The last one may go on into the next block, so it stays pending
+            bits = pending.get(block) if block == last_block else pending.pop(block, None)
+            if bits is not None:
+                signatures[block - first_block] = bits
+
+        if len(self._sealing) >= _MAX_SEALING:
+            self._collect(wait=True)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prycat-compress")
+        done = self._pool.submit(self._compressed, first_seq, rows, signatures)
+        ref = _Sealing(first_seq, count, rows, signatures, done)
+        self._sealing.append(ref)
+        return ref
+
+    def _compressed(self, first_seq: int, rows: _Rows, signatures: np.ndarray) -> _ColdBlock:
+        """The block of ``rows``, compressed; runs on the worker thread."""
+        columns = {}
+        for name, dtype in _FIELDS:
+            values = rows.columns[name].astype(dtype, copy=False)
+            if name == "timestamp":
+                values = np.diff(values, prepend=values.dtype.type(0))
+            columns[name] = zlib.compress(values.tobytes(), 6)
+        raw = len(rows.starts) * _ROW_BYTES + len(rows.blob)
+        return _ColdBlock(first_seq, len(rows.starts), columns, self._compress(rows.blob), signatures, raw)
+
+    def _collect(self, wait: bool = False) -> None:
+        """Swap compressed blocks in for their rows; with ``wait``, at
+        least the oldest block being compressed."""
+        sealing = self._sealing
+        while sealing and (sealing[0].done.done() or wait):
+            block = sealing.popleft().done.result()
+            wait = False
+            b = bisect.bisect_left(self._block_seqs, block.first_seq)
+            if b == len(self._blocks) or self._block_seqs[b] != block.first_seq:
+                continue  # evicted meanwhile
+            self._blocks[b] = block
+            self._stored += block.nbytes
+            self._raw += block.raw
+
+    # ── Bounds ──────────────────────────────────────────
+    def excess_rows(self, incoming: int = 0) -> int:
+        """Oldest rows to evict so that, with ``incoming`` more rows
+        appended, the archive is within ``max_rows`` and ``max_bytes``."""
+        self._collect()
+        rows = max(0, len(self) + incoming - self.max_rows)
+        if self.max_bytes is not None:
+            over = self.nbytes - self.max_bytes
+            for ref in self._blocks:
+                if over <= 0:
+                    break
+                over -= ref.nbytes
+                rows = max(rows, ref.first_seq + ref.count - self._first_seq)
+        return rows
+
+    def evict(self, count: int) -> None:
+        """Forget the ``count`` oldest rows, releasing blocks left unused."""
+        count = min(count, len(self))
+        if count <= 0:
+            return
+        self._first_seq += count
+        for ref in self._forget():
+            if isinstance(ref, _ColdBlock):
+                self._stored -= ref.nbytes
+                self._raw -= ref.raw
+
+    def close(self) -> None:
+        self.reset(self._end_seq)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ── Reading ─────────────────────────────────────────
+    def _decode(self, ref: _ColdBlock | _Sealing) -> _Rows:
+        if isinstance(ref, _Sealing):
+            return ref.rows
+        columns = {name: self._decode_column(ref, name) for name, _ in _FIELDS}
+        return _Rows(columns, _starts(columns["msg_length"]), self._decompress(ref.messages))
+
+    def _decode_column(self, ref: _ColdBlock, name: str) -> np.ndarray:
+        values = np.frombuffer(zlib.decompress(ref.columns[name]), dtype=dict(_FIELDS)[name])
+        if name == "timestamp":
+            values = np.cumsum(values, dtype=values.dtype)
+        return values
+
+    def column(self, name: str, start: int, stop: int) -> np.ndarray:
+        """Values of ``name`` for archive rows [start, stop), decompressing
+        only that column of blocks not already decoded."""
+        parts = []
+        for ref, i, n in self._spans(start, stop):
+            if ref is None:
+                rows = self._merged_pending()
+            elif isinstance(ref, _Sealing):
+                rows = ref.rows
+            else:
+                rows = self._cache.get(ref.first_seq)
+            values = rows.columns[name] if rows is not None else self._decode_column(ref, name)
+            parts.append(values[i : i + n])
+        if not parts:
+            return np.zeros(0, dtype=dict(_FIELDS)[name])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def text_candidates(self, needles: list[bytes], start: int, stop: int) -> np.ndarray:
+        """Mask over archive rows [start, stop) that may contain every
+        needle, from the trigram signatures kept with each block."""
+        parts = []
+        for ref, i, n in self._spans(start, stop):
+            if ref is None:
+                parts.append(np.ones(n, dtype=bool))  # not sealed yet
+                continue
+            hits = signature_hits(ref.signatures, np.arange(len(ref.signatures)), needles)
+            seq = np.arange(ref.first_seq + i, ref.first_seq + i + n, dtype=np.int64)
+            parts.append(hits[seq // INDEX_ROWS - ref.first_seq // INDEX_ROWS])
+        if not parts:
+            return np.zeros(0, dtype=bool)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def _starts(lengths: np.ndarray) -> np.ndarray:
+    return np.cumsum(lengths, dtype=np.int64) - lengths
+
+
+class TieredStorage:
+    """LogStorage whose evicted rows move to an archive instead of vanishing.
+
+    Rows [0, len(history)) are archived and the rest are the live ring
+    buffer's, so views page history in simply by reading those rows.
+    Rows only really leave (``overflow()``/``evict()``) when the archive
+    exceeds its bounds: a HistoryStore's disk quota, or a ColdStore's
+    rows and bytes. ``capacity`` is the live buffer's plus the rows a
+    ColdStore may hold.
+
+    Moving rows into history renumbers the live ones without changing
+    ``first_seq``, so reads and mutations share a lock for the sake of
+    background readers such as the Exporter.
+    """
+
+    def __init__(self, live: LogStorage, history: HistoryStore | ColdStore):
+        self._live = live
+        self._history = history
+        self._lock = threading.RLock()
+        self._live_fields = {
+            "timestamp": live.timestamp, "pid": live.pid, "tid": live.tid,
+            "priority": live.priority, "uid": live.uid, "tag": live.tag_code,
+            "device": live.device_code,
+        }
+        history.reset(live.first_seq)
+
+    def __len__(self) -> int:
+        return len(self._history) + len(self._live)
+
+    @property
+    def live(self) -> LogStorage:
+        return self._live
+
+    @property
+    def history(self) -> HistoryStore | ColdStore:
+        return self._history
+
+    @property
+    def capacity(self) -> int:
+        return self._live.capacity + self._history.max_rows
+
+    @property
+    def max_bytes(self) -> int | None:
+        if self._live.max_bytes is None or self._history.max_bytes is None:
+            return self._live.max_bytes
+        return self._live.max_bytes + self._history.max_bytes
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._live.symbols
+
+    @property
+    def first_seq(self) -> int:
+        return self._history.first_seq
+
+    @property
+    def generation(self) -> int:
+        return self._live.generation
+
+    # ── Mutation ────────────────────────────────────────
+    def extend(self, records: list[LogRecord]) -> None:
+        with self._lock:
+            live = self._live
+            # In steps the ring takes whole, so nothing is dropped by the ring itself
+            while records and live.capacity:
+                count = live.room(min(len(records), live.capacity), self._incoming_bytes(records[: live.capacity]))
+                chunk, records = records[:count], records[count:]
+                moved = live.overflow(count, self._incoming_bytes(chunk))
+                if moved:
+                    columns, blob = live.copy_rows(0, moved)
+                    signatures = live.text_signatures(0, moved) if self._history.indexes_text else None
+                    self._history.append(columns, blob, signatures)
+                    live.evict(moved)
+                live.extend(chunk)
+
+    def room(self, count: int, nbytes: int = 0) -> int:
+        # What the live buffer cannot hold at once goes to the archive, up
+        # to a ColdStore's row cap
+        if not self._history.max_rows:
+            return count
+        held = self._live.room(count, nbytes + self._shared_bytes())
+        return min(count, held + self._history.max_rows)
+
+    def _incoming_bytes(self, records: list[LogRecord]) -> int:
+        """``nbytes`` for the live buffer's ``room()``/``overflow()``."""
+        if self._live.max_bytes is None:
+            return 0
+        return message_bytes(records) + self._shared_bytes()
+
+    def _shared_bytes(self) -> int:
+        # The archive's index and caches share the live buffer's budget
+        # when it has none of its own
+        if self._live.max_bytes is not None and self._history.max_bytes is None:
+            return self._history.nbytes
+        return 0
+
+    def overflow(self, count: int, nbytes: int = 0) -> int:
+        # Rows the live buffer hands over count toward the archive: those it
+        # cannot hold at once and those its rows or byte budget push out. The
+        # latter are estimated at the batch's average message size, so the
+        # archive may end a few rows over, which the next batch evicts
+        live = self._live
+        shared = self._shared_bytes()
+        held = live.room(count, nbytes + shared)
+        moving = count - held + live.overflow(held, nbytes * held // max(1, count) + shared)
+        return min(self._history.excess_rows(moving), len(self))
+
+    def evict(self, count: int) -> None:
+        with self._lock:
+            archived = min(count, len(self._history))
+            self._history.evict(archived)
+            if count > archived:
+                self._live.evict(count - archived)
+                self._history.reset(self._live.first_seq)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._live.clear()
+            self._history.reset(self._live.first_seq)
+
+    # ── Access ──────────────────────────────────────────
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        with self._lock:
+            split = len(self._history)
+            stop = len(self) if stop is None else min(stop, len(self))
+            if start >= split:
+                return self._live.column(name, start - split, stop - split)
+            old = self._history.column(name, start, min(stop, split))
+            if stop <= split:
+                return old
+            return np.concatenate((old, self._live.column(name, 0, stop - split)))
+
+    def text_candidates(self, needles: list[bytes], start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Archived rows are candidates as their archive says (HistoryStore: all)."""
+        with self._lock:
+            split = len(self._history)
+            stop = len(self) if stop is None else min(stop, len(self))
+            old = self._history.text_candidates(needles, start, min(stop, split))
+            if stop <= split:
+                return old
+            return np.concatenate((old, self._live.text_candidates(needles, max(0, start - split), stop - split)))
+
+    def timestamp(self, row: int) -> int:
+        return self._get("timestamp", row)
+
+    def pid(self, row: int) -> int:
+        return self._get("pid", row)
+
+    def tid(self, row: int) -> int:
+        return self._get("tid", row)
+
+    def priority(self, row: int) -> int:
+        return self._get("priority", row)
+
+    def uid(self, row: int) -> int:
+        return self._get("uid", row)
+
+    def device_code(self, row: int) -> int:
+        return self._get("device", row)
+
+    def device(self, row: int) -> str:
+        code = self.device_code(row)
+        return self.symbols.lookup(code) if code >= 0 else ""
+
+    def tag_code(self, row: int) -> int:
+        return self._get("tag", row)
+
+    def tag(self, row: int) -> str:
+        return self.symbols.lookup(self.tag_code(row))
+
+    def message(self, row: int) -> str:
+        with self._lock:
+            split = len(self._history)
+            if row < split:
+                return self._history.message(row)
+            return self._live.message(row - split)
+
+    def entry(self, row: int) -> LogEntry:
+        with self._lock:
+            return LogEntry(
+                timestamp=format_timestamp(self.timestamp(row)),
+                pid=str(self.pid(row)),
+                tid=str(self.tid(row)),
+                priority=PRIORITY_LETTERS[self.priority(row)],
+                tag=self.tag(row),
+                message=self.message(row),
+                device=self.device(row),
+            )
+
+    def copy_rows(self, start: int, stop: int) -> tuple[dict[str, np.ndarray], bytes]:
+        with self._lock:
+            split = len(self._history)
+            stop = min(stop, len(self))
+            if start >= split:
+                return self._live.copy_rows(start - split, stop - split)
+            old, old_blob = self._history.copy_rows(start, min(stop, split))
+            if stop <= split:
+                return old, old_blob
+            new, new_blob = self._live.copy_rows(0, stop - split)
+            return {name: np.concatenate((old[name], new[name])) for name in old}, old_blob + new_blob
+
+    def _get(self, name: str, row: int) -> int:
+        with self._lock:
+            split = len(self._history)
+            if row < split:
+                return self._history.field(name, row)
+            return self._live_fields[name](row - split)
+
+    # ── Accounting ──────────────────────────────────────
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._live.nbytes + self._history.nbytes
+
+    @property
+    def bytes_per_entry(self) -> float:
+        return self.nbytes / len(self) if len(self) else 0.0
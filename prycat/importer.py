@@ -0,0 +1,118 @@
+"""ParallelImport: parse a whole capture file across worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from .logfile import BLOCK_LINES, FileStorage, _Block, parse_lines
+
+CHUNK_BLOCKS = 64  # blocks per task, ~65k lines
+
+
+def _parse_range(path: str, start: int, end: int, count: int) -> tuple[_Block, list[str]]:
+    """Worker: parse ``count`` lines at [start, end) of ``path``.
+
+    Tags are coded against a table local to the call and returned with
+    the columns, so workers share no state with the GUI process.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    codes: dict[str, int] = {}
+
+    def intern(tag: str) -> int:
+        code = codes.get(tag)
+        if code is None:
+            code = codes[tag] = len(codes)
+        return code
+
+    return parse_lines(raw, start, count, intern), list(codes)
+
+
+class ParallelImport:
+    """Parses every block of a FileStorage up front, in a process pool.
+
+    The file is cut into ranges of ``CHUNK_BLOCKS`` blocks taken from the
+    storage's line index, so each range starts on a line boundary; ranges
+    are submitted as the index grows, a couple per worker in flight.
+    Results are merged in file order from a coordinator thread, so rows
+    that are already parsed always form a prefix of the file. ``progress``
+    and ``cancel()`` are safe to use from the GUI thread.
+    """
+
+    def __init__(self, storage: FileStorage, workers: int | None = None):
+        self._storage = storage
+        self._workers = workers or os.cpu_count() or 1
+        self._cancel = threading.Event()
+        self._parsed = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        # Blocks kept by an earlier, cancelled import are parsed again
+        self._storage.reset_parsed()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the file parsed; estimated while it is still indexing."""
+        total = len(self._storage)
+        if not total:
+            return 0.0 if self._storage.indexing else 1.0
+        return self._parsed / total * self._storage.progress
+
+    @property
+    def parsed_lines(self) -> int:
+        return self._parsed
+
+    def cancel(self) -> None:
+        """Stop submitting, drop queued ranges and wait for the coordinator."""
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # ── Coordinator thread ──────────────────────────────
+    def _run(self) -> None:
+        try:
+            pool = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, RuntimeError):
+            pool = None  # no worker processes available: parse in this thread
+        pending: deque[tuple[int, Future | tuple[_Block, list[str]]]] = deque()
+        next_block = 0
+        try:
+            while not self._cancel.is_set():
+                while len(pending) < 2 * self._workers:
+                    start, end, lines, final = self._storage.block_span(next_block, CHUNK_BLOCKS)
+                    # Whole blocks only, until the scan has found the real end
+                    if not final or not lines:
+                        break
+                    args = (self._storage.path, start, end, lines)
+                    pending.append((next_block, pool.submit(_parse_range, *args) if pool else _parse_range(*args)))
+                    next_block += -(-lines // BLOCK_LINES)
+                if not pending:
+                    if not self._storage.indexing and not lines:
+                        return
+                    self._cancel.wait(0.05)
+                    continue
+                first, result = pending[0]
+                if isinstance(result, Future):
+                    try:
+                        result = result.result(timeout=0.1)
+                    except FutureTimeout:
+                        continue
+                pending.popleft()
+                block, tags = result
+                self._storage.add_parsed(first, block, tags)
+                self._parsed += len(block.timestamp)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
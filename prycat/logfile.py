@@ -0,0 +1,359 @@
+"""FileStorage: read-only LogStorage over a memory-mapped logcat text file."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from .reader import _LOGCAT_RE
+from .storage import PRIORITY_LETTERS, PRIORITY_ORDER, LogEntry, format_timestamp, parse_timestamp
+from .symbols import SymbolTable
+
+BLOCK_LINES = 1024          # lines per index entry and per parsed block
+_SCAN_BYTES = 16 << 20      # newline scan step
+_CACHE_BLOCKS = 256         # parsed blocks kept, about 8 MB
+_LINE_BYTES = 33            # parsed column bytes per line (see _Block)
+
+# The reader's threadtime grammar, applied to raw bytes so message offsets
+# point straight into the mapping
+_LOGCAT_BYTES_RE = re.compile(_LOGCAT_RE.pattern.encode())
+
+
+class _Block(NamedTuple):
+    timestamp: np.ndarray   # int64
+    pid: np.ndarray         # int32
+    tid: np.ndarray         # int32
+    priority: np.ndarray    # int8
+    tag: np.ndarray         # int32 symbol codes
+    msg_start: np.ndarray   # int64 file offsets
+    msg_length: np.ndarray  # int32
+
+
+def parse_lines(raw: bytes, start: int, count: int, intern: Callable[[str], int]) -> _Block:
+    """Parse the first ``count`` lines of ``raw``, read from file offset ``start``.
+
+    ``intern`` maps tags to codes; a process-local table works as long as
+    the codes are remapped before the block is used.
+    """
+    empty = intern("")
+    timestamp, pid, tid, priority, tag, msg_start, msg_length = [], [], [], [], [], [], []
+    match = _LOGCAT_BYTES_RE.match
+    stamps: dict[bytes, int] = {}
+    stamp = 0  # unparsed lines inherit the previous timestamp
+    offset = start
+    for line in raw.split(b"\n")[:count]:
+        line_start = offset
+        offset += len(line) + 1
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        m = match(line)
+        if m is None:
+            pid.append(0)
+            tid.append(0)
+            priority.append(0)
+            tag.append(empty)
+            msg_start.append(line_start)
+            msg_length.append(len(line))
+        else:
+            text = m.group(1)
+            stamp = stamps.get(text)
+            if stamp is None:
+                stamp = stamps[text] = parse_timestamp(text.decode("ascii"))
+            pid.append(int(m.group(2)))
+            tid.append(int(m.group(3)))
+            priority.append(PRIORITY_ORDER[chr(m.group(4)[0])])
+            tag.append(intern(m.group(5).strip().decode("utf-8", "replace")))
+            msg_start.append(line_start + m.start(6))
+            msg_length.append(m.end(6) - m.start(6))
+        timestamp.append(stamp)
+    return _Block(
+        np.array(timestamp, dtype=np.int64),
+        np.array(pid, dtype=np.int32),
+        np.array(tid, dtype=np.int32),
+        np.array(priority, dtype=np.int8),
+        np.array(tag, dtype=np.int32),
+        np.array(msg_start, dtype=np.int64),
+        np.array(msg_length, dtype=np.int32),
+    )
+
+
+class FileStorage:
+    """Lazily parsed rows of a threadtime capture such as ``adb logcat -d``.
+
+    The file is memory-mapped and a background thread scans it for
+    newlines, recording only the offset of every ``BLOCK_LINES``-th line,
+    so rows become available as soon as the first stretch is scanned and
+    the index stays a few bytes per thousand lines. A block is parsed
+    with the reader's threadtime grammar only when one of its rows is
+    displayed or filtered, into small NumPy columns held in an LRU;
+    message text stays in the mapping until it is asked for. Lines that
+    are not threadtime (buffer separators, bugreport sections) become
+    rows holding just the raw line.
+
+    Blocks parsed elsewhere (see ``ParallelImport``) can be handed over
+    with ``add_parsed``; those are kept until ``reset_parsed()`` or ``close()``.
+
+    Implements the read side of LogStorage, so LogcatModel, LogFilter and
+    the proxy work over it unchanged. Rows are never evicted.
+    """
+
+    def __init__(self, path: str, symbols: SymbolTable | None = None, cache_blocks: int = _CACHE_BLOCKS):
+        self._path = path
+        self._symbols = symbols if symbols is not None else SymbolTable()
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+
+        self._lock = threading.Lock()
+        self._starts = [0]      # byte offset of line k * BLOCK_LINES
+        self._count = 0         # complete lines indexed so far
+        self._scanned = 0       # bytes scanned so far
+        self._lines_end = 0     # offset just past the last indexed line
+        self._done = False
+        self._cancel = threading.Event()
+
+        self._blocks: OrderedDict[int, _Block] = OrderedDict()
+        self._cache_blocks = max(1, cache_blocks)
+        self._cache_lock = threading.Lock()
+        self._imported: dict[int, _Block] = {}
+
+        self._thread = threading.Thread(target=self._scan, daemon=True)
+        self._thread.start()
+
+    # ── Index ───────────────────────────────────────────
+    def _scan(self) -> None:
+        # Scanned through plain reads rather than the mapping, so indexing
+        # doesn't leave the whole file resident in this process
+        buffer = bytearray(_SCAN_BYTES)
+        pos = 0
+        with open(self._path, "rb", buffering=0) as f:
+            while pos < self._size and not self._cancel.is_set():
+                # Anything appended after opening lies outside the mapping
+                n = min(f.readinto(buffer), self._size - pos)
+                if n <= 0:
+                    break
+                chunk = np.frombuffer(buffer, dtype=np.uint8, count=n)
+                # Offsets where a new line starts, i.e. just past each newline
+                starts = np.flatnonzero(chunk == 10) + (pos + 1)
+                self._publish(starts, pos + n)
+                pos += n
+        with self._lock:
+            if not self._cancel.is_set() and self._lines_end < self._size:
+                self._count += 1  # unterminated last line
+                self._lines_end = self._size
+            self._scanned = self._size
+            self._done = True
+
+    def _publish(self, starts: np.ndarray, scanned: int) -> None:
+        """Record the line starts found in one scanned stretch."""
+        with self._lock:
+            # Keep every BLOCK_LINES-th start; line k begins after newline k-1
+            first = (-(self._count + 1)) % BLOCK_LINES
+            self._starts.extend(starts[first::BLOCK_LINES].tolist())
+            self._count += len(starts)
+            if len(starts):
+                self._lines_end = int(starts[-1])
+            self._scanned = scanned
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def indexing(self) -> bool:
+        """True while the background newline scan is still running."""
+        return not self._done
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the file indexed so far."""
+        return self._scanned / self._size if self._size else 1.0
+
+    def close(self) -> None:
+        self._cancel.set()
+        self._thread.join()
+        self._blocks.clear()
+        self.reset_parsed()
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    # ── LogStorage interface ────────────────────────────
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._count
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._symbols
+
+    @property
+    def first_seq(self) -> int:
+        return 0
+
+    @property
+    def generation(self) -> int:
+        return 0
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Values of ``name`` for rows [start, stop), parsing blocks as needed."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if name in ("uid", "device"):
+            return np.full(max(0, stop - start), -1, dtype=np.int32)
+        if name not in _Block._fields[:5]:
+            raise KeyError(name)
+        return self._gather(name, start, stop)
+
+    def copy_rows(self, start: int, stop: int) -> tuple[dict[str, np.ndarray], bytes]:
+        """Rows [start, stop) in the form LogStorage.copy_rows returns."""
+        stop = min(stop, self._count)
+        columns = {name: self.column(name, start, stop) for name in (*_Block._fields[:5], "uid", "device")}
+        starts = self._gather("msg_start", start, stop)
+        columns["msg_length"] = lengths = self._gather("msg_length", start, stop)
+        mm = self._mm
+        return columns, b"".join(mm[s : s + n] for s, n in zip(starts.tolist(), lengths.tolist()))
+
+    def _gather(self, name: str, start: int, stop: int) -> np.ndarray:
+        """Field ``name`` of rows [start, stop), parsing blocks as needed."""
+        if start >= stop:
+            return np.zeros(0, dtype=np.int64)
+        parts = []
+        for b in range(start // BLOCK_LINES, (stop - 1) // BLOCK_LINES + 1):
+            base = b * BLOCK_LINES
+            values = getattr(self._block(b), name)
+            parts.append(values[max(0, start - base) : stop - base])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def text_candidates(self, needles: list[bytes], start: int = 0, stop: int | None = None) -> np.ndarray:
+        """No trigram index over files: every row is a candidate."""
+        stop = self._count if stop is None else min(stop, self._count)
+        return np.ones(max(0, stop - start), dtype=bool)
+
+    def timestamp(self, row: int) -> int:
+        block, i = self._locate(row)
+        return int(block.timestamp[i])
+
+    def pid(self, row: int) -> int:
+        block, i = self._locate(row)
+        return int(block.pid[i])
+
+    def tid(self, row: int) -> int:
+        block, i = self._locate(row)
+        return int(block.tid[i])
+
+    def priority(self, row: int) -> int:
+        block, i = self._locate(row)
+        return int(block.priority[i])
+
+    def uid(self, row: int) -> int:
+        return -1
+
+    def device_code(self, row: int) -> int:
+        return -1
+
+    def device(self, row: int) -> str:
+        return ""
+
+    def tag_code(self, row: int) -> int:
+        block, i = self._locate(row)
+        return int(block.tag[i])
+
+    def tag(self, row: int) -> str:
+        return self._symbols.lookup(self.tag_code(row))
+
+    def message(self, row: int) -> str:
+        block, i = self._locate(row)
+        start = int(block.msg_start[i])
+        return self._mm[start : start + int(block.msg_length[i])].decode("utf-8", "replace")
+
+    def entry(self, row: int) -> LogEntry:
+        block, i = self._locate(row)
+        return LogEntry(
+            timestamp=format_timestamp(int(block.timestamp[i])),
+            pid=str(block.pid[i]),
+            tid=str(block.tid[i]),
+            priority=PRIORITY_LETTERS[block.priority[i]],
+            tag=self._symbols.lookup(int(block.tag[i])),
+            message=self.message(row),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in Python: the sparse index and the parsed-block cache."""
+        blocks = len(self._blocks) + len(self._imported)
+        return len(self._starts) * 8 + _LINE_BYTES * BLOCK_LINES * blocks
+
+    @property
+    def bytes_per_entry(self) -> float:
+        return self.nbytes / self._count if self._count else 0.0
+
+    # ── Blocks ──────────────────────────────────────────
+    def _locate(self, row: int) -> tuple[_Block, int]:
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return self._block(row // BLOCK_LINES), row % BLOCK_LINES
+
+    def _block(self, b: int) -> _Block:
+        block = self._imported.get(b)
+        if block is not None:
+            return block
+        with self._cache_lock:
+            block = self._blocks.get(b)
+            if block is not None:
+                self._blocks.move_to_end(b)
+                return block
+        start, end, lines, complete = self.block_span(b, 1)
+        block = parse_lines(self._mm[start:end], start, lines, self._symbols.intern)
+        # The last block may still grow while indexing; only cache it once whole
+        if complete:
+            with self._cache_lock:
+                self._blocks[b] = block
+                if len(self._blocks) > self._cache_blocks:
+                    self._blocks.popitem(last=False)
+        return block
+
+    def reset_parsed(self) -> None:
+        """Forget blocks kept by ``add_parsed``; rows are parsed lazily again."""
+        with self._cache_lock:
+            self._imported = {}  # swapped, not cleared: readers don't take the lock
+
+    def block_span(self, first: int, count: int) -> tuple[int, int, int, bool]:
+        """(start, end, lines, final) for up to ``count`` blocks from ``first``.
+
+        Spans cover whole blocks while any are known, otherwise the last
+        block as indexed so far; ``final`` is False while that can grow.
+        """
+        with self._lock:
+            known = len(self._starts) - 1  # blocks whose end offset is known
+            if first < known:
+                stop = min(first + count, known)
+                return self._starts[first], self._starts[stop], (stop - first) * BLOCK_LINES, True
+            lines = max(0, self._count - first * BLOCK_LINES)
+            start = self._starts[first] if first < len(self._starts) else self._lines_end
+            return start, self._lines_end, lines, self._done
+
+    def add_parsed(self, first: int, block: _Block, tags: list[str]) -> None:
+        """Keep blocks parsed out of process, starting at block ``first``.
+
+        ``block`` holds whole blocks' worth of lines (the last may be
+        short) with tag codes indexing ``tags``, which are interned here.
+        Blocks arriving after ``close()`` are dropped.
+        """
+        remap = np.fromiter(map(self._symbols.intern, tags), dtype=np.int32, count=len(tags))
+        block = block._replace(tag=remap[block.tag] if len(tags) else block.tag)
+        with self._cache_lock:
+            if self._cancel.is_set():
+                return
+            for k, lo in enumerate(range(0, len(block.timestamp), BLOCK_LINES)):
+                self._imported[first + k] = _Block(*(column[lo : lo + BLOCK_LINES] for column in block))
+            for k in range(-(-len(block.timestamp) // BLOCK_LINES)):
+                self._blocks.pop(first + k, None)
@@ -0,0 +1,185 @@
+"""PipelineMetrics: counters, gauges and histograms for the ingest pipeline."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import math
+import threading
+import time
+from collections import deque
+
+_STEPS_PER_OCTAVE = 4
+_MIN_EXPONENT = -10  # smallest bucket edge is 2**-10 (~1 µs when in ms)
+_BUCKETS = 40 * _STEPS_PER_OCTAVE
+
+
+class Histogram:
+    """Log-bucketed summary of a sample series.
+
+    Buckets are a quarter octave wide, so percentiles are accurate to
+    about 19% whatever the scale; count, sum and max are exact.
+    """
+
+    def __init__(self):
+        self._buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value > 0:
+            index = int(math.log2(value) * _STEPS_PER_OCTAVE) - _MIN_EXPONENT * _STEPS_PER_OCTAVE
+            index = min(max(index, 0), _BUCKETS - 1)
+        else:
+            index = 0
+        self._buckets[index] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self._buckets):
+            seen += n
+            if seen >= rank:
+                upper = 2 ** ((index + 1) / _STEPS_PER_OCTAVE + _MIN_EXPONENT)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class PipelineMetrics:
+    """Named measurements shared by the reader thread and the GUI.
+
+    Every stage records per batch, never per line, so the lock is cheap.
+    End-to-end latency pairs the time a batch was handed off by the reader
+    with the drain that made its last line visible; this works because
+    batches reach the model in the order they were read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new measurement session."""
+        with self._lock:
+            self._started = time.monotonic()
+            self._counters: dict[str, int] = {}
+            self._gauges: dict[str, float] = {}
+            self._histograms: dict[str, Histogram] = {}
+            # (lines read up to and including the batch, its size, hand-off time)
+            self._handed_off: deque[tuple[int, int, float]] = deque()
+            self._read_lines = 0
+            self._visible_lines = 0
+            self._last_sample = (self._started, 0, 0)
+
+    # ── Recording ───────────────────────────────────────
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def mark_read(self, lines: int) -> tuple:
+        """Reader side: ``lines`` parsed lines were handed to the queue.
+
+        Returns a token for ``retract_read()``.
+        """
+        with self._lock:
+            self._read_lines += lines
+            token = (self._read_lines, lines, time.monotonic())
+            self._handed_off.append(token)
+            return token
+
+    def retract_read(self, token: tuple) -> None:
+        """Reader side: the batch whose ``mark_read()`` returned ``token``
+        was dropped after all.
+
+        Other readers may have marked batches since, so the batches after
+        it move down by its size rather than the newest being dropped.
+        """
+        with self._lock:
+            pending = list(self._handed_off)
+            try:
+                index = pending.index(token)
+            except ValueError:
+                return  # already paired with a drain, or marked before reset()
+            _, lines, _ = token
+            self._read_lines -= lines
+            pending[index:] = [(end - lines, n, t) for end, n, t in pending[index + 1 :]]
+            self._handed_off = deque(pending)
+
+    def mark_visible(self, lines: int) -> None:
+        """GUI side: the next ``lines`` handed-off lines are now in the table."""
+        now = time.monotonic()
+        with self._lock:
+            self._visible_lines += lines
+            latency = self._histograms.get("pipeline.latency_ms")
+            if latency is None:
+                latency = self._histograms["pipeline.latency_ms"] = Histogram()
+            while self._handed_off and self._handed_off[0][0] <= self._visible_lines:
+                latency.observe((now - self._handed_off.popleft()[2]) * 1000)
+
+    def sample(self) -> None:
+        """Update the per-second rate gauges; call about once a second."""
+        now = time.monotonic()
+        with self._lock:
+            then, read, visible = self._last_sample
+            elapsed = now - then
+            if elapsed > 0:
+                self._gauges["reader.lines_per_sec"] = (self._read_lines - read) / elapsed
+                self._gauges["model.lines_per_sec"] = (self._visible_lines - visible) / elapsed
+            self._last_sample = (now, self._read_lines, self._visible_lines)
+
+    # ── Reporting ───────────────────────────────────────
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "elapsed_s": time.monotonic() - self._started,
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {name: h.summary() for name, h in self._histograms.items()},
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_csv(self) -> str:
+        """One ``metric,stat,value`` row per number in the snapshot."""
+        snap = self.snapshot()
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["metric", "stat", "value"])
+        writer.writerow(["elapsed_s", "value", f"{snap['elapsed_s']:.3f}"])
+        for kind in ("counters", "gauges"):
+            for name, value in sorted(snap[kind].items()):
+                writer.writerow([name, "value", value])
+        for name, summary in sorted(snap["histograms"].items()):
+            for stat, value in summary.items():
+                writer.writerow([name, stat, value])
+        return out.getvalue()
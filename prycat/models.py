@@ -1,37 +1,116 @@
-"""LogEntry data class, LogcatModel (QAbstractTableModel), LogcatFilterProxy."""
+"""LogcatModel (QAbstractTableModel) and LogcatFilterProxy over LogStorage."""
 
 from __future__ import annotations
 
-import re
+import time
 from collections import deque
-from typing import Any, NamedTuple
-
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
-
+from typing import Any
+
+import numpy as np
+from PySide6.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, Qt, QTimer
+
+from .filtering import LogFilter, haystack
+from .history import HOT_ROWS, ColdStore, HistoryStore, TieredStorage
+from .logfile import BLOCK_LINES, FileStorage
+from .metrics import PipelineMetrics
+from .refilter import CHUNK_ROWS, TextMatchWorker
+from .storage import PRIORITY_LETTERS, LogRecord, LogStorage, format_timestamp, message_bytes
+from .symbols import SymbolTable
 from .theme import TEXT, priority_color
 
-COLUMNS = ("Time", "PID", "TID", "Level", "Tag", "Message")
-PRIORITY_ORDER = {"V": 0, "D": 1, "I": 2, "W": 3, "E": 4, "F": 5, "S": 6}
-
-
-class LogEntry(NamedTuple):
-    timestamp: str
-    pid: str
-    tid: str
-    priority: str
-    tag: str
-    message: str
+COLUMNS = ("Device", "Time", "PID", "TID", "Level", "Tag", "Message")
+SCAN_ROWS = BLOCK_LINES      # rows of a FileStorage filtered per step, one parsed block
+_SCAN_BUDGET = 0.010         # seconds of column filtering per pump tick
 
 
 class LogcatModel(QAbstractTableModel):
-    def __init__(self, maxlen: int = 500_000, parent=None):
+    """Table over LogStorage.
+
+    With a HistoryStore, evicted rows are archived to disk rather than
+    lost and stay addressable as the oldest rows (see TieredStorage).
+    With ``compression`` ("zlib" or "lzma") only the newest ``HOT_ROWS``
+    stay in the live buffer and older ones are kept compressed in memory
+    (see ColdStore), so ``maxlen`` rows take far less room.
+    With ``max_bytes`` the buffer is also bounded by the bytes it holds,
+    and the oldest rows are evicted by size (see LogStorage).
+
+    Views see a window of sequence numbers that normally matches storage
+    exactly. While frozen (see ``set_frozen``) storage keeps ingesting but
+    the window stays put, so row ``r`` is storage row ``r - row offset``
+    until the window is caught up again.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = 500_000,
+        symbols: SymbolTable | None = None,
+        history: HistoryStore | None = None,
+        max_bytes: int | None = None,
+        compression: str | None = None,
+        parent=None,
+    ):
         super().__init__(parent)
-        self._data: deque[LogEntry] = deque(maxlen=maxlen)
         self._maxlen = maxlen
+        self._max_bytes = max_bytes
+        self._history = history
+        self._compression = compression
+        self._cold: ColdStore | None = None
+        self._storage = self._new_storage(symbols)
+        self._frozen = False
+        self._shown_first_seq = 0
+        self._shown_count = 0
+        self._row_offset = 0  # shown rows already evicted from storage
+
+    @property
+    def storage(self) -> LogStorage:
+        return self._storage
+
+    @property
+    def history(self) -> HistoryStore | None:
+        return self._history
+
+    @property
+    def cold(self) -> ColdStore | None:
+        """Where rows older than the live tail are compressed, if they are."""
+        return self._cold
+
+    def _new_storage(self, symbols: SymbolTable | None):
+        if self._cold is not None:
+            self._cold.close()  # the storage it backs is being replaced
+            self._cold = None
+        if self._history is not None:
+            return TieredStorage(LogStorage(self._maxlen, symbols, self._max_bytes), self._history)
+        if self._compression is None or self._maxlen <= HOT_ROWS:
+            return LogStorage(self._maxlen, symbols, self._max_bytes)
+        # An eighth of a memory budget keeps the tail uncompressed
+        hot_bytes = self._max_bytes // 8 if self._max_bytes else None
+        live = LogStorage(HOT_ROWS, symbols, hot_bytes)
+        cold_bytes = self._max_bytes - hot_bytes if self._max_bytes else None
+        self._cold = ColdStore(self._maxlen - HOT_ROWS, cold_bytes, self._compression)
+        return TieredStorage(live, self._cold)
+
+    @property
+    def symbols(self) -> SymbolTable:
+        """Tag and device symbol table; share it with the AdbReaders feeding this model."""
+        return self._storage.symbols
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of row 0 as views see it."""
+        return self._shown_first_seq
+
+    def storage_row(self, row: int) -> int:
+        """Storage row behind ``row``; negative if it was evicted while frozen."""
+        return row - self._row_offset
+
+    def storage_window(self) -> tuple[int, int]:
+        """(offset, stop): the shown rows still in storage are storage rows
+        [0, stop), and storage row ``r`` is shown as row ``r + offset``."""
+        return self._row_offset, max(0, self._shown_count - self._row_offset)
 
     # ── Qt interface ────────────────────────────────────
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return len(self._data)
+        return self._shown_count
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(COLUMNS)
@@ -39,131 +118,512 @@ class LogcatModel(QAbstractTableModel):
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
         if not index.isValid():
             return None
-        entry = self._data[index.row()]
-        col = index.column()
+        return self.cell_data(index.row(), index.column(), role)
+
+    def cell_data(self, row: int, col: int, role: int = Qt.DisplayRole) -> Any:
+        """Role data for a source row/column without building a QModelIndex."""
+        row -= self._row_offset
+        if row < 0:
+            return None  # evicted while frozen; gone once thawed
         if role == Qt.DisplayRole:
-            return entry[col]
+            storage = self._storage
+            if col == 0:
+                return storage.device(row)
+            if col == 1:
+                return format_timestamp(storage.timestamp(row))
+            if col == 2:
+                return str(storage.pid(row))
+            if col == 3:
+                return str(storage.tid(row))
+            if col == 4:
+                return PRIORITY_LETTERS[storage.priority(row)]
+            if col == 5:
+                return storage.tag(row)
+            return storage.message(row)
         if role == Qt.ForegroundRole:
-            return priority_color(entry.priority)
+            return priority_color(PRIORITY_LETTERS[self._storage.priority(row)])
         return None
 
+    def display_row(self, row: int) -> tuple[str, ...] | None:
+        """DisplayRole text of every column of ``row`` at once, for painting;
+        None if it was evicted while frozen."""
+        row -= self._row_offset
+        if row < 0:
+            return None
+        entry = self._storage.entry(row)
+        return (entry.device, *entry[:6])
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
             return COLUMNS[section]
         return None
 
     # ── Mutation ────────────────────────────────────────
-    def append_batch(self, entries: list[LogEntry]) -> None:
-        if not entries:
+    def append_batch(self, records: list[LogRecord]) -> None:
+        if not records or self._maxlen <= 0:
             return
 
-        # If batch alone exceeds maxlen, only keep the tail
-        if len(entries) > self._maxlen:
-            entries = entries[-self._maxlen:]
-
-        count = len(entries)
-        current = len(self._data)
-        overflow = max(0, current + count - self._maxlen)
+        # If batch alone exceeds maxlen, only keep the tail; history keeps all
+        if len(records) > self._maxlen and self._history is None:
+            records = records[-self._maxlen:]
+
+        nbytes = message_bytes(records) if self._max_bytes else 0
+        count = self._storage.room(len(records), nbytes)
+        if count < len(records):
+            # A small budget can leave the ring fewer slots than one batch
+            records = records[-count:] if count else []
+            nbytes = message_bytes(records) if self._max_bytes else 0
+        if not records:
+            return
+        evict = self._storage.overflow(count, nbytes)
+
+        if self._frozen:
+            # Storage only: no row signals, so proxies and views do nothing
+            if evict > 0:
+                self._storage.evict(evict)
+            self._storage.extend(records)
+            self._row_offset = self._storage.first_seq - self._shown_first_seq
+            return
 
-        # Only evict up to what we actually have
-        evict = min(overflow, current)
         if evict > 0:
             self.beginRemoveRows(QModelIndex(), 0, evict - 1)
-            for _ in range(evict):
-                self._data.popleft()
+            self._storage.evict(evict)
+            self._shown_first_seq += evict
+            self._shown_count -= evict
             self.endRemoveRows()
 
-        # Insert new rows (deque maxlen handles any remaining overflow)
-        new_start = len(self._data)
+        new_start = len(self._storage)
         self.beginInsertRows(QModelIndex(), new_start, new_start + count - 1)
-        self._data.extend(entries)
+        self._storage.extend(records)
+        self._shown_count += count
+        self.endInsertRows()
+
+    def set_frozen(self, frozen: bool) -> None:
+        """Keep ingesting into storage without touching what views see.
+
+        Thawing publishes everything that happened meanwhile as at most one
+        removal from the front and one insertion at the end.
+        """
+        if frozen == self._frozen:
+            return
+        self._frozen = frozen
+        if frozen:
+            return
+
+        storage = self._storage
+        gone = min(self._row_offset, self._shown_count)
+        if gone > 0:
+            self.beginRemoveRows(QModelIndex(), 0, gone - 1)
+            self._shown_count -= gone
+            # Rows both appended and evicted while frozen were never shown
+            self._shown_first_seq = storage.first_seq
+            self._row_offset = 0
+            self.endRemoveRows()
+        self._shown_first_seq = storage.first_seq
+        self._row_offset = 0
+
+        added = len(storage) - self._shown_count
+        if added > 0:
+            self.beginInsertRows(QModelIndex(), self._shown_count, len(storage) - 1)
+            self._shown_count = len(storage)
+            self.endInsertRows()
+
+    def set_storage(self, storage) -> None:
+        """Swap in another storage, e.g. a FileStorage; views are reset."""
+        self.beginResetModel()
+        self._storage = storage
+        self._shown_first_seq = storage.first_seq
+        self._shown_count = len(storage)
+        self._row_offset = 0
+        self.endResetModel()
+
+    def reset_storage(self) -> None:
+        """Back to an empty live buffer (and history), e.g. after a file."""
+        self.set_storage(self._new_storage(self.symbols))
+
+    def sync_storage(self) -> int:
+        """Publish rows a self-growing storage (FileStorage) has added since."""
+        added = len(self._storage) - self._shown_count
+        if added <= 0 or self._frozen:
+            return 0
+        self.beginInsertRows(QModelIndex(), self._shown_count, self._shown_count + added - 1)
+        self._shown_count += added
         self.endInsertRows()
+        return added
 
     def clear_all(self) -> None:
         self.beginResetModel()
-        self._data.clear()
+        self._storage.clear()
+        self._shown_first_seq = self._storage.first_seq
+        self._shown_count = 0
+        self._row_offset = 0
         self.endResetModel()
 
     @property
     def total_count(self) -> int:
-        return len(self._data)
+        return len(self._storage)
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
+
+    @property
+    def max_bytes(self) -> int | None:
+        return self._max_bytes
 
     @property
     def buffer_percent(self) -> float:
-        if self._maxlen == 0:
+        """How full the buffer is: by bytes under a memory budget, else by rows."""
+        if self._max_bytes:
+            return min(self._storage.nbytes / self._max_bytes * 100, 100.0)
+        capacity = self._storage.capacity
+        if capacity == 0:
             return 0.0
-        return len(self._data) / self._maxlen * 100
+        return min(len(self._storage) / capacity * 100, 100.0)
 
+    @property
+    def nbytes(self) -> int:
+        """Bytes the storage holds in memory, indexes and caches included."""
+        return self._storage.nbytes
 
-class LogcatFilterProxy(QSortFilterProxyModel):
-    def __init__(self, parent=None):
+    @property
+    def bytes_per_entry(self) -> float:
+        return self._storage.bytes_per_entry
+
+
+class LogcatFilterProxy(QAbstractProxyModel):
+    """Maps accepted LogcatModel rows through a NumPy index array.
+
+    ``_rows`` holds the accepted source rows in ascending order, so
+    ``rowCount`` and ``mapToSource`` are plain array reads. Rows appended
+    by ``LogcatModel.append_batch`` are filtered on their own and evicted
+    rows are sliced off the front; a full vectorized pass over the buffer
+    only runs when a setter changes the filter. With no criteria set
+    ``_rows`` is None and the proxy is an identity mapping, so an
+    unfiltered view costs nothing however many rows the source has.
+
+    When a text filter is set, the exact text check runs on a
+    TextMatchWorker: candidates are queued in chunks (by sequence number,
+    newest first, live rows ahead of the backfill) and matches are merged
+    in as chunks complete. Any filter change cancels the pass in flight.
+    Over a FileStorage, whose columns are parsed on access, the column
+    stages run the same way: ranges of ``SCAN_ROWS`` are filtered from
+    the pump timer a few at a time, so no filter parses the whole file
+    at once on the GUI thread.
+
+    Refilter and text-pass durations are recorded in ``metrics`` when given.
+    """
+
+    def __init__(self, metrics: PipelineMetrics | None = None, parent=None):
         super().__init__(parent)
-        self.setDynamicSortFilter(False)
+        self._metrics = metrics
+        self._filter = LogFilter()
+        self._rows: np.ndarray | None = np.empty(0, dtype=np.int64)
+        self._identity_count = 0  # row count while _rows is None
+        self._removing: tuple[int, int] = (0, 0)
+
+        # Background text stage
+        self._matcher = TextMatchWorker()
+        self._generation = 0
+        self._scan: deque[tuple[int, int]] = deque()  # seq ranges left to column-filter
+        self._backfill: deque[np.ndarray] = deque()  # seq chunks, newest first
+        self._tail: deque[np.ndarray] = deque()      # seq chunks of live rows
+        self._inflight = 0
+        self._text_started: float | None = None
+        self._pump = QTimer(self)
+        self._pump.setInterval(15)
+        self._pump.timeout.connect(self._pump_text_stage)
 
-        self._text: str = ""
-        self._text_re: re.Pattern | None = None
-        self._use_regex: bool = False
-        self._tags: set[str] = set()
-        self._min_priority: int = 0  # V=0 means accept all
-        self._pid: str = ""
+    @property
+    def accepted_rows(self) -> np.ndarray:
+        """Accepted source rows in proxy order; do not mutate."""
+        if self._rows is None:
+            return np.arange(self._identity_count, dtype=np.int64)
+        return self._rows
+
+    def accepted_seqs(self) -> np.ndarray | range:
+        """Sequence numbers of the accepted rows in proxy order.
+
+        Unlike rows these stay valid while the source keeps evicting;
+        a range when nothing is filtered out.
+        """
+        first = self.sourceModel().first_seq
+        if self._rows is None:
+            return range(first, first + self._identity_count)
+        return self._rows + first
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the row mapping and queued text-stage chunks."""
+        rows = self._rows.nbytes if self._rows is not None else 0
+        return rows + sum(chunk.nbytes for chunk in (*self._backfill, *self._tail))
+
+    @property
+    def is_filtering(self) -> bool:
+        """True while a background text pass is still producing matches."""
+        return bool(self._scan or self._backfill or self._tail or self._inflight)
 
     # ── Filter setters ──────────────────────────────────
     def _refilter(self) -> None:
-        self.beginFilterChange()
-        self.endFilterChange()
+        started = time.perf_counter()
+        self.beginResetModel()
+        self._reset_rows()
+        self.endResetModel()
+        if self._metrics is not None:
+            self._metrics.observe("filter.refilter_ms", (time.perf_counter() - started) * 1000)
+
+    def _reset_rows(self) -> None:
+        """Restart filtering from scratch with the rows known right away."""
+        self._cancel_text_stage()
+        self._rows = np.empty(0, dtype=np.int64)
+        model = self.sourceModel()
+        if model is None:
+            return
+        if self._filter.is_empty:
+            self._rows = None
+            self._identity_count = model.rowCount()
+            return
+        storage = model.storage
+        offset, stop = model.storage_window()
+        if self._filter.has_text_stage:
+            self._text_started = time.perf_counter()
+        if isinstance(storage, FileStorage):
+            first = storage.first_seq
+            for end in range(stop, 0, -SCAN_ROWS):
+                self._scan.append((first + max(0, end - SCAN_ROWS), first + end))
+            self._pump.start()
+            return
+        rows = self._filter.candidate_rows(storage, 0, stop)
+        if not self._filter.has_text_stage:
+            self._rows = rows + offset
+            return
+        seqs = rows + storage.first_seq
+        for end in range(len(seqs), 0, -CHUNK_ROWS):
+            self._backfill.append(seqs[max(0, end - CHUNK_ROWS):end])
+        self._pump.start()
+
+    def _cancel_text_stage(self) -> None:
+        self._generation += 1
+        self._matcher.cancel(self._generation)
+        self._scan.clear()
+        self._backfill.clear()
+        self._tail.clear()
+        self._inflight = 0
+        self._text_started = None
+        self._pump.stop()
+
+    def shutdown(self) -> None:
+        """Stop background matching; call before the application exits."""
+        self._cancel_text_stage()
+        self._matcher.close()
 
     def set_text_filter(self, text: str, use_regex: bool = False) -> None:
-        self._use_regex = use_regex
-        if use_regex:
-            try:
-                self._text_re = re.compile(text, re.IGNORECASE)
-            except re.error:
-                self._text_re = None
-            self._text = ""
-        else:
-            self._text = text.lower()
-            self._text_re = None
-        self._refilter()
+        if self._filter.set_text(text, use_regex):
+            self._refilter()
 
     def set_tag_filter(self, tags: set[str]) -> None:
-        self._tags = tags
-        self._refilter()
+        if self._filter.set_tags(tags):
+            self._refilter()
+
+    def set_device_filter(self, devices: set[str]) -> None:
+        if self._filter.set_devices(devices):
+            self._refilter()
+
+    def set_package_pids(self, pids: dict[int, set[int]] | None) -> None:
+        if self._filter.set_package_pids(pids):
+            self._refilter()
 
     def set_min_priority(self, level: str) -> None:
-        self._min_priority = PRIORITY_ORDER.get(level, 0)
-        self._refilter()
+        if self._filter.set_min_priority(level):
+            self._refilter()
 
     def set_pid_filter(self, pid: str) -> None:
-        self._pid = pid.strip()
-        self._refilter()
-
-    # ── Core filter ─────────────────────────────────────
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
-        model: LogcatModel = self.sourceModel()
-        if source_row >= len(model._data):
-            return False
-        entry = model._data[source_row]
-
-        # Priority check (cheapest)
-        if PRIORITY_ORDER.get(entry.priority, 0) < self._min_priority:
-            return False
-
-        # PID check
-        if self._pid and entry.pid != self._pid:
-            return False
-
-        # Tag check
-        if self._tags and entry.tag not in self._tags:
-            return False
-
-        # Text search (most expensive — last)
-        if self._text_re is not None:
-            haystack = f"{entry.tag} {entry.message}"
-            if not self._text_re.search(haystack):
-                return False
-        elif self._text:
-            haystack = f"{entry.tag} {entry.message}".lower()
-            if self._text not in haystack:
-                return False
-
-        return True
+        if self._filter.set_pid(pid):
+            self._refilter()
+
+    # ── Source tracking ─────────────────────────────────
+    def setSourceModel(self, model: LogcatModel) -> None:
+        old = self.sourceModel()
+        if old is not None:
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+            old.rowsRemoved.disconnect(self._on_rows_removed)
+            old.modelAboutToBeReset.disconnect(self.beginResetModel)
+            old.modelReset.disconnect(self._on_model_reset)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        if model is not None:
+            model.rowsInserted.connect(self._on_rows_inserted)
+            model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+            model.rowsRemoved.connect(self._on_rows_removed)
+            model.modelAboutToBeReset.connect(self.beginResetModel)
+            model.modelReset.connect(self._on_model_reset)
+        self._reset_rows()
+        self.endResetModel()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        count = last - first + 1
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._identity_count += count
+            self.endInsertRows()
+            return
+        pos = int(np.searchsorted(self._rows, first))
+        storage = self.sourceModel().storage
+        if isinstance(storage, FileStorage):
+            # Filtered from the pump like the rest of the file, newest first
+            seq = storage.first_seq
+            for lo in range(first, last + 1, SCAN_ROWS):
+                self._scan.appendleft((seq + lo, seq + min(lo + SCAN_ROWS, last + 1)))
+            self._pump.start()
+            accepted = self._rows[:0]
+        elif self._filter.has_text_stage:
+            # Queue the survivors of the cheap stages for the text worker
+            seqs = self._filter.candidate_rows(storage, first, last + 1) + storage.first_seq
+            # A bulk insert (e.g. resuming from pause) is split newest first
+            for end in range(len(seqs), 0, -CHUNK_ROWS):
+                self._tail.append(seqs[max(0, end - CHUNK_ROWS):end])
+            if len(seqs):
+                self._pump.start()
+            accepted = seqs[:0]
+        else:
+            accepted = self._filter.candidate_rows(storage, first, last + 1)
+        tail = self._rows[pos:] + count
+        if len(accepted):
+            self.beginInsertRows(QModelIndex(), pos, pos + len(accepted) - 1)
+            self._rows = np.concatenate((self._rows[:pos], accepted, tail))
+            self.endInsertRows()
+        elif len(tail):
+            self._rows = np.concatenate((self._rows[:pos], tail))
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        lo = int(np.searchsorted(self._rows, first))
+        hi = int(np.searchsorted(self._rows, last, side="right"))
+        self._removing = (lo, hi)
+        if hi > lo:
+            self.beginRemoveRows(QModelIndex(), lo, hi - 1)
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self._identity_count -= last - first + 1
+            self.endRemoveRows()
+            return
+        lo, hi = self._removing
+        self._rows = np.concatenate((self._rows[:lo], self._rows[hi:] - (last - first + 1)))
+        if hi > lo:
+            self.endRemoveRows()
+
+    def _on_model_reset(self) -> None:
+        self._reset_rows()
+        self.endResetModel()
+
+    # ── Background text stage ───────────────────────────
+    def _pump_text_stage(self) -> None:
+        storage = self.sourceModel().storage
+        deadline = time.perf_counter() + _SCAN_BUDGET
+        while self._scan and time.perf_counter() < deadline:
+            self._scan_range(storage, *self._scan.popleft())
+        for generation, seqs, mask in self._matcher.results():
+            if generation != self._generation:
+                continue
+            self._inflight -= 1
+            self._merge_matches(seqs[mask])
+
+        query, is_regex = self._filter.text_query
+        while self._inflight < 2 and (self._tail or self._backfill):
+            seqs = self._tail.popleft() if self._tail else self._backfill.popleft()
+            # Skip rows evicted since the chunk was queued
+            seqs = seqs[seqs >= storage.first_seq]
+            if not len(seqs):
+                continue
+            rows = (seqs - storage.first_seq).tolist()
+            self._matcher.submit(self._generation, seqs, [haystack(storage, r) for r in rows], query, is_regex)
+            self._inflight += 1
+
+        if not self.is_filtering:
+            self._pump.stop()
+            if self._text_started is not None and self._metrics is not None:
+                self._metrics.observe("filter.text_pass_ms", (time.perf_counter() - self._text_started) * 1000)
+            self._text_started = None
+
+    def _scan_range(self, storage, lo: int, hi: int) -> None:
+        """Run the column stages over sequence numbers [lo, hi)."""
+        first = storage.first_seq
+        seqs = self._filter.candidate_rows(storage, max(0, lo - first), hi - first) + first
+        if not self._filter.has_text_stage:
+            self._merge_matches(seqs)
+            return
+        for end in range(len(seqs), 0, -CHUNK_ROWS):
+            self._tail.append(seqs[max(0, end - CHUNK_ROWS):end])
+
+    def _merge_matches(self, seqs: np.ndarray) -> None:
+        rows = seqs - self.sourceModel().first_seq
+        rows = rows[rows >= 0]
+        if not len(rows):
+            return
+        # A chunk is a contiguous run of candidates, so it lands as one block
+        pos = int(np.searchsorted(self._rows, rows[0]))
+        self.beginInsertRows(QModelIndex(), pos, pos + len(rows) - 1)
+        self._rows = np.concatenate((self._rows[:pos], rows, self._rows[pos:]))
+        self.endInsertRows()
+
+    # ── Qt interface ────────────────────────────────────
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._identity_count if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < len(COLUMNS)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.rowCount() > 0
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemNeverHasChildren
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self._source_row(proxy_index.row()), proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is None:
+            return self.index(row, source_index.column())
+        pos = int(np.searchsorted(self._rows, row))
+        if pos < len(self._rows) and self._rows[pos] == row:
+            return self.index(pos, source_index.column())
+        return QModelIndex()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        return self.sourceModel().cell_data(self._source_row(index.row()), index.column(), role)
+
+    def display_row(self, row: int) -> tuple[str, ...] | None:
+        """Every column's text of ``row`` (see LogcatModel.display_row)."""
+        return self.sourceModel().display_row(self._source_row(row))
+
+    def _source_row(self, row: int) -> int:
+        return row if self._rows is None else int(self._rows[row])
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
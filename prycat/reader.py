@@ -4,11 +4,17 @@ from __future__ import annotations
 
 import queue
 import re
+import struct
 import subprocess
 import threading
+import time
+import zoneinfo
 from typing import Optional
 
-from .models import LogEntry
+from .metrics import PipelineMetrics
+from .spill import SpillBuffer
+from .storage import PRIORITY_ORDER, LogRecord, epoch_to_timestamp, parse_timestamp
+from .symbols import SymbolTable
 
 # threadtime format: "MM-DD HH:MM:SS.mmm  PID  TID LEVEL TAG     : message"
 _LOGCAT_RE = re.compile(
@@ -18,9 +24,56 @@ _LOGCAT_RE = re.compile(
     r"(.+?)\s*:\s(.*)$"
 )
 
+_CRLF_RE = re.compile(rb"\r+\n")
+_READ_SIZE = 1 << 16
+
+# logger_entry header (liblog): len, hdr_size, pid, tid, sec, nsec[, lid, uid].
+# v1 headers report hdr_size 0 and are 20 bytes; v4 headers (28 bytes) carry uid.
+_ENTRY_HEADER = struct.Struct("<HHiiII")
+_ENTRY_UID = struct.Struct("<I")
+_HEADER_SIZES = {0: 20, 20: 20, 24: 24, 28: 28}
+_MAX_PAYLOAD = 5 * 1024
+
+
+def parse_devices(text: str) -> list[str]:
+    """Serials in state "device" from an ``adb devices`` style listing."""
+    devices = []
+    for line in text.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) == 2 and parts[1] == "device":
+            devices.append(parts[0])
+    return devices
+
 
 class AdbReader:
-    """Reads ADB logcat in a background thread, pushes LogEntry to a queue."""
+    """Reads ADB logcat in a background thread, pushes LogRecord batches to a queue.
+
+    stdout is read in large byte chunks; each chunk is cut at its last
+    newline, decoded once and parsed in one pass, and the resulting
+    ``list[LogRecord]`` is queued as a single item. Tags are
+    interned into ``symbols``, which must be the table of the LogcatModel
+    consuming the queue.
+
+    With ``binary=True`` the reader runs ``logcat -B`` and decodes the raw
+    ``logger_entry`` records instead, which skips text formatting and
+    regex parsing and gives exact timestamps and the uid. Timestamps are
+    shown in the device's time zone (``persist.sys.timezone``), as text
+    mode shows them, or in the host's if the device does not report one.
+    If the device's output is not binary logcat it falls back to
+    threadtime text.
+
+    Batches the queue has no room for are handed to ``spill``, which
+    writes them to disk for later replay (or counts them as dropped when
+    spilling is disabled). Read volume, parse time and hand-off times are
+    recorded in ``metrics`` when given.
+
+    Several readers, one per device, may share a queue; each stamps its
+    records with the device serial's symbol code and should have a
+    SpillBuffer of its own, so backpressure is accounted per device.
+    Queue items are ``(session, batch)``, ending with ``(session, None)``
+    (see SpillBuffer), so batches of a capture since replaced can be told
+    apart and ignored.
+    """
 
     def __init__(
         self,
@@ -30,10 +83,22 @@ class AdbReader:
         buffer: str | None = None,
         tag_filters: list[str] | None = None,
         pid: str | None = None,
+        symbols: SymbolTable | None = None,
+        binary: bool = False,
+        spill: SpillBuffer | None = None,
+        metrics: PipelineMetrics | None = None,
+        session: int = 0,
     ):
         self._queue = out_queue
+        self._session = session
+        self._spill = spill if spill is not None else SpillBuffer(enabled=False)
+        self._metrics = metrics
+        self._binary = binary
+        self._zone: zoneinfo.ZoneInfo | None = None
+        self._symbols = symbols if symbols is not None else SymbolTable()
         self._adb_path = adb_path
         self._device = device
+        self._device_code = self._symbols.intern(device) if device else -1
         self._buffer = buffer
         self._tag_filters = tag_filters or []
         self._pid = pid
@@ -41,11 +106,23 @@ class AdbReader:
         self._process: Optional[subprocess.Popen] = None
         self._thread: Optional[threading.Thread] = None
 
+    @property
+    def device(self) -> str | None:
+        return self._device
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
     def build_command(self) -> list[str]:
         cmd = [self._adb_path]
         if self._device:
             cmd.extend(["-s", self._device])
-        cmd.extend(["logcat", "-v", "threadtime"])
+        if self._binary:
+            # exec-out keeps the byte stream clean of pty newline translation
+            cmd.extend(["exec-out", "logcat", "-B"])
+        else:
+            cmd.extend(["logcat", "-v", "threadtime"])
         if self._buffer:
             if self._buffer == "all":
                 cmd.extend(["-b", "main,system,crash"])
@@ -64,61 +141,203 @@ class AdbReader:
         self._thread.start()
 
     def _run(self) -> None:
-        cmd = self.build_command()
+        stdout = self._open()
+        if stdout is None:
+            self._spill.put(self._queue, None, self._session)
+            return
+        if self._binary and not self._stream_binary(stdout):
+            # Not binary logcat (e.g. -B unsupported): restart as text
+            self._binary = False
+            self._terminate()
+            stdout = None if self._stop_event.is_set() else self._open()
+        if stdout is not None and not self._binary:
+            self._stream_text(stdout)
+
+        # Signal that the reader has stopped, without waiting for room
+        self._spill.put(self._queue, None, self._session)
+
+    def _open(self):
         try:
             self._process = subprocess.Popen(
-                cmd,
+                self.build_command(),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                bufsize=1,
                 creationflags=subprocess.CREATE_NO_WINDOW
                 if hasattr(subprocess, "CREATE_NO_WINDOW")
                 else 0,
             )
         except FileNotFoundError:
-            self._queue.put(None)
-            return
+            return None
+        return self._process.stdout
 
-        for line in self._process.stdout:
-            if self._stop_event.is_set():
+    def _terminate(self) -> None:
+        process = self._process
+        if process:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+
+    def _stream_text(self, stdout) -> None:
+        pending = b""
+        while not self._stop_event.is_set():
+            chunk = stdout.read1(_READ_SIZE)
+            if not chunk:
                 break
-            line = line.rstrip("\n\r")
-            entry = self._parse_line(line)
-            if entry is None:
+            # Only parse complete lines; keep the partial tail for next read
+            cut = chunk.rfind(b"\n")
+            if cut < 0:
+                pending += chunk
                 continue
+            self._emit(pending + chunk[: cut + 1])
+            pending = chunk[cut + 1 :]
+        if pending and not self._stop_event.is_set():
+            self._emit(pending)
+
+    def _stream_binary(self, stdout) -> bool:
+        """Decode ``logcat -B`` output; False if it turned out not to be binary."""
+        pending = b""
+        decoded = False
+        tag_codes: dict[bytes, int] = {}
+        tag_levels = self._tag_levels()
+        self._zone = self._device_zone()
+        while not self._stop_event.is_set():
+            chunk = stdout.read1(_READ_SIZE)
+            if not chunk:
+                break
+            data = pending + chunk
+            started = time.perf_counter()
             try:
-                self._queue.put_nowait(entry)
-            except queue.Full:
-                pass  # drop under backpressure
+                batch, used = self._parse_binary(data, tag_codes, tag_levels)
+            except ValueError:
+                if not decoded:
+                    return False
+                break  # corrupt stream: stop rather than resync on garbage
+            decoded = decoded or used > 0
+            pending = data[used:]
+            self._put(batch, used, started)
+        return decoded or self._stop_event.is_set()
 
-        # Signal that the reader has stopped
-        self._queue.put(None)
+    def _tag_levels(self) -> tuple[dict[int, int], int] | None:
+        """Tag filterspecs as ({tag code: min priority}, default), or None.
 
-    @staticmethod
-    def _parse_line(line: str) -> LogEntry | None:
-        m = _LOGCAT_RE.match(line)
-        if not m:
+        logcat does not apply filterspecs to -B output, so binary mode
+        applies them here, with the same implicit ``*:S``.
+        """
+        if not self._tag_filters:
             return None
-        return LogEntry(
-            timestamp=m.group(1),
-            pid=m.group(2),
-            tid=m.group(3),
-            priority=m.group(4),
-            tag=m.group(5).strip(),
-            message=m.group(6),
-        )
+        levels: dict[int, int] = {}
+        default = len(PRIORITY_ORDER)  # above S: drop
+        for spec in self._tag_filters:
+            tag, _, level = spec.rpartition(":") if ":" in spec else (spec, "", "V")
+            priority = PRIORITY_ORDER.get(level.strip().upper(), 0)
+            if tag == "*":
+                default = min(default, priority)
+            else:
+                levels.setdefault(self._symbols.intern(tag), priority)
+        return levels, default
+
+    def _device_zone(self) -> zoneinfo.ZoneInfo | None:
+        """The device's time zone, or None to convert in the host's."""
+        name = AdbReader.get_timezone(self._adb_path, self._device)
+        if not name:
+            return None
+        try:
+            return zoneinfo.ZoneInfo(name)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            return None
+
+    def _parse_binary(
+        self,
+        data: bytes,
+        tag_codes: dict[bytes, int],
+        tag_levels: tuple[dict[int, int], int] | None,
+    ) -> tuple[list[LogRecord], int]:
+        """Decode whole logger_entry records from ``data``.
+
+        Returns the records and the number of bytes consumed; raises
+        ValueError on a header that cannot be a logger_entry.
+        """
+        records = []
+        stamps: dict[int, int] = {}
+        intern = self._symbols.intern
+        device = self._device_code
+        unpack = _ENTRY_HEADER.unpack_from
+        pos, end = 0, len(data)
+        while end - pos >= _ENTRY_HEADER.size:
+            length, hdr_size, pid, tid, sec, nsec = unpack(data, pos)
+            hdr_size = _HEADER_SIZES.get(hdr_size)
+            if hdr_size is None or length > _MAX_PAYLOAD:
+                raise ValueError("not a logger_entry stream")
+            if end - pos < hdr_size + length:
+                break
+            uid = _ENTRY_UID.unpack_from(data, pos + 24)[0] if hdr_size >= 28 else -1
+            payload = data[pos + hdr_size : pos + hdr_size + length]
+            pos += hdr_size + length
+
+            # Text payload: priority byte, tag NUL, message NUL
+            tag_end = payload.find(b"\0", 1)
+            if not payload or tag_end < 0:
+                continue
+            priority = min(max(payload[0] - 2, 0), 6)  # ANDROID_LOG_VERBOSE == 2
+            raw_tag = payload[1:tag_end]
+            tag = tag_codes.get(raw_tag)
+            if tag is None:
+                tag = tag_codes[raw_tag] = intern(raw_tag.decode("utf-8", "replace"))
+            if tag_levels is not None and priority < tag_levels[0].get(tag, tag_levels[1]):
+                continue
+            stamp = stamps.get(sec)
+            if stamp is None:
+                stamp = stamps[sec] = epoch_to_timestamp(sec, 0, self._zone)
+            if uid > 0x7FFFFFFF:
+                uid = -1
+            message = payload[tag_end + 1 :].rstrip(b"\0").decode("utf-8", "replace")
+            # Multi-line messages become one row per line, as in threadtime
+            for line in message.rstrip("\n").split("\n"):
+                records.append(LogRecord(stamp + nsec, pid, tid, priority, tag, line, uid, device))
+        return records, pos
+
+    def _emit(self, data: bytes) -> None:
+        started = time.perf_counter()
+        size = len(data)
+        if b"\r" in data:
+            data = _CRLF_RE.sub(b"\n", data)
+        self._put(self._parse_chunk(data.decode("utf-8", "replace")), size, started)
+
+    def _put(self, batch: list[LogRecord], size: int, started: float) -> None:
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.observe("reader.parse_ms", (time.perf_counter() - started) * 1000)
+            metrics.count("reader.bytes", size)
+            metrics.count("reader.lines", len(batch))
+        if not batch:
+            return
+        # Marked before the hand-off so the GUI can never see it first
+        token = metrics.mark_read(len(batch)) if metrics is not None else None
+        if not self._spill.put(self._queue, batch, self._session) and metrics is not None:
+            metrics.retract_read(token)
+
+    def _parse_chunk(self, text: str) -> list[LogRecord]:
+        intern = self._symbols.intern
+        device = self._device_code
+        stamps: dict[str, int] = {}  # bursts share timestamps; parse each once
+        records = []
+        for m in map(_LOGCAT_RE.match, text.split("\n")):
+            if m is None:
+                continue
+            timestamp, pid, tid, priority, tag, message = m.groups()
+            stamp = stamps.get(timestamp)
+            if stamp is None:
+                stamp = stamps[timestamp] = parse_timestamp(timestamp)
+            records.append(
+                LogRecord(stamp, int(pid), int(tid), PRIORITY_ORDER[priority], intern(tag.strip()), message, -1, device)
+            )
+        return records
 
     def stop(self) -> None:
         self._stop_event.set()
-        if self._process:
-            try:
-                self._process.terminate()
-            except OSError:
-                pass
-            self._process = None
+        self._terminate()
+        self._process = None
         if self._thread:
             self._thread.join(timeout=2)
             self._thread = None
@@ -137,15 +356,39 @@ class AdbReader:
             )
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return []
-        devices = []
-        for line in result.stdout.splitlines()[1:]:
-            parts = line.strip().split("\t")
-            if len(parts) == 2 and parts[1] == "device":
-                devices.append(parts[0])
-        return devices
+        return parse_devices(result.stdout)
+
+    @staticmethod
+    def get_timezone(adb_path: str, device: str | None) -> str | None:
+        """The device's ``persist.sys.timezone``, e.g. "Europe/Berlin"."""
+        cmd = [adb_path]
+        if device:
+            cmd.extend(["-s", device])
+        cmd.extend(["shell", "getprop", "persist.sys.timezone"])
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=5,
+                creationflags=subprocess.CREATE_NO_WINDOW
+                if hasattr(subprocess, "CREATE_NO_WINDOW")
+                else 0,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
 
     @staticmethod
     def get_pid_for_package(adb_path: str, device: str | None, package: str) -> str | None:
+        pids = AdbReader.get_pids_for_package(adb_path, device, package)
+        return str(pids[0]) if pids else None
+
+    @staticmethod
+    def get_pids_for_package(adb_path: str, device: str | None, package: str) -> list[int]:
+        """Every running process of ``package`` (pidof may list several)."""
         cmd = [adb_path]
         if device:
             cmd.extend(["-s", device])
@@ -161,6 +404,5 @@ class AdbReader:
                 else 0,
             )
         except (FileNotFoundError, subprocess.TimeoutExpired):
-            return None
-        pid = result.stdout.strip().split()[0] if result.stdout.strip() else None
-        return pid
+            return []
+        return [int(pid) for pid in result.stdout.split() if pid.isdigit()]
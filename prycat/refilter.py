@@ -0,0 +1,125 @@
+"""TextMatchWorker: off-GUI-thread, cancellable evaluation of the text stage."""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import re
+import threading
+
+import numpy as np
+
+CHUNK_ROWS = 4096
+
+
+def _regex_worker(conn) -> None:
+    """Child process loop: receive (pattern, haystacks), reply with a mask."""
+    while True:
+        try:
+            pattern, haystacks = conn.recv()
+        except (EOFError, OSError):
+            return
+        regex = re.compile(pattern, re.IGNORECASE)  # re caches compiled patterns
+        conn.send_bytes(bytes(regex.search(h) is not None for h in haystacks))
+
+
+class TextMatchWorker:
+    """Evaluates text-stage chunks in a background thread.
+
+    Plain substring checks run in the thread itself. ``re`` holds the GIL
+    for the whole of a match, so a catastrophic pattern would stall the GUI
+    from any thread; regex chunks are therefore forwarded to a child
+    process that ``cancel()`` can kill outright. Results are tagged with
+    the generation they were submitted under; stale ones are dropped.
+    """
+
+    def __init__(self):
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._generation = 0
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._in_process = False
+
+    def submit(self, generation: int, seqs: np.ndarray, haystacks: list[str], query: str, is_regex: bool) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._requests.put((generation, seqs, haystacks, query, is_regex))
+
+    def cancel(self, generation: int) -> None:
+        """Abandon all work older than ``generation``, killing a running regex."""
+        self._generation = generation
+        with self._lock:
+            if self._in_process and self._process is not None:
+                self._process.kill()
+
+    def results(self) -> list[tuple[int, np.ndarray, np.ndarray]]:
+        """Completed (generation, seqs, mask) chunks, without blocking."""
+        done = []
+        while True:
+            try:
+                done.append(self._results.get_nowait())
+            except queue.Empty:
+                return done
+
+    def close(self) -> None:
+        self.cancel(self._generation + 1)
+        self._requests.put(None)
+        with self._lock:
+            if self._process is not None:
+                self._process.kill()
+                self._process = None
+
+    # ── Worker thread ───────────────────────────────────
+    def _run(self) -> None:
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            generation, seqs, haystacks, query, is_regex = item
+            if generation != self._generation:
+                continue
+            if is_regex:
+                mask = self._match_in_process(query, haystacks)
+                if mask is None:
+                    continue
+            else:
+                mask = np.fromiter((query in h.lower() for h in haystacks), dtype=bool, count=len(haystacks))
+            if generation == self._generation:
+                self._results.put((generation, seqs, mask))
+
+    def _match_in_process(self, pattern: str, haystacks: list[str]) -> np.ndarray | None:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                try:
+                    self._spawn()
+                except (OSError, RuntimeError):
+                    # No child process available: match here, uncancellable
+                    regex = re.compile(pattern, re.IGNORECASE)
+                    return np.fromiter(
+                        (regex.search(h) is not None for h in haystacks), dtype=bool, count=len(haystacks)
+                    )
+            conn = self._conn
+            self._in_process = True
+        try:
+            conn.send((pattern, haystacks))
+            return np.frombuffer(conn.recv_bytes(), dtype=bool)
+        except (EOFError, OSError):
+            # Killed by cancel(); a fresh process is spawned on the next chunk
+            conn.close()
+            with self._lock:
+                self._process = None
+            return None
+        finally:
+            with self._lock:
+                self._in_process = False
+
+    def _spawn(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_regex_worker, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
@@ -0,0 +1,49 @@
+"""DrainScheduler: sizes GUI drain batches from queue depth and a frame budget."""
+
+from __future__ import annotations
+
+
+class DrainScheduler:
+    """Decides how many lines each drain tick takes and when the next runs.
+
+    The cost of a drain is tracked as a moving average of milliseconds per
+    line, so the batch limit is whatever fits the frame budget. When a
+    backlog is waiting the larger catch-up budget applies instead, trading
+    a few dropped frames for bulk inserts. Ticks that find nothing double
+    the interval up to ``idle_interval_ms``; the next non-empty tick snaps
+    it back to one frame.
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = 16,
+        budget_ms: float = 8.0,
+        catchup_budget_ms: float = 32.0,
+        idle_interval_ms: int = 250,
+        min_lines: int = 1_000,
+        max_lines: int = 250_000,
+    ):
+        self._frame_ms = frame_ms
+        self._budget_ms = budget_ms
+        self._catchup_budget_ms = catchup_budget_ms
+        self._idle_interval_ms = idle_interval_ms
+        self._min_lines = min_lines
+        self._max_lines = max_lines
+        self._ms_per_line = 0.002  # refined from the first real drains
+        self.interval_ms = frame_ms
+
+    def batch_limit(self, backlog: bool) -> int:
+        """Lines to take this tick; ``backlog`` when more is already waiting."""
+        budget = self._catchup_budget_ms if backlog else self._budget_ms
+        return max(self._min_lines, min(self._max_lines, int(budget / self._ms_per_line)))
+
+    def record(self, lines: int, elapsed_ms: float) -> int:
+        """Feed back a finished tick; returns the interval for the next one."""
+        if lines:
+            # Small drains are dominated by fixed overhead; don't learn from them
+            if lines >= 256:
+                self._ms_per_line += 0.3 * (elapsed_ms / lines - self._ms_per_line)
+            self.interval_ms = self._frame_ms
+        else:
+            self.interval_ms = min(self.interval_ms * 2, self._idle_interval_ms)
+        return self.interval_ms
@@ -0,0 +1,419 @@
+"""Native ``.prycat`` session files: columnar, streamed on save, mapped on load."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from .storage import PRIORITY_LETTERS, LogEntry, format_timestamp
+from .symbols import SymbolTable
+from .trigram import BLOCK_ROWS, SIGNATURE_BYTES, TrigramIndex, signature_hits
+
+MAGIC = b"PRYCAT\x00\x01"
+VERSION = 1
+SAVE_CHUNK = 64 * BLOCK_ROWS  # rows per write; whole signature blocks
+_ALIGN = 64
+_TRAILER = struct.Struct("<QQ8s")  # footer offset, footer length, magic
+
+_COLUMNS = (
+    ("timestamp", "<i8"),
+    ("pid", "<i4"),
+    ("tid", "<i4"),
+    ("priority", "i1"),
+    ("tag", "<i4"),
+    ("uid", "<i4"),
+    ("device", "<i4"),
+)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def save_session(
+    storage,
+    path: str,
+    metadata: dict | None = None,
+    index: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> int:
+    """Write every row of ``storage`` to ``path``; returns the rows written.
+
+    Layout: the magic, then one 64-byte aligned section per column, the
+    message offsets (rows + 1, relative to the message section), the
+    trigram signatures if ``index``, and the UTF-8 messages, followed by
+    a JSON footer (symbols, metadata, section offsets) and a fixed-size
+    trailer locating it. Section sizes are known up front, so one pass
+    over the storage in ``SAVE_CHUNK`` rows fills them all in place and
+    memory use doesn't grow with the capture. The file is written under
+    a temporary name and renamed into place when complete, or removed
+    on failure or once ``cancel`` is set (returning 0).
+
+    Storage may keep ingesting meanwhile: the rows saved are the ones it
+    held when the save began, copied a chunk ahead while it holds still,
+    and ValueError is raised should any be evicted before their turn.
+    ``progress`` is first called with none done once the first chunk is
+    copied.
+    """
+    first_seq = storage.first_seq
+    rows = len(storage)
+    symbols = storage.symbols
+    blocks = -(-rows // BLOCK_ROWS)
+    sections: dict[str, list] = {}
+    pos = len(MAGIC)
+    for name, dtype in _COLUMNS:
+        pos = _aligned(pos)
+        sections[name] = [pos, dtype]
+        pos += np.dtype(dtype).itemsize * rows
+    pos = _aligned(pos)
+    sections["msg_offsets"] = [pos, "<i8"]
+    pos += 8 * (rows + 1)
+    if index:
+        pos = _aligned(pos)
+        sections["signatures"] = [pos, "u1"]
+        pos += blocks * SIGNATURE_BYTES
+    messages_at = _aligned(pos)
+
+    temp = path + ".part"
+    try:
+        with open(temp, "wb") as f:
+
+            def put(data: bytes, offset: int) -> None:
+                f.seek(offset)
+                f.write(data)
+
+            put(MAGIC, 0)
+            put(bytes(8), sections["msg_offsets"][0])  # offset of row 0
+            written = 0  # message bytes so far
+            ahead = _copy_rows(storage, first_seq, min(SAVE_CHUNK, rows))
+            if progress is not None:
+                progress(0, rows)  # the rows to save are pinned from here on
+            for lo in range(0, rows, SAVE_CHUNK):
+                if cancel is not None and cancel.is_set():
+                    break
+                hi = min(lo + SAVE_CHUNK, rows)
+                columns, blob = ahead
+                # Copied before this chunk is indexed, to keep well ahead of eviction
+                ahead = _copy_rows(storage, first_seq + hi, min(hi + SAVE_CHUNK, rows) - hi)
+                for name, dtype in _COLUMNS:
+                    offset, _ = sections[name]
+                    itemsize = np.dtype(dtype).itemsize
+                    put(columns[name].astype(dtype, copy=False).tobytes(), offset + itemsize * lo)
+
+                lengths = columns["msg_length"].astype(np.int64)
+                ends = np.cumsum(lengths)
+                offset, _ = sections["msg_offsets"]
+                put((ends + written).astype("<i8").tobytes(), offset + 8 * (lo + 1))
+
+                if index:
+                    starts = ends - lengths
+                    texts = [
+                        f"{symbols.lookup(tag)} {blob[s : s + n].decode('utf-8', 'replace')}"
+                        for tag, s, n in zip(columns["tag"].tolist(), starts.tolist(), lengths.tolist())
+                    ]
+                    chunk_index = TrigramIndex(hi - lo)
+                    chunk_index.add(lo, texts)
+                    bits = chunk_index.signatures(lo // BLOCK_ROWS, (hi - 1) // BLOCK_ROWS)
+                    offset, _ = sections["signatures"]
+                    put(bits.tobytes(), offset + SIGNATURE_BYTES * (lo // BLOCK_ROWS))
+
+                put(blob, messages_at + written)
+                written += len(blob)
+                if progress is not None:
+                    progress(hi, rows)
+
+            footer = json.dumps({
+                "version": VERSION,
+                "rows": rows,
+                "sections": sections,
+                "messages": [messages_at, written],
+                "symbols": [symbols.lookup(code) for code in range(len(symbols))],
+                "metadata": metadata or {},
+            }).encode("utf-8")
+            footer_at = messages_at + written
+            put(footer + _TRAILER.pack(footer_at, len(footer), MAGIC), footer_at)
+        if cancel is not None and cancel.is_set():
+            os.unlink(temp)
+            return 0
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+    os.replace(temp, path)
+    return rows
+
+
+def _copy_rows(storage, seq: int, count: int) -> tuple[dict[str, np.ndarray], bytes]:
+    """``copy_rows`` of the ``count`` rows from sequence number ``seq`` on,
+    taken again if storage shifted while they were copied."""
+    while count > 0:
+        first, generation = storage.first_seq, storage.generation
+        if generation & 1:
+            time.sleep(0.001)  # the ring is being reallocated
+            continue
+        if seq < first:
+            raise ValueError("rows were evicted before they could be saved")
+        try:
+            columns, blob = storage.copy_rows(seq - first, seq - first + count)
+        except (IndexError, KeyError, ValueError, OSError):
+            if (storage.first_seq, storage.generation) == (first, generation):
+                raise
+            continue
+        if (storage.first_seq, storage.generation) == (first, generation):
+            return columns, blob
+    return {}, b""
+
+
+class SessionSaver:
+    """Runs ``save_session`` on a worker thread, as Exporter does an export.
+
+    ``start()`` returns once the first rows are copied, so the rows saved
+    are the ones storage holds when it is called, however soon the
+    caller evicts. ``progress``, ``written`` and ``error`` may be polled
+    from the GUI thread; ``cancel()`` stops the save and removes the
+    partial file.
+    """
+
+    def __init__(self, storage, path: str, metadata: dict | None = None):
+        self._storage = storage
+        self._path = path
+        self._metadata = metadata
+        self._cancel = threading.Event()
+        self._began = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.progress = 0.0
+        self.written = 0
+        self.error: Exception | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._began.wait()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        def progress(done: int, total: int) -> None:
+            self.progress = done / total if total else 1.0
+            self._began.set()
+
+        try:
+            self.written = save_session(self._storage, self._path, self._metadata, progress=progress, cancel=self._cancel)
+        except Exception as e:  # reported to the GUI, which decides how to show it
+            self.error = e
+        finally:
+            self._began.set()
+
+
+def is_session(path: str) -> bool:
+    """True if ``path`` starts with the session magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SessionStorage:
+    """Read-only LogStorage over a mapped ``.prycat`` file.
+
+    Columns are NumPy views straight into the mapping, so opening costs
+    reading the footer and interning the saved tags into ``symbols``;
+    saved tag codes are translated through a small remap table on access.
+    Text search uses the saved trigram signatures when present.
+    """
+
+    def __init__(self, path: str, symbols: SymbolTable | None = None):
+        self._path = path
+        self._symbols = symbols if symbols is not None else SymbolTable()
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            footer = self._read_footer()
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+
+        self._rows = footer["rows"]
+        self._metadata = footer.get("metadata", {})
+        sections = footer["sections"]
+        self._views = {}
+        for name, dtype in _COLUMNS:
+            if name in sections:
+                self._views[name] = np.frombuffer(self._mm, dtype=dtype, count=self._rows, offset=sections[name][0])
+            else:  # sessions saved before multi-device capture have no device column
+                self._views[name] = np.full(self._rows, -1, dtype=dtype)
+        self._msg_offsets = np.frombuffer(self._mm, dtype="<i8", count=self._rows + 1, offset=sections["msg_offsets"][0])
+        self._messages_at = footer["messages"][0]
+        self._signatures = None
+        if "signatures" in sections:
+            blocks = -(-self._rows // BLOCK_ROWS)
+            flat = np.frombuffer(self._mm, dtype=np.uint8, count=blocks * SIGNATURE_BYTES, offset=sections["signatures"][0])
+            self._signatures = flat.reshape(blocks, SIGNATURE_BYTES)
+        saved = footer["symbols"]
+        self._remap = np.fromiter(map(self._symbols.intern, saved), dtype=np.int32, count=len(saved))
+
+    def _read_footer(self) -> dict:
+        mm = self._mm
+        if len(mm) < len(MAGIC) + _TRAILER.size or mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self._path} is not a prycat session")
+        footer_at, footer_len, magic = _TRAILER.unpack_from(mm, len(mm) - _TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError(f"{self._path} is incomplete or damaged")
+        footer = json.loads(bytes(mm[footer_at : footer_at + footer_len]))
+        if footer.get("version", 0) > VERSION:
+            raise ValueError(f"{self._path} was saved by a newer prycat")
+        return footer
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def metadata(self) -> dict:
+        """Whatever the saving window recorded: device, package, PID, ..."""
+        return self._metadata
+
+    @property
+    def indexing(self) -> bool:
+        return False  # nothing to scan; kept alike with FileStorage
+
+    @property
+    def progress(self) -> float:
+        return 1.0
+
+    def close(self) -> None:
+        self._views = {}
+        self._msg_offsets = self._signatures = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # column views still referenced; unmapped once they go
+        self._file.close()
+
+    # ── LogStorage interface ────────────────────────────
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def capacity(self) -> int:
+        return self._rows
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._symbols
+
+    @property
+    def first_seq(self) -> int:
+        return 0
+
+    @property
+    def generation(self) -> int:
+        return 0
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        stop = self._rows if stop is None else min(stop, self._rows)
+        values = self._views[name][start:stop]
+        if name == "device":
+            return np.where(values >= 0, self._remap[values], -1).astype(np.int32)
+        return self._remap[values] if name == "tag" else values
+
+    def text_candidates(self, needles: list[bytes], start: int = 0, stop: int | None = None) -> np.ndarray:
+        stop = self._rows if stop is None else min(stop, self._rows)
+        if start >= stop:
+            return np.zeros(0, dtype=bool)
+        if self._signatures is None:
+            return np.ones(stop - start, dtype=bool)
+        first_block = start // BLOCK_ROWS
+        blocks = np.arange(first_block, (stop - 1) // BLOCK_ROWS + 1, dtype=np.int64)
+        hit = signature_hits(self._signatures, blocks, needles)
+        return hit[np.arange(start, stop) // BLOCK_ROWS - first_block]
+
+    def timestamp(self, row: int) -> int:
+        return int(self._views["timestamp"][row])
+
+    def pid(self, row: int) -> int:
+        return int(self._views["pid"][row])
+
+    def tid(self, row: int) -> int:
+        return int(self._views["tid"][row])
+
+    def priority(self, row: int) -> int:
+        return int(self._views["priority"][row])
+
+    def uid(self, row: int) -> int:
+        return int(self._views["uid"][row])
+
+    def device_code(self, row: int) -> int:
+        code = int(self._views["device"][row])
+        return int(self._remap[code]) if code >= 0 else -1
+
+    def device(self, row: int) -> str:
+        code = self.device_code(row)
+        return self._symbols.lookup(code) if code >= 0 else ""
+
+    def tag_code(self, row: int) -> int:
+        return int(self._remap[self._views["tag"][row]])
+
+    def tag(self, row: int) -> str:
+        return self._symbols.lookup(self.tag_code(row))
+
+    def message(self, row: int) -> str:
+        if not 0 <= row < self._rows:
+            raise IndexError(row)
+        base = self._messages_at
+        return self._mm[base + self._msg_offsets[row] : base + self._msg_offsets[row + 1]].decode("utf-8", "replace")
+
+    def entry(self, row: int) -> LogEntry:
+        return LogEntry(
+            timestamp=format_timestamp(self.timestamp(row)),
+            pid=str(self.pid(row)),
+            tid=str(self.tid(row)),
+            priority=PRIORITY_LETTERS[self.priority(row)],
+            tag=self.tag(row),
+            message=self.message(row),
+            device=self.device(row),
+        )
+
+    def copy_rows(self, start: int, stop: int) -> tuple[dict[str, np.ndarray], bytes]:
+        stop = min(stop, self._rows)
+        columns = {name: self.column(name, start, stop).copy() for name, _ in _COLUMNS}
+        offsets = self._msg_offsets[start : stop + 1]
+        columns["msg_length"] = np.diff(offsets).astype(np.int32)
+        base = self._messages_at
+        return columns, bytes(self._mm[base + offsets[0] : base + offsets[-1]]) if stop > start else b""
+
+    # ── Accounting ──────────────────────────────────────
+    @property
+    def nbytes(self) -> int:
+        """Bytes held outside the mapping: just the tag remap."""
+        return self._remap.nbytes
+
+    @property
+    def bytes_per_entry(self) -> float:
+        return self.nbytes / self._rows if self._rows else 0.0
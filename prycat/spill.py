@@ -0,0 +1,127 @@
+"""SpillBuffer: lossless overflow of reader batches to a temporary file."""
+
+from __future__ import annotations
+
+import pickle
+import queue
+import struct
+import tempfile
+import threading
+
+from .storage import LogRecord
+
+_LENGTH = struct.Struct("<I")
+
+
+class SpillBuffer:
+    """Decides where each reader batch goes when the queue is full.
+
+    ``put()`` runs on the reader thread. A batch goes onto the queue while
+    it has room; otherwise it is appended to an on-disk segment file, and
+    every later batch follows it to disk until the GUI has replayed the
+    file with ``take()``, so lines never change order. With ``enabled``
+    off, overflowing batches are dropped instead. Both outcomes are
+    counted for the status bar.
+
+    Queue items are ``(session, batch)``, so a consumer can tell a reader
+    it has moved on from; the reader's final ``None`` never waits for
+    room either, but is held back until ``take_end()`` once the queue was
+    full or lines are spilled.
+    """
+
+    def __init__(self, enabled: bool = True, directory: str | None = None):
+        self._enabled = enabled
+        self._directory = directory
+        self._file = None  # created on first spill
+        self._lock = threading.Lock()
+        self._read_pos = 0
+        self._write_pos = 0
+        self._pending = 0  # batches on disk not yet replayed
+        self._ended = False  # the final None is owed to the consumer
+        self.spilled_lines = 0
+        self.dropped_lines = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._pending > 0
+
+    # ── Reader side ─────────────────────────────────────
+    def put(self, out_queue: queue.Queue, batch: list[LogRecord] | None, session: int = 0) -> bool:
+        """Queue or spill ``batch`` (or the final None); False if it had to be dropped."""
+        with self._lock:
+            if not self._pending:
+                try:
+                    out_queue.put_nowait((session, batch))
+                    return True
+                except queue.Full:
+                    pass
+            if batch is None:
+                self._ended = True
+                return True
+            if not self._enabled:
+                self.dropped_lines += len(batch)
+                return False
+            # Columns pickle far smaller and faster than a list of tuples
+            blob = pickle.dumps(tuple(zip(*batch)), protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                if self._file is None:
+                    self._file = tempfile.TemporaryFile(prefix="prycat-spill-", dir=self._directory)
+                self._file.seek(self._write_pos)
+                self._file.write(_LENGTH.pack(len(blob)))
+                self._file.write(blob)
+            except OSError:
+                self.dropped_lines += len(batch)  # disk full or unwritable
+                return False
+            self._write_pos += _LENGTH.size + len(blob)
+            self._pending += 1
+            self.spilled_lines += len(batch)
+            return True
+
+    # ── GUI side ────────────────────────────────────────
+    def take(self, max_lines: int) -> list[LogRecord]:
+        """Replay up to about ``max_lines`` spilled lines, oldest first."""
+        records: list[LogRecord] = []
+        with self._lock:
+            while self._pending and len(records) < max_lines:
+                self._file.seek(self._read_pos)
+                (size,) = _LENGTH.unpack(self._file.read(_LENGTH.size))
+                columns = pickle.loads(self._file.read(size))
+                records.extend(map(LogRecord._make, zip(*columns)))
+                self._read_pos += _LENGTH.size + size
+                self._pending -= 1
+            if not self._pending:
+                self._truncate()
+        return records
+
+    def take_end(self) -> bool:
+        """Whether the reader's final None, held back by ``put()``, is due:
+        true once, when no line spilled before it is left to take."""
+        with self._lock:
+            if not self._ended or self._pending:
+                return False
+            self._ended = False
+            return True
+
+    def reset(self) -> None:
+        """Discard anything spilled and zero the counters for a new session."""
+        with self._lock:
+            self._pending = 0
+            self._ended = False
+            self._truncate()
+            self.spilled_lines = 0
+            self.dropped_lines = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._pending = 0
+            self._ended = False
+            self._read_pos = self._write_pos = 0
+
+    def _truncate(self) -> None:
+        self._read_pos = self._write_pos = 0
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
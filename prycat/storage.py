@@ -0,0 +1,520 @@
+"""LogStorage: fixed-capacity columnar ring buffer backing LogcatModel."""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import sys
+import time
+from array import array
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from .symbols import SymbolTable
+from .trigram import BLOCK_ROWS, TrigramIndex
+
+PRIORITY_LETTERS = "VDIWEFS"
+PRIORITY_ORDER = {p: i for i, p in enumerate(PRIORITY_LETTERS)}
+
+
+class LogEntry(NamedTuple):
+    timestamp: str
+    pid: str
+    tid: str
+    priority: str
+    tag: str
+    message: str
+    device: str = ""
+
+
+class LogRecord(NamedTuple):
+    """Storage-ready entry: every field except the message is an integer.
+
+    ``priority`` indexes PRIORITY_LETTERS and ``tag`` is a SymbolTable code.
+    ``uid`` is only known for binary (``logcat -B``) input; -1 otherwise.
+    ``device`` is the SymbolTable code of the serial the record came from,
+    or -1 when there is only the one (default) device.
+    """
+
+    timestamp: int
+    pid: int
+    tid: int
+    priority: int
+    tag: int
+    message: str
+    uid: int = -1
+    device: int = -1
+
+
+# ── Timestamps ──────────────────────────────────────────
+# Timestamps are stored as naive wall-clock nanoseconds since 1970-01-01.
+# threadtime carries no year, so the current year is assumed.
+_MS_NS = 1_000_000
+_SEC_NS = 1_000_000_000
+_DAY_NS = 86_400 * _SEC_NS
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_day_ns_cache: dict[str, int] = {}
+_day_str_cache: dict[int, str] = {}
+
+
+def _day_ns(day: str) -> int:
+    year = datetime.date.today().year
+    month, mday = int(day[:2]), int(day[3:5])
+    try:
+        ordinal = datetime.date(year, month, mday).toordinal()
+    except ValueError:
+        try:
+            # 02-29 outside a leap year: borrow the last leap year
+            ordinal = datetime.date(year - year % 4, month, mday).toordinal()
+        except ValueError:
+            ordinal = _EPOCH_ORDINAL
+    base = (ordinal - _EPOCH_ORDINAL) * _DAY_NS
+    _day_ns_cache[day] = base
+    return base
+
+
+def parse_timestamp(text: str) -> int:
+    """Convert a threadtime "MM-DD HH:MM:SS.mmm" stamp to nanoseconds."""
+    base = _day_ns_cache.get(text[:5])
+    if base is None:
+        base = _day_ns(text[:5])
+    clock = text[-12:]
+    seconds = (int(clock[0:2]) * 60 + int(clock[3:5])) * 60 + int(clock[6:8])
+    return base + seconds * _SEC_NS + int(clock[9:12]) * _MS_NS
+
+
+def epoch_to_timestamp(sec: int, nsec: int, zone: datetime.tzinfo | None = None) -> int:
+    """Convert a UTC epoch time (as logd records it) to stored nanoseconds.
+
+    Stored times are wall-clock times, as threadtime prints them, so the
+    epoch is shifted into ``zone``: the device's time zone when known,
+    otherwise the host's, which only matches text captures of a device
+    set to the same zone.
+    """
+    if zone is None:
+        return calendar.timegm(time.localtime(sec)) * _SEC_NS + nsec
+    offset = datetime.datetime.fromtimestamp(sec, zone).utcoffset()
+    return (sec + int(offset.total_seconds())) * _SEC_NS + nsec
+
+
+def format_timestamp(ns: int) -> str:
+    """Format stored nanoseconds back into threadtime "MM-DD HH:MM:SS.mmm"."""
+    days, rem = divmod(ns, _DAY_NS)
+    day = _day_str_cache.get(days)
+    if day is None:
+        date = datetime.date.fromordinal(days + _EPOCH_ORDINAL)
+        day = _day_str_cache[days] = f"{date.month:02d}-{date.day:02d}"
+    ms = rem // _MS_NS
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{day} {h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+
+def _zeros(typecode: str, n: int) -> array:
+    a = array(typecode)
+    a.frombytes(bytes(a.itemsize * n))
+    return a
+
+
+_COLUMNS = ("timestamp", "pid", "tid", "priority", "tag", "uid", "device")
+_SLOT_BYTES = 8 + 4 + 4 + 1 + 4 + 8 + 4 + 4 + 4  # every column array, msg_offset/_length included
+_INITIAL_SLOTS = 1 << 16  # most a byte-budgeted ring starts from
+_MIN_SLOTS = 1 << 10  # least it starts from, and its first step up from empty
+
+
+def _initial_slots(capacity: int, max_bytes: int) -> int:
+    # Columns and index for a quarter of the budget; the rest is left to
+    # messages, and the ring doubles from here while the budget allows
+    per_row = _SLOT_BYTES + TrigramIndex.nbytes_for(_INITIAL_SLOTS) / _INITIAL_SLOTS
+    slots = max(_MIN_SLOTS, min(_INITIAL_SLOTS, int(max_bytes / 4 / per_row)))
+    return min(capacity, slots)
+
+
+def _arena_cost(nbytes):
+    # CPython over-allocates a growing bytearray by 1/8, and bytes deleted
+    # from its front stay allocated until it next moves; a quarter covers both
+    return nbytes + nbytes // 4
+
+
+def message_bytes(records: list[LogRecord]) -> int:
+    """Message size of ``records`` as ``LogStorage.overflow`` takes it.
+
+    Counted in characters, which is exact for ASCII and cheap; text
+    beyond ASCII takes a little more once encoded.
+    """
+    return sum(len(r.message) for r in records)
+
+
+# ── Storage ─────────────────────────────────────────────
+class LogStorage:
+    """Columnar ring buffer of log entries.
+
+    Numeric fields live in preallocated typed arrays indexed by physical
+    slot; messages are UTF-8 encoded into one contiguous arena and located
+    by (offset, length). Logical row ``i`` lives in slot
+    ``(head + i) % capacity``, so random access and eviction are O(1).
+
+    Each array is also exposed as a zero-copy NumPy view, used for bulk
+    writes and for vectorized filtering via ``column()``.
+
+    Every row also has an absolute sequence number (``first_seq + row``)
+    that survives eviction; the trigram text index is keyed on it.
+
+    With ``max_bytes`` the storage is bounded by memory as well as by
+    ``capacity`` rows: the ring starts small and doubles while the budget
+    allows, and ``overflow()`` counts the oldest rows to evict so that
+    columns, arena, index and symbols stay within it.
+    """
+
+    def __init__(self, capacity: int, symbols: SymbolTable | None = None, max_bytes: int | None = None):
+        self._capacity = max(0, capacity)
+        self._max_bytes = max_bytes
+        self._symbols = symbols if symbols is not None else SymbolTable()
+        self._head = 0
+        self._size = 0
+        self._first_seq = 0  # sequence number of logical row 0
+        self._generation = 0  # odd while _grow is moving the ring
+
+        # Message arena; _arena[0] sits at absolute offset _arena_base
+        self._arena = bytearray()
+        self._arena_base = 0
+
+        # Under a byte budget the ring starts small and grows as it fills
+        slots = self._capacity if max_bytes is None else _initial_slots(self._capacity, max_bytes)
+        self._allocate(slots)
+        self._text_index = TrigramIndex(slots)
+
+    def _allocate(self, slots: int) -> None:
+        self._slots = slots
+        self._timestamp = _zeros("q", slots)
+        self._pid = _zeros("i", slots)
+        self._tid = _zeros("i", slots)
+        self._priority = _zeros("b", slots)
+        self._tag = _zeros("i", slots)
+        self._msg_offset = _zeros("q", slots)  # absolute arena offset
+        self._msg_length = _zeros("i", slots)
+        self._uid = _zeros("i", slots)
+        self._device = _zeros("i", slots)  # serial symbol code, -1 if unknown
+        self._views = {
+            name: np.frombuffer(a, dtype=a.typecode)
+            for name, a in (
+                ("timestamp", self._timestamp), ("pid", self._pid), ("tid", self._tid),
+                ("priority", self._priority), ("tag", self._tag),
+                ("msg_offset", self._msg_offset), ("msg_length", self._msg_length),
+                ("uid", self._uid), ("device", self._device),
+            )
+        }
+
+    def _grow(self, slots: int) -> None:
+        """Move the rows into a ring of ``slots`` slots, oldest first."""
+        self._generation += 1
+        rows = {name: self._ring(name, 0, self._size).copy() for name in self._views}
+        self._allocate(slots)
+        for name, values in rows.items():
+            self._views[name][: self._size] = values
+        self._head = 0
+        self._text_index.resize(slots)
+        self._generation += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Most rows held; under a byte budget the budget may bind first."""
+        return self._capacity
+
+    @property
+    def max_bytes(self) -> int | None:
+        return self._max_bytes
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._symbols
+
+    @property
+    def first_seq(self) -> int:
+        return self._first_seq
+
+    @property
+    def generation(self) -> int:
+        """Bumped before and after every ring reallocation; odd while one runs.
+
+        Lock-free readers on other threads compare it around a read, like
+        ``first_seq``, to detect rows that moved under them.
+        """
+        return self._generation
+
+    def _slot(self, row: int) -> int:
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        return (self._head + row) % self._slots
+
+    # ── Mutation ────────────────────────────────────────
+    def extend(self, records: Iterable[LogRecord]) -> None:
+        """Append records, evicting the oldest rows when full.
+
+        Every record is kept, so there may be no more than ``room()``
+        allows. Under a byte budget only full slots are evicted here;
+        callers evict ``overflow()`` rows first to stay within the budget.
+        """
+        if self._capacity == 0:
+            return
+        records = list(records)
+        count = len(records)
+        if count == 0:
+            return
+        if count > self._slots:
+            raise ValueError(f"{count} records do not fit in {self._slots} slots")
+        overflow = self._size + count - self._slots
+        if overflow > 0:
+            self.evict(overflow)
+
+        timestamps, pids, tids, priorities, tags, messages, uids, devices = zip(*records)
+        encoded = [m.encode("utf-8", "replace") for m in messages]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=count)
+        offsets = np.cumsum(lengths) - lengths + (self._arena_base + len(self._arena))
+        self._arena += b"".join(encoded)
+
+        lookup = self._symbols.lookup
+        self._text_index.add(
+            self._first_seq + self._size,
+            [f"{lookup(tag)} {message}" for tag, message in zip(tags, messages)],
+        )
+
+        start = (self._head + self._size) % self._slots
+        views = self._views
+        self._write(views["timestamp"], start, timestamps)
+        self._write(views["pid"], start, pids)
+        self._write(views["tid"], start, tids)
+        self._write(views["priority"], start, priorities)
+        self._write(views["tag"], start, tags)
+        self._write(views["msg_offset"], start, offsets)
+        self._write(views["msg_length"], start, lengths)
+        self._write(views["uid"], start, uids)
+        self._write(views["device"], start, devices)
+        self._size += count
+
+    def _write(self, view: np.ndarray, start: int, values) -> None:
+        values = np.asarray(values, dtype=view.dtype)
+        first = min(len(values), self._slots - start)
+        view[start : start + first] = values[:first]
+        if first < len(values):
+            view[: len(values) - first] = values[first:]
+
+    def room(self, count: int, nbytes: int = 0) -> int:
+        """How many of ``count`` new rows ``extend()`` can take at once.
+
+        All of them unless the ring, grown as far as the budget allows for
+        ``nbytes`` more message bytes, has fewer slots, or their messages
+        alone (at their average size) would not fit the budget with every
+        row held evicted. Callers append just that many of the newest and
+        count them for ``overflow()``.
+        """
+        if self._max_bytes is None:
+            return min(count, self._slots)
+        nbytes = _arena_cost(nbytes)
+        self._reserve(count, nbytes)
+        rows = min(count, self._slots)
+        spare = self._max_bytes - self._budget_bytes(self._slots) + _arena_cost(len(self._arena))
+        if nbytes > spare and count:
+            rows = min(rows, max(1, spare * count // nbytes))
+        return rows
+
+    def overflow(self, count: int, nbytes: int = 0) -> int:
+        """Rows that must be evicted before ``count`` more fit.
+
+        Under a byte budget ``nbytes`` is the new rows' message size; the
+        ring first grows while the budget allows, then enough of the
+        oldest rows are counted to make room for the rest. Never more than
+        the rows held.
+        """
+        if self._max_bytes is None:
+            return max(0, self._size + count - self._capacity)
+        nbytes = _arena_cost(nbytes)
+        self._reserve(count, nbytes)
+        rows = max(0, self._size + count - self._slots)
+        excess = self._budget_bytes(self._slots) + nbytes - self._max_bytes
+        if rows:
+            excess -= self._message_bytes(0, rows)
+        if excess > 0:
+            rows += self._rows_holding(rows, excess)
+        return min(rows, self._size)
+
+    def _reserve(self, count: int, nbytes: int) -> None:
+        """Grow the ring toward ``count`` free slots while the budget allows."""
+        needed = min(self._size + count, self._capacity)
+        slots = self._slots
+        while slots < needed:
+            bigger = min(self._capacity, max(slots * 2, _MIN_SLOTS))
+            if self._max_bytes is not None and self._budget_bytes(bigger) + nbytes > self._max_bytes:
+                break
+            slots = bigger
+        if slots != self._slots:
+            self._grow(slots)
+
+    def _budget_bytes(self, slots: int) -> int:
+        """Bytes counted against the budget with ``slots`` slots: what
+        ``nbytes`` counts, taking the arena as its live size plus slack."""
+        arena = _arena_cost(len(self._arena))
+        return slots * _SLOT_BYTES + TrigramIndex.nbytes_for(slots) + arena + self._symbols.nbytes
+
+    def _message_bytes(self, start: int, stop: int) -> int:
+        return _arena_cost(int(self._ring("msg_length", start, stop).sum(dtype=np.int64)))
+
+    def _rows_holding(self, start: int, nbytes: int) -> int:
+        """How many rows from ``start`` on it takes to free ``nbytes``."""
+        freed = 0
+        row = start
+        step = 1024
+        while row < self._size:
+            lengths = self._ring("msg_length", row, row + step).astype(np.int64)
+            cumulative = np.cumsum(_arena_cost(lengths))
+            if freed + cumulative[-1] >= nbytes:
+                return row - start + int(np.searchsorted(cumulative, nbytes - freed)) + 1
+            freed += int(cumulative[-1])
+            row += len(lengths)
+            step *= 2
+        return self._size - start
+
+    def evict(self, count: int) -> None:
+        """Drop the ``count`` oldest rows."""
+        count = min(count, self._size)
+        if count <= 0:
+            return
+        self._head = (self._head + count) % self._slots
+        self._size -= count
+        self._first_seq += count
+        self._text_index.evict(self._first_seq)
+        if self._size == 0:
+            self._arena_base += len(self._arena)
+            self._arena.clear()
+            return
+        # Deleting from the front of a bytearray is O(1) in CPython
+        start = self._msg_offset[self._head]
+        del self._arena[: start - self._arena_base]
+        self._arena_base = start
+
+    def clear(self) -> None:
+        self.evict(self._size)
+        self._head = 0
+        self._text_index.reset()
+
+    # ── Access ──────────────────────────────────────────
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Return ``name`` values for logical rows [start, stop) in row order.
+
+        The result is a view when the range does not wrap and a copy when it
+        does; either way it must not be held across mutations.
+        """
+        if name not in _COLUMNS:
+            raise KeyError(name)
+        return self._ring(name, start, stop)
+
+    def copy_rows(self, start: int, stop: int) -> tuple[dict[str, np.ndarray], bytes]:
+        """Detached copies of rows [start, stop): every column plus
+        ``msg_length``, and the messages as one UTF-8 blob in row order."""
+        stop = min(stop, self._size)
+        columns = {name: self._ring(name, start, stop).copy() for name in (*_COLUMNS, "msg_length")}
+        if start >= stop:
+            return columns, b""
+        first = self._msg_offset[self._slot(start)] - self._arena_base
+        last = self._slot(stop - 1)
+        end = self._msg_offset[last] + self._msg_length[last] - self._arena_base
+        return columns, bytes(self._arena[first:end])
+
+    def _ring(self, name: str, start: int, stop: int | None) -> np.ndarray:
+        stop = self._size if stop is None else min(stop, self._size)
+        view = self._views[name]
+        if start >= stop:
+            return view[:0]
+        first = (self._head + start) % self._slots
+        last = first + stop - start
+        if last <= self._slots:
+            return view[first:last]
+        return np.concatenate((view[first:], view[: last - self._slots]))
+
+    def text_candidates(self, needles: list[bytes], start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Mask over rows [start, stop) that may contain every folded needle.
+
+        Needles must come from ``trigram.fold`` and be at least three bytes
+        long; rows outside the mask are guaranteed not to match.
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return np.zeros(0, dtype=bool)
+        first_block = (self._first_seq + start) // BLOCK_ROWS
+        last_block = (self._first_seq + stop - 1) // BLOCK_ROWS
+        live = np.zeros(last_block - first_block + 1, dtype=bool)
+        live[self._text_index.candidate_blocks(needles, first_block, last_block) - first_block] = True
+        seq = np.arange(self._first_seq + start, self._first_seq + stop, dtype=np.int64)
+        return live[seq // BLOCK_ROWS - first_block]
+
+    def text_signatures(self, start: int, stop: int) -> tuple[int, np.ndarray]:
+        """(first block, trigram bitmaps) of the index blocks holding rows
+        [start, stop), for archiving them along with the rows."""
+        first_block = (self._first_seq + start) // BLOCK_ROWS
+        last_block = (self._first_seq + stop - 1) // BLOCK_ROWS
+        return first_block, self._text_index.signatures(first_block, last_block)
+
+    def timestamp(self, row: int) -> int:
+        return self._timestamp[self._slot(row)]
+
+    def pid(self, row: int) -> int:
+        return self._pid[self._slot(row)]
+
+    def tid(self, row: int) -> int:
+        return self._tid[self._slot(row)]
+
+    def priority(self, row: int) -> int:
+        return self._priority[self._slot(row)]
+
+    def uid(self, row: int) -> int:
+        return self._uid[self._slot(row)]
+
+    def device_code(self, row: int) -> int:
+        return self._device[self._slot(row)]
+
+    def device(self, row: int) -> str:
+        code = self._device[self._slot(row)]
+        return self._symbols.lookup(code) if code >= 0 else ""
+
+    def tag_code(self, row: int) -> int:
+        return self._tag[self._slot(row)]
+
+    def tag(self, row: int) -> str:
+        return self._symbols.lookup(self._tag[self._slot(row)])
+
+    def message(self, row: int) -> str:
+        slot = self._slot(row)
+        start = self._msg_offset[slot] - self._arena_base
+        return self._arena[start : start + self._msg_length[slot]].decode("utf-8", "replace")
+
+    def entry(self, row: int) -> LogEntry:
+        slot = self._slot(row)
+        return LogEntry(
+            timestamp=format_timestamp(self._timestamp[slot]),
+            pid=str(self._pid[slot]),
+            tid=str(self._tid[slot]),
+            priority=PRIORITY_LETTERS[self._priority[slot]],
+            tag=self._symbols.lookup(self._tag[slot]),
+            message=self.message(row),
+            device=self.device(row),
+        )
+
+    # ── Accounting ──────────────────────────────────────
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held: columns, message arena, symbols and index."""
+        columns = (self._timestamp, self._pid, self._tid, self._priority,
+                   self._tag, self._msg_offset, self._msg_length, self._uid, self._device)
+        total = sum(a.itemsize * len(a) for a in columns)
+        total += sys.getsizeof(self._arena) + self._symbols.nbytes
+        return total + self._text_index.nbytes
+
+    @property
+    def bytes_per_entry(self) -> float:
+        return self.nbytes / self._size if self._size else 0.0
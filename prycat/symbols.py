@@ -0,0 +1,47 @@
+"""SymbolTable: interned strings addressed by small integer codes."""
+
+from __future__ import annotations
+
+import sys
+import threading
+
+
+class SymbolTable:
+    """Append-only string interner shared by the reader and the model.
+
+    The reader thread interns while the GUI thread looks codes up. A symbol
+    is appended to the list before its code is published in the dict, so a
+    code seen by any thread always resolves.
+    """
+
+    def __init__(self):
+        self._codes: dict[str, int] = {}
+        self._symbols: list[str] = []
+        self._lock = threading.Lock()
+        self._string_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def intern(self, symbol: str) -> int:
+        code = self._codes.get(symbol)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(symbol)
+                if code is None:
+                    code = len(self._symbols)
+                    self._symbols.append(symbol)
+                    self._codes[symbol] = code
+                    self._string_bytes += sys.getsizeof(symbol)
+        return code
+
+    def code(self, symbol: str) -> int | None:
+        """Return the code for ``symbol`` without interning it."""
+        return self._codes.get(symbol)
+
+    def lookup(self, code: int) -> str:
+        return self._symbols[code]
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._codes) + sys.getsizeof(self._symbols) + self._string_bytes
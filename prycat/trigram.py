@@ -0,0 +1,180 @@
+"""TrigramIndex: block-granular trigram signatures for fast text search."""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse as _sre_parse
+
+BLOCK_ROWS = 256        # rows summarised by one signature
+SIGNATURE_BITS = 14     # 2**14 bits = 2 KiB per block
+SIGNATURE_BYTES = (1 << SIGNATURE_BITS) // 8
+_HASH_MULT = np.uint32(2654435761)
+_HASH_SHIFT = np.uint32(32 - SIGNATURE_BITS)
+
+_REPEATS = tuple(
+    op for op in (
+        _sre_parse.MAX_REPEAT,
+        _sre_parse.MIN_REPEAT,
+        getattr(_sre_parse, "POSSESSIVE_REPEAT", None),
+    ) if op is not None
+)
+
+
+def _trigram_hashes(data: np.ndarray) -> np.ndarray:
+    """Hash every byte trigram of ``data`` (uint8) to a signature bit."""
+    b = data.astype(np.uint32)
+    tri = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    return (tri * _HASH_MULT) >> _HASH_SHIFT
+
+
+def fold(text: str) -> bytes:
+    """Case-fold text the way both the index and the needles are folded."""
+    return text.casefold().encode("utf-8", "replace")
+
+
+def regex_literals(pattern: str) -> list[str]:
+    """Literal runs that every match of ``pattern`` must contain.
+
+    Only mandatory structure is followed: alternations and optional
+    repeats contribute nothing, so the result is always safe to require.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, OverflowError, RecursionError):
+        return []
+
+    runs: list[str] = []
+
+    def walk(items) -> None:
+        run: list[str] = []
+        for op, av in items:
+            if op is _sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            if run:
+                runs.append("".join(run))
+                run = []
+            if op is _sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in _REPEATS and av[0] >= 1:
+                walk(av[2])
+            elif op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+                walk(av)
+        if run:
+            runs.append("".join(run))
+
+    walk(parsed)
+    return runs
+
+
+def _slots_for(capacity: int) -> int:
+    # One spare, as a window of rows can straddle one more block than it fills
+    return max(1, -(-capacity // BLOCK_ROWS) + 1)
+
+
+class TrigramIndex:
+    """Per-block trigram signatures over case-folded "tag message" text.
+
+    Rows are grouped by absolute sequence number into blocks of
+    ``BLOCK_ROWS``; each block keeps a fixed-size bitmap of hashed
+    trigrams (a Bloom filter). Appending a batch sets bits with a few
+    vectorized passes, eviction just retires whole blocks, and a query
+    ANDs the needle bits across live blocks to find candidate blocks.
+    Memory is fixed at 2 KiB per block regardless of message length.
+    """
+
+    def __init__(self, capacity: int):
+        self._slots = _slots_for(capacity)
+        self._bits = np.zeros((self._slots, SIGNATURE_BYTES), dtype=np.uint8)
+        self._slot_block = np.full(self._slots, -1, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes + self._slot_block.nbytes
+
+    @staticmethod
+    def nbytes_for(capacity: int) -> int:
+        """``nbytes`` of an index for ``capacity`` rows."""
+        return _slots_for(capacity) * (SIGNATURE_BYTES + 8)
+
+    def resize(self, capacity: int) -> None:
+        """Make room for ``capacity`` rows, keeping the blocks held."""
+        slots = _slots_for(capacity)
+        if slots == self._slots:
+            return
+        held = np.flatnonzero(self._slot_block >= 0)
+        blocks = self._slot_block[held]
+        bits = np.zeros((slots, SIGNATURE_BYTES), dtype=np.uint8)
+        slot_block = np.full(slots, -1, dtype=np.int64)
+        bits[blocks % slots] = self._bits[held]
+        slot_block[blocks % slots] = blocks
+        self._slots, self._bits, self._slot_block = slots, bits, slot_block
+
+    def reset(self) -> None:
+        self._bits[:] = 0
+        self._slot_block[:] = -1
+
+    def add(self, first_seq: int, texts: list[str]) -> None:
+        """Index ``texts``, whose first row has sequence number ``first_seq``."""
+        if not texts:
+            return
+        encoded = [fold(t) for t in texts]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b"\0".join(encoded), dtype=np.uint8)
+
+        # Claim (and wipe) the slots of blocks this batch starts
+        first_block = first_seq // BLOCK_ROWS
+        last_block = (first_seq + len(texts) - 1) // BLOCK_ROWS
+        blocks = np.arange(first_block, last_block + 1, dtype=np.int64)
+        slots = blocks % self._slots
+        fresh = self._slot_block[slots] != blocks
+        self._bits[slots[fresh]] = 0
+        self._slot_block[slots] = blocks
+        if len(data) < 3:
+            return
+
+        # Each trigram is attributed to the row it starts in; set its bit in
+        # a scratch bitmap per touched block, then pack and OR into place
+        seq = np.repeat(np.arange(first_seq, first_seq + len(texts), dtype=np.int64), lengths + 1)
+        local = ((seq[: len(data) - 2] // BLOCK_ROWS - first_block) << SIGNATURE_BITS) | _trigram_hashes(data)
+        scratch = np.zeros(len(blocks) << SIGNATURE_BITS, dtype=bool)
+        scratch[local] = True
+        self._bits[slots] |= np.packbits(scratch, bitorder="little").reshape(len(blocks), SIGNATURE_BYTES)
+
+    def evict(self, first_seq: int) -> None:
+        """Retire blocks whose rows all precede ``first_seq``."""
+        stale = self._slot_block < first_seq // BLOCK_ROWS
+        self._slot_block[stale] = -1
+
+    def candidate_blocks(self, needles: list[bytes], first_block: int, last_block: int) -> np.ndarray:
+        """Blocks in [first_block, last_block] that may contain every needle."""
+        blocks = np.arange(first_block, last_block + 1, dtype=np.int64)
+        hit = signature_hits(self._bits, blocks % self._slots, needles)
+        hit &= self._slot_block[blocks % self._slots] == blocks
+        return blocks[hit]
+
+    def signatures(self, first_block: int, last_block: int) -> np.ndarray:
+        """Bitmaps of blocks [first_block, last_block] in block order.
+
+        Blocks not (or no longer) held come back all ones, i.e. as
+        matching anything.
+        """
+        blocks = np.arange(first_block, last_block + 1, dtype=np.int64)
+        bits = self._bits[blocks % self._slots]
+        bits[self._slot_block[blocks % self._slots] != blocks] = 0xFF
+        return bits
+
+
+def signature_hits(bits: np.ndarray, rows: np.ndarray, needles: list[bytes]) -> np.ndarray:
+    """Which of the signatures ``bits[rows]`` may contain every needle."""
+    hashes = np.unique(np.concatenate([
+        _trigram_hashes(np.frombuffer(n, dtype=np.uint8)) for n in needles
+    ]))
+    sub = bits[np.ix_(rows, (hashes >> 3).astype(np.int64))]
+    return (sub & (1 << (hashes & 7)).astype(np.uint8)).all(axis=1)
@@ -1,4 +1,4 @@
-"""FilterBar: text search, tag filter, priority dropdown, PID filter."""
+"""FilterBar: text search, tag filter, priority dropdown, PID and device filters."""
 
 from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import (
@@ -10,12 +10,15 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+_ALL_DEVICES = "All"
+
 
 class FilterBar(QWidget):
     text_filter_changed = Signal(str, bool)  # (text, is_regex)
     tag_filter_changed = Signal(set)
     priority_changed = Signal(str)
     pid_filter_changed = Signal(str)
+    device_filter_changed = Signal(set)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -59,6 +62,15 @@ class FilterBar(QWidget):
         self._pid.setMaximumWidth(80)
         layout.addWidget(self._pid)
 
+        # Device filter; only shown while several devices are captured
+        self._device_label = QLabel("Device:")
+        layout.addWidget(self._device_label)
+        self._device = QComboBox()
+        self._device.addItem(_ALL_DEVICES)
+        self._device.setMinimumWidth(140)
+        layout.addWidget(self._device)
+        self.set_devices([])
+
         # Debounce timer for text search (300ms)
         self._debounce = QTimer(self)
         self._debounce.setSingleShot(True)
@@ -71,6 +83,7 @@ class FilterBar(QWidget):
         self._tags.editingFinished.connect(self._emit_tag_filter)
         self._priority.currentTextChanged.connect(self.priority_changed.emit)
         self._pid.editingFinished.connect(lambda: self.pid_filter_changed.emit(self._pid.text()))
+        self._device.currentIndexChanged.connect(self._emit_device_filter)
 
     def _emit_text_filter(self) -> None:
         self.text_filter_changed.emit(self._search.text(), self._regex_cb.isChecked())
@@ -80,6 +93,30 @@ class FilterBar(QWidget):
         tags = {t.strip() for t in raw.split(",") if t.strip()} if raw else set()
         self.tag_filter_changed.emit(tags)
 
+    def _emit_device_filter(self) -> None:
+        index = self._device.currentIndex()
+        self.device_filter_changed.emit({self._device.itemText(index)} if index > 0 else set())
+
+    def set_devices(self, devices: list[str]) -> None:
+        """Offer ``devices`` in the device filter; hidden for fewer than two."""
+        current = self._device.currentText()
+        self._device.blockSignals(True)
+        self._device.clear()
+        self._device.addItem(_ALL_DEVICES)
+        self._device.addItems(devices)
+        self._device.setCurrentText(current if current in devices else _ALL_DEVICES)
+        self._device.blockSignals(False)
+        shown = len(devices) > 1
+        self._device_label.setVisible(shown)
+        self._device.setVisible(shown)
+        self._emit_device_filter()
+
+    def select_device(self, device: str) -> None:
+        """Show only ``device``'s lines."""
+        index = self._device.findText(device)
+        if index > 0:
+            self._device.setCurrentIndex(index)
+
     def append_tag(self, tag: str) -> None:
         """Add a tag to the filter field and apply."""
         current = self._tags.text().strip()
@@ -9,7 +9,7 @@ from ..theme import BASE, BLUE, MANTLE, OVERLAY0, SURFACE0, SURFACE1, SUBTEXT0,
 class LogDetailWindow(QWidget):
     """Standalone window displaying a single log entry."""
 
-    def __init__(self, timestamp: str, pid: str, tid: str, priority: str, tag: str, message: str, parent=None):
+    def __init__(self, timestamp: str, pid: str, tid: str, priority: str, tag: str, message: str, uid: str = "", parent=None):
         super().__init__(parent)
         self.setWindowTitle(f"Log — {tag}")
         self.setWindowFlags(Qt.Window)
@@ -24,7 +24,10 @@ class LogDetailWindow(QWidget):
         # Header row
         header = QHBoxLayout()
         header.setSpacing(16)
-        for label_text, value in [("Time", timestamp), ("PID", pid), ("TID", tid), ("Level", priority), ("Tag", tag)]:
+        fields = [("Time", timestamp), ("PID", pid), ("TID", tid), ("Level", priority), ("Tag", tag)]
+        if uid:
+            fields.insert(3, ("UID", uid))
+        for label_text, value in fields:
             col = QVBoxLayout()
             col.setSpacing(2)
             lbl = QLabel(label_text)
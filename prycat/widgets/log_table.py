@@ -1,17 +1,37 @@
 """LogTableView: virtual-scrolling QTableView for logcat entries."""
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QKeySequence
-from PySide6.QtWidgets import QAbstractItemView, QApplication, QHeaderView, QMenu, QTableView
+import time
+
+from PySide6.QtCore import QEvent, Qt, Signal
+from PySide6.QtGui import QAction, QColor, QKeySequence, QPainter, QPalette, QPen
+from PySide6.QtWidgets import QAbstractItemView, QApplication, QHeaderView, QMenu, QStyle, QTableView
+
+from ..metrics import PipelineMetrics
+from ..theme import PRIORITY_COLORS, TEXT
 
 
 class LogTableView(QTableView):
+    """Table of log rows, painted a row at a time.
+
+    Over a model with ``display_row`` (LogcatModel and its proxy) the
+    view paints the visible rows itself instead of going through an item
+    delegate cell by cell, which would call back into the Python model
+    for an index, its flags and every data role of every cell. Each row
+    is fetched once, drawn with a pen cached per priority, and text is
+    cut to what its column can show before Qt elides it. How long each
+    paint takes is recorded as ``view.paint_ms`` in ``metrics``.
+    """
+
     open_detail_requested = Signal(int)    # proxy row index
     filter_by_tag_requested = Signal(str)  # tag value
+    filter_by_device_requested = Signal(str)  # device serial
 
-    def __init__(self, parent=None):
+    def __init__(self, metrics: PipelineMetrics | None = None, parent=None):
         super().__init__(parent)
         self._auto_scroll = True
+        self._metrics = metrics
+        self._pens = {level: QPen(color) for level, color in PRIORITY_COLORS.items()}
+        self._text_pen = QPen(QColor(TEXT))
 
         # Performance: uniform row heights avoids per-row height queries
         self.verticalHeader().setDefaultSectionSize(22)
@@ -40,12 +60,18 @@ class LogTableView(QTableView):
         header.setStretchLastSection(True)
         header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
+        self._update_paint_cache()
+
     def apply_column_widths(self) -> None:
         """Call after setting a model to fix column widths."""
-        widths = [160, 60, 60, 50, 150]
+        widths = [130, 160, 60, 60, 50, 150]
         for i, w in enumerate(widths):
             self.setColumnWidth(i, w)
 
+    def set_device_column_visible(self, visible: bool) -> None:
+        """The Device column only says something when several are captured."""
+        self.setColumnHidden(0, not visible)
+
     @property
     def auto_scroll(self) -> bool:
         return self._auto_scroll
@@ -60,6 +86,90 @@ class LogTableView(QTableView):
         if self._auto_scroll:
             self.scrollToBottom()
 
+    # ── Painting ────────────────────────────────────────
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.StyleChange):
+            self._update_paint_cache()
+
+    def _update_paint_cache(self) -> None:
+        """Brushes and font measures the row painter reuses every frame."""
+        palette = self.palette()
+        self._alternate_brush = palette.brush(QPalette.AlternateBase)
+        self._highlight_brush = palette.brush(QPalette.Highlight)
+        self._highlight_pen = QPen(palette.color(QPalette.HighlightedText))
+        metrics = self.fontMetrics()
+        self._font_metrics = metrics
+        self._ascent = metrics.ascent()
+        self._descent = metrics.descent()
+        # No glyph is narrower, so a column never shows more characters
+        self._narrowest = max(1, min(metrics.horizontalAdvance(c) for c in " .il|"))
+        self._widest = max(1, metrics.maxWidth())
+        # As the default delegate insets cell text
+        self._margin = self.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self) + 1
+
+    def paintEvent(self, event) -> None:
+        model = self.model()
+        display_row = getattr(model, "display_row", None)
+        if display_row is None:
+            super().paintEvent(event)
+            return
+        started = time.perf_counter()
+        area = event.rect()
+        first = self.rowAt(area.top())
+        if first >= 0:
+            last = self.rowAt(area.bottom())
+            if last < 0:
+                last = model.rowCount() - 1
+            painter = QPainter(self.viewport())
+            painter.setFont(self.font())
+            self._paint_rows(painter, display_row, first, last, area.left(), area.right())
+            painter.end()
+        if self._metrics is not None:
+            self._metrics.observe("view.paint_ms", (time.perf_counter() - started) * 1000)
+
+    def _paint_rows(self, painter: QPainter, display_row, first: int, last: int, left: int, right: int) -> None:
+        header = self.horizontalHeader()
+        margin = self._margin
+        columns = []  # (column, text x, room) of columns in [left, right]
+        for column in range(header.count()):
+            if header.isSectionHidden(column):
+                continue
+            x = header.sectionViewportPosition(column)
+            width = header.sectionSize(column)
+            if x + width > left and x <= right:
+                columns.append((column, x + margin, width - 2 * margin))
+
+        selected = set()
+        for selection in self.selectionModel().selection():
+            selected.update(range(max(selection.top(), first), min(selection.bottom(), last) + 1))
+
+        height = self.verticalHeader().defaultSectionSize()
+        baseline = (height + self._ascent - self._descent) // 2
+        width = self.viewport().width()
+        alternate = self.alternatingRowColors()
+        pens = self._pens
+        text_pen = self._text_pen
+        for row in range(first, last + 1):
+            y = self.rowViewportPosition(row)
+            if row in selected:
+                painter.fillRect(0, y, width, height, self._highlight_brush)
+            elif alternate and row & 1:
+                painter.fillRect(0, y, width, height, self._alternate_brush)
+            cells = display_row(row)
+            if cells is None:
+                continue  # evicted while frozen
+            painter.setPen(self._highlight_pen if row in selected else pens.get(cells[4], text_pen))
+            for column, x, room in columns:
+                if room > 0:
+                    painter.drawText(x, y + baseline, self._elide(cells[column], room))
+
+    def _elide(self, text: str, room: int) -> str:
+        if len(text) * self._widest <= room:
+            return text  # fits whatever the glyphs
+        # Never measure more than could show: log messages run to 4 KB
+        return self._font_metrics.elidedText(text[: room // self._narrowest + 1], Qt.ElideRight, room)
+
     def keyPressEvent(self, event) -> None:
         if event.matches(QKeySequence.Copy):
             self._copy_selection()
@@ -93,8 +203,9 @@ class LogTableView(QTableView):
         row = index.row()
         model = self.model()
 
-        # Read tag from column 4
-        tag = model.index(row, 4).data(Qt.DisplayRole) or ""
+        # Read device and tag from columns 0 and 5
+        device = model.index(row, 0).data(Qt.DisplayRole) or ""
+        tag = model.index(row, 5).data(Qt.DisplayRole) or ""
 
         menu = QMenu(self)
 
@@ -114,4 +225,9 @@ class LogTableView(QTableView):
         tag_action.triggered.connect(lambda: self.filter_by_tag_requested.emit(tag))
         menu.addAction(tag_action)
 
+        if device and not self.isColumnHidden(0):
+            device_action = QAction(f"Filter by Device '{device}'", self)
+            device_action.triggered.connect(lambda: self.filter_by_device_requested.emit(device))
+            menu.addAction(device_action)
+
         menu.exec(self.viewport().mapToGlobal(pos))
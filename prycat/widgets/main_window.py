@@ -2,20 +2,49 @@
 
 from __future__ import annotations
 
-import csv
+import os
 import queue
+import re
 import time
 
 from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QFileDialog, QLabel, QMainWindow, QMessageBox, QVBoxLayout, QWidget
-
-from ..models import LogcatFilterProxy, LogcatModel, LogEntry
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QLabel,
+    QMainWindow,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..devices import DeviceWatcher
+from ..export import Exporter
+from ..follow import PackageFollow
+from ..history import HistoryStore
+from ..importer import ParallelImport
+from ..logfile import FileStorage
+from ..metrics import PipelineMetrics
+from ..models import LogcatFilterProxy, LogcatModel
 from ..reader import AdbReader
+from ..scheduler import DrainScheduler
+from ..session import SessionSaver, SessionStorage, is_session
+from ..spill import SpillBuffer
+from ..storage import LogRecord
 from .filter_bar import FilterBar
 from .log_detail import LogDetailWindow
 from .log_table import LogTableView
+from .metrics_panel import MetricsPanel
 from .toolbar import Toolbar
 
+_EXPORT_FILTERS = (
+    "Text Files (*.txt);;CSV Files (*.csv);;JSON Lines (*.jsonl);;"
+    "Compressed Text (*.txt.gz *.txt.xz);;Compressed CSV (*.csv.gz *.csv.xz);;"
+    "Compressed JSON Lines (*.jsonl.gz *.jsonl.xz)"
+)
+_EXPORT_SUFFIXES = (".txt", ".csv", ".jsonl", ".gz", ".xz")
+
 
 class MainWindow(QMainWindow):
     def __init__(
@@ -27,6 +56,15 @@ class MainWindow(QMainWindow):
         min_level: str = "V",
         buffer: str | None = None,
         buffer_size: int = 500_000,
+        memory_limit_mb: int | None = None,
+        compression: str | None = None,
+        binary: bool = False,
+        spill: bool = True,
+        file: str | None = None,
+        history: bool = False,
+        history_dir: str | None = None,
+        history_quota_mb: int = 2048,
+        follow: bool = True,
         parent=None,
     ):
         super().__init__(parent)
@@ -41,30 +79,109 @@ class MainWindow(QMainWindow):
         self._initial_min_level = min_level
         self._buffer_name = buffer
         self._buffer_size = buffer_size
+        self._binary = binary
+        self._initial_file = file
+        self._initial_follow = follow
 
         # Core objects
-        self._queue: queue.Queue[LogEntry | None] = queue.Queue(maxsize=10_000)
-        self._model = LogcatModel(maxlen=buffer_size)
-        self._proxy = LogcatFilterProxy()
+        # Items are whole parsed batches (see AdbReader); ~1k lines each,
+        # tagged with the capture session whose readers queued them
+        self._queue: queue.Queue[tuple[int, list[LogRecord] | None]] = queue.Queue(maxsize=256)
+        self._session = 0  # bumped whenever the readers' batches stop counting
+        # Overflow goes to disk and is replayed once the queue drains; one
+        # SpillBuffer per device, keyed by serial ("" for the default device)
+        self._spill_enabled = spill
+        self._spills: dict[str, SpillBuffer] = {}
+        self._readers_left = 0  # connected readers yet to queue their final None
+        self._reader_finished = False
+        self._reader_stopped = False  # a reader queued its None since the last drain
+        self._metrics = PipelineMetrics()
+        # Evicted lines are archived here rather than lost, if enabled
+        self._history = HistoryStore(history_dir, history_quota_mb << 20) if history else None
+        self._model = LogcatModel(
+            maxlen=buffer_size,
+            history=self._history,
+            max_bytes=memory_limit_mb << 20 if memory_limit_mb else None,
+            compression=compression,
+        )
+        self._proxy = LogcatFilterProxy(metrics=self._metrics)
         self._proxy.setSourceModel(self._model)
-        self._reader: AdbReader | None = None
+        self._readers: list[AdbReader] = []  # one per captured device
+        # adb queries run on worker threads; results come back as signals
+        self._adb = DeviceWatcher(adb_path, self)
+        self._known_devices: list[str] | None = None
+        self._connect_request = 0  # PID lookup a pending connect waits for
+        self._connect_target: tuple[list[str | None], str] | None = None
+        # Package followed across restarts, and the pidof polling feeding it
+        self._follow: PackageFollow | None = None
+        self._follow_request = 0
+        self._file_storage: FileStorage | SessionStorage | None = None
+        self._session_info: dict = {}  # saved with sessions: device, package, PID
+        self._import: ParallelImport | None = None
+        self._exporter: Exporter | SessionSaver | None = None  # export or session save, one at a time
         self._paused = False
+        self._unshown_lines = 0  # drained while paused, published on resume
         self._detail_windows: list[LogDetailWindow] = []
 
         # Build UI
         self._build_ui()
         self._wire_signals()
 
-        # Drain timer (50ms)
+        # Drain timer; the scheduler retunes its interval after every tick
+        self._scheduler = DrainScheduler()
         self._drain_timer = QTimer(self)
-        self._drain_timer.setInterval(50)
+        self._drain_timer.setInterval(self._scheduler.interval_ms)
         self._drain_timer.timeout.connect(self._drain_queue)
 
+        # Metrics sampling (1s); cheap enough to run whether shown or not
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(1000)
+        self._metrics_timer.timeout.connect(self._sample_metrics)
+        self._metrics_timer.start()
+
+        # Publishes rows as an opened file's background index grows
+        self._file_timer = QTimer(self)
+        self._file_timer.setInterval(100)
+        self._file_timer.timeout.connect(self._sync_file)
+
+        # Polls a running export
+        self._export_timer = QTimer(self)
+        self._export_timer.setInterval(100)
+        self._export_timer.timeout.connect(self._poll_export)
+
         # Status bar
         self._status_conn = QLabel("Disconnected")
         self._status_lines = QLabel("0 / 0 lines")
         self._status_buf = QLabel("Buffer: 0%")
+        self._status_spill = QLabel("Spilled: 0 · Dropped: 0")
+        self._status_perf = QLabel("")
+        self._status_perf.hide()
+        self._status_history = QLabel("")
+        self._status_history.hide()
+        self._parse_progress = QProgressBar()
+        self._parse_progress.setRange(0, 100)
+        self._parse_progress.setFixedWidth(120)
+        self._parse_progress.hide()
+        self._parse_btn = QPushButton("Parse all")
+        self._parse_btn.setToolTip("Parse the whole file in worker processes")
+        self._parse_btn.clicked.connect(self._on_parse_all)
+        self._parse_btn.hide()
+        self._export_progress = QProgressBar()
+        self._export_progress.setRange(0, 100)
+        self._export_progress.setFormat("Export %p%")
+        self._export_progress.setFixedWidth(120)
+        self._export_progress.hide()
+        self._export_cancel = QPushButton("Cancel export")
+        self._export_cancel.clicked.connect(self._cancel_export)
+        self._export_cancel.hide()
         self.statusBar().addWidget(self._status_conn, 1)
+        self.statusBar().addPermanentWidget(self._export_progress)
+        self.statusBar().addPermanentWidget(self._export_cancel)
+        self.statusBar().addPermanentWidget(self._parse_progress)
+        self.statusBar().addPermanentWidget(self._parse_btn)
+        self.statusBar().addPermanentWidget(self._status_perf)
+        self.statusBar().addPermanentWidget(self._status_spill)
+        self.statusBar().addPermanentWidget(self._status_history)
         self.statusBar().addPermanentWidget(self._status_lines)
         self.statusBar().addPermanentWidget(self._status_buf)
 
@@ -73,17 +190,20 @@ class MainWindow(QMainWindow):
             self._toolbar.set_device(self._initial_device)
         if self._initial_package:
             self._toolbar.set_package(self._initial_package)
+        self._toolbar.set_follow_package(self._initial_follow)
         if self._initial_min_level != "V":
             # Set the filter bar priority combo to match
             idx = self._filter_bar._priority.findText(self._initial_min_level)
             if idx >= 0:
                 self._filter_bar._priority.setCurrentIndex(idx)
 
-        # Refresh device list on startup
-        self._refresh_devices()
+        # Follow devices as they come and go; the first list arrives shortly
+        self._adb.start()
 
-        # Auto-connect if device provided
-        if self._initial_device:
+        # Open the file, or auto-connect if a device was provided
+        if self._initial_file:
+            QTimer.singleShot(0, lambda: self._open_file(self._initial_file))
+        elif self._initial_device:
             QTimer.singleShot(200, self._on_connect)
 
     def _build_ui(self) -> None:
@@ -99,11 +219,14 @@ class MainWindow(QMainWindow):
         self._filter_bar = FilterBar()
         layout.addWidget(self._filter_bar)
 
-        self._table = LogTableView()
+        self._table = LogTableView(self._metrics)
         self._table.setModel(self._proxy)
         self._table.apply_column_widths()
+        self._table.set_device_column_visible(False)
         layout.addWidget(self._table, 1)
 
+        self._metrics_panel = MetricsPanel(self._table)
+
     def _wire_signals(self) -> None:
         # Toolbar
         self._toolbar.connect_requested.connect(self._on_connect)
@@ -111,161 +234,574 @@ class MainWindow(QMainWindow):
         self._toolbar.pause_toggled.connect(self._on_pause)
         self._toolbar.clear_requested.connect(self._on_clear)
         self._toolbar.export_requested.connect(self._on_export)
-        self._toolbar.refresh_button.clicked.connect(self._refresh_devices)
+        self._toolbar.open_requested.connect(self._on_open_file)
+        self._toolbar.save_requested.connect(self._on_save_session)
+        self._toolbar.refresh_button.clicked.connect(self._adb.refresh)
+        self._adb.devices_changed.connect(self._on_devices_changed)
+        self._adb.pids_resolved.connect(self._on_pids_resolved)
+        self._adb.package_pids.connect(self._on_package_pids)
+        self._toolbar.metrics_toggled.connect(self._on_metrics_toggled)
+        self._metrics_panel.export_requested.connect(self._on_export_metrics)
 
         # Filter bar
         self._filter_bar.text_filter_changed.connect(self._proxy.set_text_filter)
         self._filter_bar.tag_filter_changed.connect(self._proxy.set_tag_filter)
         self._filter_bar.priority_changed.connect(self._proxy.set_min_priority)
         self._filter_bar.pid_filter_changed.connect(self._proxy.set_pid_filter)
+        self._filter_bar.device_filter_changed.connect(self._proxy.set_device_filter)
 
         # Table context menu
         self._table.open_detail_requested.connect(self._open_log_detail)
         self._table.filter_by_tag_requested.connect(self._filter_bar.append_tag)
+        self._table.filter_by_device_requested.connect(self._filter_bar.select_device)
 
     # ── Actions ─────────────────────────────────────────
-    def _refresh_devices(self) -> None:
-        devices = AdbReader.list_devices(self._adb_path)
-        self._toolbar.set_devices(devices)
+    def _on_devices_changed(self, devices: list[str]) -> None:
+        if devices != self._known_devices:
+            self._known_devices = devices
+            self._toolbar.set_devices(devices)
 
     def _on_connect(self) -> None:
-        device = self._toolbar.current_device() or None
+        devices = self._toolbar.current_devices() or [None]
         package = self._toolbar.current_package() or None
-
-        pid = None
-        if package:
-            # Retry pidof a few times — ADB or the app may need a moment
-            for attempt in range(3):
-                pid = AdbReader.get_pid_for_package(self._adb_path, device, package)
-                if pid:
-                    break
-                if attempt < 2:
-                    time.sleep(0.5)
-
-            if not pid:
-                reply = QMessageBox.warning(
-                    self,
-                    "PID not found",
-                    f"Could not resolve PID for '{package}'.\n"
-                    "The app may not be running on the device.\n\n"
-                    "Connect without package filter?",
-                    QMessageBox.Yes | QMessageBox.No,
-                    QMessageBox.No,
-                )
-                if reply == QMessageBox.No:
-                    return
-
-        # Clear the queue
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
-
-        self._reader = AdbReader(
-            out_queue=self._queue,
-            adb_path=self._adb_path,
-            device=device,
-            buffer=self._buffer_name,
-            tag_filters=self._tag_filters,
-            pid=pid,
-        )
-        self._reader.start()
+        if not package or self._toolbar.follow_package():
+            # Following needs no PID up front; it may not have started yet
+            self._start_capture(devices, package, dict.fromkeys(devices), follow=bool(package))
+            return
+        # Resolve the PIDs in the background; Disconnect abandons the wait
+        self._connect_request = self._adb.resolve_pids(devices, package)
+        self._connect_target = (devices, package)
+        self._toolbar.set_connected(True)
+        self._status_conn.setText(f"Resolving PID of {package}…")
+
+    def _on_pids_resolved(self, request: int, pids: dict) -> None:
+        if request != self._connect_request:
+            return  # abandoned or superseded
+        self._connect_request = 0
+        devices, package = self._connect_target
+        missing = [device or "default" for device, pid in pids.items() if not pid]
+        if missing:
+            where = "the device" if len(devices) == 1 else ", ".join(missing)
+            reply = QMessageBox.warning(
+                self,
+                "PID not found",
+                f"Could not resolve PID for '{package}'.\n"
+                f"The app may not be running on {where}.\n\n"
+                "Connect without package filter there?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply == QMessageBox.No:
+                self._on_disconnect()
+                return
+        self._start_capture(devices, package, pids)
+
+    def _start_capture(self, devices: list[str | None], package: str | None, pids: dict, follow: bool = False) -> None:
+        self._close_file()
+
+        self._discard_backlog()
+        for spill in self._spills.values():
+            spill.close()
+        self._metrics.reset()
+        self._unshown_lines = 0
+
+        # Following reads everything and narrows to the package's PIDs here,
+        # so a restarted process is picked up without restarting logcat
+        self._follow = PackageFollow(package, self._model.symbols, devices) if follow else None
+        self._proxy.set_package_pids(self._follow.pids if follow else None)
+
+        # One reader thread and spill buffer per device, all feeding one queue
+        self._spills = {device or "": SpillBuffer(enabled=self._spill_enabled) for device in devices}
+        self._readers = [
+            AdbReader(
+                out_queue=self._queue,
+                adb_path=self._adb_path,
+                device=device,
+                buffer=self._buffer_name,
+                tag_filters=self._tag_filters,
+                pid=pids[device],
+                symbols=self._model.symbols,
+                binary=self._binary,
+                spill=self._spills[device or ""],
+                metrics=self._metrics,
+                session=self._session,
+            )
+            for device in devices
+        ]
+        self._readers_left = len(self._readers)
+        for reader in self._readers:
+            reader.start()
+        if follow:
+            self._follow_request = self._adb.follow(devices, package)
         self._drain_timer.start()
         self._toolbar.set_connected(True)
-        status = f"Connected: {device or 'default'}"
-        if pid:
-            status += f" (PID {pid})"
-        elif package:
-            status += " (no PID filter)"
+        self._update_status()
+
+        serials = [device for device in devices if device]
+        self._show_devices(serials)
+        self._session_info = {
+            "device": ",".join(serials) or None, "devices": serials, "package": package,
+            "pid": ",".join(pid for pid in pids.values() if pid) or None, "buffer": self._buffer_name,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        if follow:
+            self._show_follow_status()
+            return
+        if len(devices) > 1:
+            status = f"Connected: {len(devices)} devices"
+            found = sum(1 for pid in pids.values() if pid)
+            if package:
+                status += f" ({package} on {found} of {len(devices)})" if found else " (no PID filter)"
+        else:
+            status = f"Connected: {devices[0] or 'default'}"
+            if pids[devices[0]]:
+                status += f" (PID {pids[devices[0]]})"
+            elif package:
+                status += " (no PID filter)"
         self._status_conn.setText(status)
 
+    def _show_devices(self, devices: list[str]) -> None:
+        """Offer the device filter and column when several devices are shown."""
+        self._filter_bar.set_devices(devices)
+        self._table.set_device_column_visible(len(devices) > 1)
+
+    def _on_package_pids(self, request: int, device: str | None, pids: list[int]) -> None:
+        if request != self._follow_request or self._follow is None:
+            return  # from a capture since ended
+        if self._follow.add(device, pids):
+            self._follow_changed()
+
+    def _follow_changed(self) -> None:
+        # Rows of a new PID already stored are found by the refilter
+        self._proxy.set_package_pids(self._follow.pids)
+        if self._readers:
+            self._show_follow_status()
+
+    def _show_follow_status(self) -> None:
+        follow = self._follow
+        devices = len(self._readers)
+        where = f" on {devices} devices" if devices > 1 else ""
+        pids = follow.describe()
+        self._status_conn.setText(
+            f"Following {follow.package}{where} " + (f"(PID {pids})" if pids else "(waiting for it to start)")
+        )
+
     def _on_disconnect(self) -> None:
-        if self._reader:
-            self._reader.stop()
-            self._reader = None
-        self._drain_timer.stop()
+        self._connect_request = 0  # a PID lookup still running goes unheard
+        self._follow_request = 0
+        self._adb.unfollow()
+        for reader in self._readers:
+            reader.stop()
+        self._readers = []
+        # The drain timer keeps running until the backlog has been replayed
         self._toolbar.set_connected(False)
         self._status_conn.setText("Disconnected")
 
     def _on_pause(self, paused: bool) -> None:
+        # Paused: keep draining into storage, but views see no row changes
         self._paused = paused
+        self._model.set_frozen(paused)
+        if not paused:
+            self._table.scroll_to_bottom()
+            self._update_status()
+            self._metrics.mark_visible(self._unshown_lines)
+            self._unshown_lines = 0
 
     def _open_log_detail(self, proxy_row: int) -> None:
         model = self._proxy
-        timestamp = model.index(proxy_row, 0).data() or ""
-        pid = model.index(proxy_row, 1).data() or ""
-        tid = model.index(proxy_row, 2).data() or ""
-        priority = model.index(proxy_row, 3).data() or ""
-        tag = model.index(proxy_row, 4).data() or ""
-        message = model.index(proxy_row, 5).data() or ""
-
-        win = LogDetailWindow(timestamp, pid, tid, priority, tag, message)
+        timestamp = model.index(proxy_row, 1).data() or ""
+        pid = model.index(proxy_row, 2).data() or ""
+        tid = model.index(proxy_row, 3).data() or ""
+        priority = model.index(proxy_row, 4).data() or ""
+        tag = model.index(proxy_row, 5).data() or ""
+        message = model.index(proxy_row, 6).data() or ""
+        source_row = model.mapToSource(model.index(proxy_row, 0)).row()
+        storage_row = self._model.storage_row(source_row) if source_row >= 0 else -1
+        uid = self._model.storage.uid(storage_row) if storage_row >= 0 else -1
+
+        win = LogDetailWindow(timestamp, pid, tid, priority, tag, message, uid=str(uid) if uid >= 0 else "")
         self._detail_windows.append(win)
         win.destroyed.connect(lambda: self._detail_windows.remove(win) if win in self._detail_windows else None)
         win.show()
 
     def _on_clear(self) -> None:
-        self._model.clear_all()
+        if self._file_storage is not None:
+            self._close_file()
+        else:
+            self._model.clear_all()
         self._update_status()
 
-    def _on_export(self) -> None:
-        path, selected_filter = QFileDialog.getSaveFileName(
-            self, "Export Logs", "", "Text Files (*.txt);;CSV Files (*.csv)"
+    def _on_open_file(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Log File", "", "Logs and Sessions (*.txt *.log *.prycat);;All Files (*)"
         )
-        if not path:
+        if path:
+            self._open_file(path)
+
+    def _open_file(self, path: str) -> None:
+        try:
+            if is_session(path):
+                storage = SessionStorage(path, self._model.symbols)
+            else:
+                storage = FileStorage(path, self._model.symbols)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Open failed", f"Could not open '{path}':\n{e}")
             return
 
-        rows = []
-        for row in range(self._proxy.rowCount()):
-            cells = []
-            for col in range(self._proxy.columnCount()):
-                idx = self._proxy.index(row, col)
-                cells.append(idx.data() or "")
-            rows.append(cells)
-
-        if path.endswith(".csv"):
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Time", "PID", "TID", "Level", "Tag", "Message"])
-                writer.writerows(rows)
+        # Leave live mode
+        if self._readers or self._connect_request:
+            self._on_disconnect()
+        self._discard_backlog()
+
+        self._cancel_import()
+        self._cancel_export()  # it may be reading the storage being replaced
+        old = self._file_storage
+        self._file_storage = storage
+        self._follow = None
+        self._proxy.set_package_pids(None)
+        self._model.set_storage(storage)
+        if old is not None:
+            old.close()
+        self._file_timer.start()
+        name = os.path.basename(path)
+        self.setWindowTitle(f"prycat — {name}")
+        if isinstance(storage, SessionStorage):
+            self._session_info = dict(storage.metadata)
+            self._parse_btn.hide()
+            if self._session_info.get("device"):
+                self._toolbar.set_device(self._session_info["device"])
+            if self._session_info.get("package"):
+                self._toolbar.set_package(self._session_info["package"])
+            details = [f"{key} {self._session_info[key]}" for key in ("device", "package", "pid")
+                       if self._session_info.get(key)]
+            self._status_conn.setText(f"Session: {name}" + (f" ({', '.join(details)})" if details else ""))
         else:
-            with open(path, "w", encoding="utf-8") as f:
-                for cells in rows:
-                    f.write("\t".join(cells) + "\n")
+            self._session_info = {"source": path}
+            self._parse_btn.show()
+            self._status_conn.setText(f"File: {name}")
+        self._show_devices(self._session_info.get("devices", []))
+        self._update_status()
+
+    def _on_save_session(self) -> None:
+        if self._exporter is not None:
+            QMessageBox.information(self, "Save Session", "An export or save is already running.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Session", "", "prycat Sessions (*.prycat)")
+        if not path:
+            return
+        if not path.endswith(".prycat"):
+            path += ".prycat"
+        metadata = dict(self._session_info, saved=time.strftime("%Y-%m-%d %H:%M:%S"))
+        if self._follow is not None:
+            metadata["pid"] = self._follow.describe() or None
+        # Saved from a worker; ingestion goes on and the rows held now are saved
+        self._exporter = SessionSaver(self._model.storage, path, metadata)
+        self._exporter.start()
+        self._show_export_progress("Save")
+
+    def _sync_file(self) -> None:
+        storage = self._file_storage
+        if storage is None:
+            self._file_timer.stop()
+            return
+        done = not storage.indexing  # checked first so the final rows aren't missed
+        self._model.sync_storage()
+        if self._import is not None:
+            self._parse_progress.setValue(int(self._import.progress * 100))
+            if not self._import.running:
+                self._import = None
+                self._parse_progress.hide()
+                self._parse_btn.hide()  # everything is parsed now
+        self._update_status()
+        if done and self._import is None:
+            self._file_timer.stop()
+
+    def _on_parse_all(self) -> None:
+        if self._import is not None:
+            self._cancel_import()
+            return
+        if self._file_storage is None:
+            return
+        self._import = ParallelImport(self._file_storage)
+        self._import.start()
+        self._parse_progress.setValue(0)
+        self._parse_progress.show()
+        self._parse_btn.setText("Cancel")
+        self._file_timer.start()
+
+    def _cancel_import(self) -> None:
+        if self._import is None:
+            return
+        self._import.cancel()
+        self._import = None
+        self._parse_progress.hide()
+        self._parse_btn.setText("Parse all")
+
+    def _close_file(self) -> None:
+        """Return to an empty live buffer if a file is open."""
+        if self._file_storage is None:
+            return
+        self._cancel_import()
+        self._cancel_export()
+        self._parse_btn.hide()
+        self._file_timer.stop()
+        self._model.reset_storage()
+        self._file_storage.close()
+        self._file_storage = None
+        self._show_devices([])
+        self.setWindowTitle("prycat")
+        self._status_conn.setText("Disconnected")
+
+    def _on_export(self) -> None:
+        if self._exporter is not None:
+            QMessageBox.information(self, "Export", "An export or save is already running.")
+            return
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Export Logs", "", _EXPORT_FILTERS)
+        if not path:
+            return
+        if not path.lower().endswith(_EXPORT_SUFFIXES):
+            path += re.search(r"\*(\.[\w.]+)", selected_filter).group(1)
+
+        devices = not self._table.isColumnHidden(0)
+        self._exporter = Exporter(self._model.storage, self._proxy.accepted_seqs(), path, devices=devices)
+        self._exporter.start()
+        self._show_export_progress("Export")
+
+    def _show_export_progress(self, action: str) -> None:
+        self._export_progress.setFormat(f"{action} %p%")
+        self._export_progress.setValue(0)
+        self._export_progress.show()
+        self._export_cancel.setText(f"Cancel {action.lower()}")
+        self._export_cancel.show()
+        self._export_timer.start()
+
+    def _poll_export(self) -> None:
+        exporter = self._exporter
+        if exporter is None:
+            self._export_timer.stop()
+            return
+        self._export_progress.setValue(int(exporter.progress * 100))
+        if exporter.running:
+            return
+        self._finish_export()
+        name = os.path.basename(exporter.path)
+        if isinstance(exporter, SessionSaver):
+            if exporter.error is not None:
+                QMessageBox.warning(self, "Save failed", f"Could not save '{name}':\n{exporter.error}")
+            elif not exporter.cancelled:
+                self.statusBar().showMessage(f"Saved {exporter.written:,} lines to {name}", 8000)
+            return
+        if exporter.error is not None:
+            QMessageBox.warning(self, "Export failed", f"Could not export '{name}':\n{exporter.error}")
+        elif not exporter.cancelled:
+            message = f"Exported {exporter.written:,} lines to {name}"
+            if exporter.skipped:
+                message += f" ({exporter.skipped:,} evicted before they were written)"
+            self.statusBar().showMessage(message, 8000)
+
+    def _cancel_export(self) -> None:
+        if self._exporter is None:
+            return
+        self._exporter.cancel()
+        self._finish_export()
+
+    def _finish_export(self) -> None:
+        self._exporter = None
+        self._export_timer.stop()
+        self._export_progress.hide()
+        self._export_cancel.hide()
+
+    def _on_metrics_toggled(self, shown: bool) -> None:
+        self._metrics_panel.setVisible(shown)
+        self._status_perf.setVisible(shown)
+        if shown:
+            self._sample_metrics()
+            self._metrics_panel.raise_()
+
+    def _on_export_metrics(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "", "JSON Files (*.json);;CSV Files (*.csv)"
+        )
+        if not path:
+            return
+        text = self._metrics.to_csv() if path.endswith(".csv") else self._metrics.to_json()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write(text)
 
     # ── Drain loop ──────────────────────────────────────
     def _drain_queue(self) -> None:
-        if self._paused:
-            return
+        started = time.perf_counter()
+        depth = self._queue.qsize()
+        self._metrics.observe("queue.depth", depth)
+        # More than a few queued batches (or anything spilled) is a backlog
+        batch = self._take_batch(self._scheduler.batch_limit(depth > 8 or self._spill_pending))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if batch:
+            # The proxy maps inserted/evicted rows incrementally; no refilter
+            self._model.append_batch(batch)
+            if self._follow is not None and self._follow.scan(batch):
+                self._follow_changed()
+            if self._paused:
+                self._unshown_lines += len(batch)
+            else:
+                self._table.scroll_to_bottom()
+                self._metrics.mark_visible(len(batch))
+            self._update_status()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._metrics.observe("drain.ms", elapsed_ms)
+            self._metrics.observe("drain.batch_lines", len(batch))
+        self._drain_timer.setInterval(self._scheduler.record(len(batch), elapsed_ms))
+
+        if self._reader_finished and self._queue.empty() and not self._spill_pending:
+            self._reader_finished = False
+            self._drain_timer.stop()
+            self._update_status()
+            if self._readers:
+                # Readers stopped unexpectedly
+                self._on_disconnect()
+        elif self._reader_stopped:
+            # One of several devices went away; the others keep going
+            self._reader_stopped = False
+            stopped = [reader.device or "default" for reader in self._readers if not reader.running]
+            if stopped:
+                self.statusBar().showMessage(f"Stopped reading {', '.join(stopped)}", 8000)
+
+    def _discard_backlog(self) -> None:
+        """Drop what the previous session's readers left unreplayed.
+
+        Queued batches are dropped unparsed and spill files truncated
+        unread, so this is quick however much was spilled; whatever
+        readers still stopping queue later is ignored as stale.
+        """
+        self._drain_timer.stop()
+        self._session += 1
+        self._reader_finished = False
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for spill in self._spills.values():
+            spill.reset()
+
+    @property
+    def _spill_pending(self) -> bool:
+        return any(spill.pending for spill in self._spills.values())
 
-        batch: list[LogEntry] = []
-        for _ in range(500):
+    def _take_batch(self, limit: int) -> list[LogRecord]:
+        """Up to about ``limit`` lines: queued batches first, then spilled ones."""
+        batch: list[LogRecord] = []
+        while len(batch) < limit:
             try:
-                item = self._queue.get_nowait()
+                session, item = self._queue.get_nowait()
             except queue.Empty:
+                # While anything is spilled its reader queues nothing new, so
+                # each spill file only holds lines newer than that device's
+                # queued ones
+                for spill in self._spills.values():
+                    if len(batch) >= limit:
+                        break
+                    batch.extend(spill.take(limit - len(batch)))
+                # A final None that found the queue full comes after its spill
+                for spill in self._spills.values():
+                    if spill.take_end():
+                        self._reader_ended()
                 break
+            if session != self._session:
+                continue  # queued by a reader of a capture since replaced
             if item is None:
-                # Reader stopped unexpectedly
-                self._on_disconnect()
-                return
-            batch.append(item)
+                self._reader_ended()
+            else:
+                batch.extend(item)
+        return batch
 
-        if batch:
-            self._model.append_batch(batch)
-            self._proxy._refilter()
-            self._table.scroll_to_bottom()
-            self._update_status()
+    def _reader_ended(self) -> None:
+        # Every reader hands over a final None; finished once all have
+        self._readers_left -= 1
+        self._reader_finished = self._readers_left <= 0
+        self._reader_stopped = True
 
     def _update_status(self) -> None:
         filtered = self._proxy.rowCount()
         total = self._model.total_count
         self._status_lines.setText(f"{filtered} / {total} lines")
-        self._status_buf.setText(f"Buffer: {self._model.buffer_percent:.0f}%")
+        if self._import is not None:
+            self._status_buf.setText(f"Parsed: {self._import.parsed_lines:,} lines")
+        elif isinstance(self._file_storage, SessionStorage):
+            self._status_buf.setText("Saved session")
+        elif self._file_storage is not None:
+            self._status_buf.setText(f"Indexed: {self._file_storage.progress * 100:.0f}%")
+        else:
+            model = self._model
+            mb = model.nbytes / (1 << 20)
+            if model.max_bytes:
+                self._status_buf.setText(f"Memory: {mb:.0f} / {model.max_bytes / (1 << 20):.0f} MB")
+            else:
+                self._status_buf.setText(f"Buffer: {model.buffer_percent:.0f}% · {mb:.0f} MB")
+            tooltip = (
+                f"{model.buffer_percent:.0f}% full · {model.bytes_per_entry:.0f} bytes per line\n"
+                f"Filter index: {self._proxy.nbytes / (1 << 20):.1f} MB"
+            )
+            cold = model.cold
+            if cold is not None and len(cold):
+                tooltip += (
+                    f"\nCompressed: {len(cold):,} lines in {cold.nbytes / (1 << 20):.1f} MB"
+                    f" ({cold.ratio:.1f}x)"
+                )
+            self._status_buf.setToolTip(tooltip)
+        spills = self._spills
+        spilled = sum(spill.spilled_lines for spill in spills.values())
+        dropped = sum(spill.dropped_lines for spill in spills.values())
+        self._status_spill.setText(f"Spilled: {spilled} · Dropped: {dropped}")
+        if len(spills) > 1:
+            self._status_spill.setToolTip("\n".join(
+                f"{device}: spilled {spill.spilled_lines} · dropped {spill.dropped_lines}"
+                for device, spill in spills.items()
+            ))
+        else:
+            self._status_spill.setToolTip("")
+        self._status_history.setVisible(self._history is not None and self._file_storage is None)
+        if self._status_history.isVisibleTo(self):
+            mb = self._history.disk_bytes / (1 << 20)
+            self._status_history.setText(f"History: {len(self._history):,} lines · {mb:.0f} MB")
+
+    def _sample_metrics(self) -> None:
+        self._metrics.sample()
+        spills = self._spills
+        self._metrics.gauge("queue.spilled", sum(spill.spilled_lines for spill in spills.values()))
+        self._metrics.gauge("queue.dropped", sum(spill.dropped_lines for spill in spills.values()))
+        if len(spills) > 1:
+            for device, spill in spills.items():
+                self._metrics.gauge(f"device.{device}.spilled", spill.spilled_lines)
+                self._metrics.gauge(f"device.{device}.dropped", spill.dropped_lines)
+        if not self._metrics_panel.isVisible():
+            return
+        snapshot = self._metrics.snapshot()
+        self._metrics_panel.update_metrics(snapshot)
+        latency = snapshot["histograms"].get("pipeline.latency_ms")
+        rate = snapshot["gauges"].get("reader.lines_per_sec", 0)
+        text = f"{rate:,.0f} lines/s"
+        if latency and latency["count"]:
+            text += f" · latency p95 {latency['p95']:.0f} ms"
+        self._status_perf.setText(text)
 
     # ── Cleanup ─────────────────────────────────────────
     def closeEvent(self, event) -> None:
-        if self._reader:
-            self._reader.stop()
+        self._adb.close()
+        for reader in self._readers:
+            reader.stop()
         self._drain_timer.stop()
+        self._metrics_timer.stop()
+        self._file_timer.stop()
+        for spill in self._spills.values():
+            spill.close()
+        self._proxy.shutdown()
+        self._cancel_import()
+        self._cancel_export()
+        if self._file_storage is not None:
+            self._file_storage.close()
+        if self._history is not None:
+            self._history.close()
+        if self._model.cold is not None:
+            self._model.cold.close()
         super().closeEvent(event)
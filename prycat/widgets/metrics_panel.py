@@ -0,0 +1,90 @@
+"""MetricsPanel: live pipeline metrics overlaid on the top-right of the log table."""
+
+from PySide6.QtCore import QEvent, Signal
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
+
+from ..theme import BLUE, CRUST, SURFACE1, TEXT
+
+
+def _rate(value: float) -> str:
+    return f"{value / 1000:.1f}k" if value >= 1000 else f"{value:.0f}"
+
+
+def _hist(snapshot: dict, name: str, unit: str = " ms") -> str:
+    h = snapshot["histograms"].get(name)
+    if not h or not h["count"]:
+        return "—"
+    fmt = ".1f" if unit else ".0f"  # unitless series are counts
+    return f"p50 {h['p50']:{fmt}}{unit}  p95 {h['p95']:{fmt}}{unit}  max {h['max']:{fmt}}{unit}"
+
+
+def format_metrics(snapshot: dict) -> str:
+    """Render a PipelineMetrics snapshot as the panel's fixed-width text."""
+    gauges = snapshot["gauges"]
+    counters = snapshot["counters"]
+    rows = [
+        ("read", f"{_rate(gauges.get('reader.lines_per_sec', 0))} lines/s  {counters.get('reader.lines', 0)} total"),
+        ("parse", _hist(snapshot, "reader.parse_ms")),
+        ("queue", f"depth {_hist(snapshot, 'queue.depth', '')}"),
+        ("overflow", f"spilled {gauges.get('queue.spilled', 0):.0f}  dropped {gauges.get('queue.dropped', 0):.0f}"),
+        ("drain", _hist(snapshot, "drain.ms")),
+        ("batch", _hist(snapshot, "drain.batch_lines", "")),
+        ("shown", f"{_rate(gauges.get('model.lines_per_sec', 0))} lines/s"),
+        ("refilter", _hist(snapshot, "filter.refilter_ms")),
+        ("text pass", _hist(snapshot, "filter.text_pass_ms")),
+        ("latency", _hist(snapshot, "pipeline.latency_ms")),
+        ("paint", _hist(snapshot, "view.paint_ms")),
+    ]
+    return "\n".join(f"{label:<10}{value}" for label, value in rows)
+
+
+class MetricsPanel(QFrame):
+    """Translucent overlay that follows its parent's top-right corner."""
+
+    export_requested = Signal()
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setObjectName("metrics_panel")
+        self.setStyleSheet(
+            f"QFrame#metrics_panel {{"
+            f"  background-color: {CRUST}e6;"
+            f"  border: 1px solid {SURFACE1};"
+            f"  border-radius: 6px;"
+            f"}}"
+        )
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 8, 10, 8)
+        layout.setSpacing(6)
+
+        header = QHBoxLayout()
+        title = QLabel("Pipeline")
+        title.setStyleSheet(f"color: {BLUE}; font-weight: bold;")
+        header.addWidget(title)
+        header.addStretch()
+        export_btn = QPushButton("Export…")
+        export_btn.clicked.connect(self.export_requested.emit)
+        header.addWidget(export_btn)
+        layout.addLayout(header)
+
+        self._body = QLabel()
+        self._body.setStyleSheet(f"color: {TEXT}; font-size: 12px;")
+        layout.addWidget(self._body)
+
+        parent.installEventFilter(self)
+        self.hide()
+
+    def update_metrics(self, snapshot: dict) -> None:
+        self._body.setText(format_metrics(snapshot))
+        self.adjustSize()
+        self._reposition()
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Resize:
+            self._reposition()
+        return False
+
+    def _reposition(self) -> None:
+        parent = self.parentWidget()
+        self.move(max(0, parent.width() - self.width() - 24), 8)
@@ -1,7 +1,8 @@
-"""Toolbar: device selector, connect/disconnect, pause, clear, export."""
+"""Toolbar: device selector, connect/disconnect, open/save, pause, clear, export, metrics."""
 
 from PySide6.QtCore import Signal
 from PySide6.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QHBoxLayout,
     QLabel,
@@ -17,6 +18,9 @@ class Toolbar(QWidget):
     pause_toggled = Signal(bool)
     clear_requested = Signal()
     export_requested = Signal()
+    open_requested = Signal()
+    save_requested = Signal()
+    metrics_toggled = Signal(bool)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -31,6 +35,7 @@ class Toolbar(QWidget):
         self._device_combo = QComboBox()
         self._device_combo.setEditable(True)
         self._device_combo.setMinimumWidth(180)
+        self._device_combo.setToolTip("A device serial, or several separated by commas to capture them together")
         layout.addWidget(self._device_combo)
 
         # Refresh devices
@@ -44,6 +49,15 @@ class Toolbar(QWidget):
         self._package_edit.setMinimumWidth(180)
         layout.addWidget(self._package_edit)
 
+        # Follow the package across restarts
+        self._follow_cb = QCheckBox("Follow")
+        self._follow_cb.setChecked(True)
+        self._follow_cb.setToolTip(
+            "Keep showing the package's lines when it restarts or crashes:\n"
+            "read the whole log and match its PIDs as they appear"
+        )
+        layout.addWidget(self._follow_cb)
+
         # Spacer
         layout.addStretch()
 
@@ -57,6 +71,15 @@ class Toolbar(QWidget):
         self._disconnect_btn.setEnabled(False)
         layout.addWidget(self._disconnect_btn)
 
+        # Open a saved capture
+        self._open_btn = QPushButton("Open")
+        layout.addWidget(self._open_btn)
+
+        # Save the session
+        self._save_btn = QPushButton("Save")
+        self._save_btn.setToolTip("Save all lines as a .prycat session")
+        layout.addWidget(self._save_btn)
+
         # Pause
         self._pause_btn = QPushButton("Pause")
         self._pause_btn.setCheckable(True)
@@ -70,24 +93,40 @@ class Toolbar(QWidget):
         self._export_btn = QPushButton("Export")
         layout.addWidget(self._export_btn)
 
+        # Metrics overlay
+        self._metrics_btn = QPushButton("Metrics")
+        self._metrics_btn.setCheckable(True)
+        layout.addWidget(self._metrics_btn)
+
         # Signals
         self._connect_btn.clicked.connect(self.connect_requested.emit)
         self._disconnect_btn.clicked.connect(self.disconnect_requested.emit)
         self._pause_btn.toggled.connect(self.pause_toggled.emit)
         self._clear_btn.clicked.connect(self.clear_requested.emit)
         self._export_btn.clicked.connect(self.export_requested.emit)
+        self._open_btn.clicked.connect(self.open_requested.emit)
+        self._save_btn.clicked.connect(self.save_requested.emit)
+        self._metrics_btn.toggled.connect(self.metrics_toggled.emit)
 
     # ── Public API ──────────────────────────────────────
     @property
     def refresh_button(self) -> QPushButton:
         return self._refresh_btn
 
-    def current_device(self) -> str:
-        return self._device_combo.currentText().strip()
+    def current_devices(self) -> list[str]:
+        """Serials entered, in order and without repeats; empty for the default device."""
+        serials = (d.strip() for d in self._device_combo.currentText().split(","))
+        return list(dict.fromkeys(d for d in serials if d))
 
     def current_package(self) -> str:
         return self._package_edit.text().strip()
 
+    def follow_package(self) -> bool:
+        return self._follow_cb.isChecked()
+
+    def set_follow_package(self, follow: bool) -> None:
+        self._follow_cb.setChecked(follow)
+
     def set_device(self, device: str) -> None:
         self._device_combo.setCurrentText(device)
 
@@ -98,7 +137,10 @@ class Toolbar(QWidget):
         current = self._device_combo.currentText()
         self._device_combo.clear()
         self._device_combo.addItems(devices)
-        if current in devices:
+        if len(devices) > 1:
+            self._device_combo.addItem(",".join(devices))  # all of them at once
+        if current:
+            # Lists arrive whenever devices come and go; keep what was chosen or typed
             self._device_combo.setCurrentText(current)
 
     def set_connected(self, connected: bool) -> None:
@@ -106,4 +148,5 @@ class Toolbar(QWidget):
         self._disconnect_btn.setEnabled(connected)
         self._device_combo.setEnabled(not connected)
         self._package_edit.setEnabled(not connected)
+        self._follow_cb.setEnabled(not connected)
         self._refresh_btn.setEnabled(not connected)
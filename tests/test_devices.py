@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from prycat.devices import DeviceWatcher
+from prycat.reader import parse_devices
+
+FAKE_ADB = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fakeadb.py")
+app = QCoreApplication.instance() or QCoreApplication([])  # signals from workers arrive queued
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    monkeypatch.setenv("PRYCAT_FAKE_DEVICES", "emulator-5554,R58M123")
+    monkeypatch.setenv("PRYCAT_FAKE_PACKAGE", "com.example.app")
+    watcher = DeviceWatcher(FAKE_ADB)
+    yield watcher
+    watcher.close()
+
+
+def _wait(values, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not values and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert values
+    return values[0]
+
+
+def test_parse_devices_keeps_ready_ones():
+    listing = "List of devices attached\nemulator-5554\tdevice\nR58M123\tunauthorized\n0123\toffline\nabc device\n\n"
+    assert parse_devices(listing) == ["emulator-5554"]
+
+
+def test_refresh_answers_through_the_signal(watcher):
+    lists = []
+    watcher.devices_changed.connect(lists.append)
+    started = time.monotonic()
+    watcher.refresh()
+    assert time.monotonic() - started < 0.1  # adb runs on the pool, not here
+    assert _wait(lists) == ["emulator-5554", "R58M123"]
+
+
+def test_track_devices_reports_the_list(watcher):
+    lists = []
+    watcher.devices_changed.connect(lists.append)
+    watcher.start()
+    assert _wait(lists) == ["emulator-5554", "R58M123"]
+
+
+def test_resolve_pids_per_device(watcher):
+    answers = []
+    watcher.pids_resolved.connect(lambda request, pids: answers.append((request, pids)))
+    request = watcher.resolve_pids(["emulator-5554", "R58M123"], "com.example.app")
+    got, pids = _wait(answers)
+    assert got == request
+    assert set(pids) == {"emulator-5554", "R58M123"} and all(pid and pid.isdigit() for pid in pids.values())
+
+    answers.clear()
+    started = time.monotonic()
+    request = watcher.resolve_pids([None], "com.example.missing", attempts=2, delay=0.2)
+    assert _wait(answers) == (request, {None: None})
+    assert time.monotonic() - started >= 0.2  # retried once before giving up
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from prycat.filtering import LogFilter
+from prycat.logfile import FileStorage
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+FAKE_ADB = os.path.join(ROOT, "benchmarks", "fakeadb.py")
+
+
+def _prycat(*args, **env):
+    result = subprocess.run(
+        [sys.executable, "-m", "prycat", "--headless", "--adb-path", FAKE_ADB, *args],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PRYCAT_FAKE_RATE": "0", "PRYCAT_FAKE_LINES": "3000", **env},
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout, result.stderr
+
+
+def test_file_is_filtered_to_jsonl(tmp_path):
+    capture = tmp_path / "capture.txt"
+    with open(capture, "w") as f:
+        for i in range(5_000):
+            f.write(f"10-17 03:20:{i // 1000:02d}.{i % 1000:03d}  {100 + i % 3}  200 {'VDIWEF'[i % 6]} Tag{i % 4}: line {i}\n")
+    out = tmp_path / "out.jsonl"
+    _, stderr = _prycat("--file", str(capture), "--min-level", "I", "--filter-pid", "101", "--search", "line 1", "-o", str(out))
+
+    reference = LogFilter()
+    reference.set_min_priority("I")
+    reference.set_pid("101")
+    reference.set_text("line 1")
+    storage = FileStorage(str(capture))
+    try:
+        while storage.indexing:
+            time.sleep(0.01)
+        expected = [storage.message(row) for row in reference.accepted_rows(storage).tolist()]
+    finally:
+        storage.close()
+    with open(out, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["message"] for r in records] == expected and expected
+    assert all(r["pid"] == 101 and r["level"] in "IWEF" for r in records)
+    assert f"5,000 lines read, {len(expected):,} written" in stderr
+
+
+def test_live_text_and_binary_agree():
+    # The fake device prints threadtime in UTC; binary times must match it
+    # whatever the host's zone
+    text, _ = _prycat(TZ="America/New_York")
+    binary, stderr = _prycat("--binary", TZ="America/New_York")
+    assert text.count("\n") == 3_000 and "3,000 lines read, 3,000 written" in stderr
+    assert binary == text
+
+
+def test_follow_writes_only_the_package_in_order():
+    everything, _ = _prycat()
+    followed, _ = _prycat("-p", "com.example.app")
+    pid = subprocess.run([sys.executable, FAKE_ADB, "shell", "pidof", "com.example.app"],
+                         capture_output=True, text=True).stdout.split()[0]
+    expected = [line for line in everything.splitlines() if line.split("\t")[1] == pid]
+    assert followed.splitlines() == expected and expected
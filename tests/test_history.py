@@ -0,0 +1,45 @@
+import numpy as np
+
+from prycat.history import HistoryStore
+from prycat.models import LogcatModel
+from prycat.storage import LogRecord
+
+
+def _records(symbols, start, count):
+    tag = symbols.intern("Tag")
+    return [LogRecord((start + i) * 1_000_000, 100, 101, 3, tag, f"message {start + i} " + "x" * 150)
+            for i in range(count)]
+
+
+def test_cold_store_keeps_its_row_cap_under_a_byte_budget():
+    # The live buffer's share of the budget holds far fewer than its 65536 rows
+    model = LogcatModel(maxlen=70_000, max_bytes=4 << 20, compression="zlib")
+    storage = model.storage
+    start = 0
+    for count in (3_000, 3_000, 3_000, 20_000, 300, 100_000, 1_000):
+        model.append_batch(_records(model.symbols, start, count))
+        start += count
+        assert model.rowCount() == len(storage)
+        # Within a few rows: what the live budget pushes out is estimated
+        assert len(storage.history) <= storage.history.max_rows + 16
+        # Rows leave from the front only: the newest are all there, in order
+        timestamps = storage.column("timestamp")
+        assert timestamps[-1] == (start - 1) * 1_000_000
+        assert (np.diff(timestamps) == 1_000_000).all()
+    model.cold.close()
+
+
+def test_history_pages_archived_rows_back(tmp_path):
+    history = HistoryStore(str(tmp_path), quota_bytes=64 << 20)
+    model = LogcatModel(maxlen=5_000, history=history)
+    for start in range(0, 60_000, 7_500):
+        model.append_batch(_records(model.symbols, start, 7_500))
+    storage = model.storage
+    try:
+        assert model.rowCount() == len(storage) == 60_000
+        assert len(history) > 0 and history.disk_bytes > 0
+        for row in (0, 1, 4_095, 4_096, 30_000, len(history) - 1, len(history), 59_999):
+            assert storage.message(row) == f"message {row} " + "x" * 150
+        assert (np.diff(storage.column("timestamp")) == 1_000_000).all()
+    finally:
+        history.close()
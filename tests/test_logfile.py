@@ -0,0 +1,72 @@
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from prycat.filtering import LogFilter
+from prycat.logfile import BLOCK_LINES, FileStorage
+from prycat.models import LogcatFilterProxy, LogcatModel
+
+LEVELS = "VDIWEF"
+app = QCoreApplication.instance() or QCoreApplication([])  # for the proxy's pump timer
+
+
+def _capture(path, lines):
+    with open(path, "w") as f:
+        for i in range(lines):
+            f.write(f"10-17 03:20:{i // 1000 % 60:02d}.{i % 1000:03d}  {100 + i % 3}  200 {LEVELS[i % 6]} Tag{i % 5}: line {i}\n")
+
+
+def _open(path):
+    storage = FileStorage(str(path), cache_blocks=4)
+    while storage.indexing:
+        time.sleep(0.01)
+    return storage
+
+
+def test_file_filter_runs_in_steps(tmp_path):
+    _capture(tmp_path / "capture.txt", 20 * BLOCK_LINES + 17)
+    storage = _open(tmp_path / "capture.txt")
+    try:
+        model = LogcatModel()
+        model.set_storage(storage)
+        proxy = LogcatFilterProxy()
+        proxy.setSourceModel(model)
+        proxy.set_min_priority("W")
+        proxy.set_pid_filter("101")
+        # Nothing is parsed up front; the pump filters a bounded slice per tick
+        assert proxy.rowCount() == 0 and proxy.is_filtering
+        steps = 0
+        while proxy.is_filtering:
+            proxy._pump_text_stage()
+            steps += 1
+        assert steps > 1
+        assert len(storage._blocks) <= 4
+
+        expected = LogFilter()
+        expected.set_min_priority("W")
+        expected.set_pid("101")
+        assert proxy.accepted_rows.tolist() == expected.accepted_rows(storage).tolist()
+        proxy.shutdown()
+    finally:
+        storage.close()
+
+
+def test_file_text_filter_after_column_steps(tmp_path):
+    _capture(tmp_path / "capture.txt", 6 * BLOCK_LINES)
+    storage = _open(tmp_path / "capture.txt")
+    try:
+        model = LogcatModel()
+        model.set_storage(storage)
+        proxy = LogcatFilterProxy()
+        proxy.setSourceModel(model)
+        proxy.set_tag_filter({"Tag2"})
+        proxy.set_text_filter(r"line \d*7$", use_regex=True)
+        deadline = time.monotonic() + 60
+        while proxy.is_filtering and time.monotonic() < deadline:
+            proxy._pump_text_stage()
+            time.sleep(0.005)
+        rows = proxy.accepted_rows.tolist()
+        assert rows == [r for r in range(len(storage)) if r % 5 == 2 and r % 10 == 7]
+        proxy.shutdown()
+    finally:
+        storage.close()
@@ -0,0 +1,66 @@
+import random
+
+from prycat.filtering import LogFilter
+from prycat.models import LogcatFilterProxy, LogcatModel
+from prycat.storage import LogRecord
+
+
+def _batch(symbols, rnd, start, count):
+    tags = [symbols.intern(f"Tag{i}") for i in range(4)]
+    return [LogRecord(i, rnd.choice((100, 200, 300)), 1, rnd.randrange(6), rnd.choice(tags), f"line {i}")
+            for i in range(start, start + count)]
+
+
+def _expected(model, pid=None, min_priority=0, tags=()):
+    storage = model.storage
+    return [row for row in range(len(storage))
+            if (pid is None or storage.pid(row) == pid)
+            and storage.priority(row) >= min_priority
+            and (not tags or storage.tag(row) in tags)]
+
+
+def test_column_filters_match_a_row_by_row_check():
+    rnd = random.Random(4)
+    model = LogcatModel(maxlen=10_000)
+    model.append_batch(_batch(model.symbols, rnd, 0, 8_000))
+    proxy = LogcatFilterProxy()
+    proxy.setSourceModel(model)
+    assert proxy.rowCount() == 8_000
+
+    proxy.set_min_priority("W")
+    proxy.set_pid_filter("200")
+    proxy.set_tag_filter({"Tag1", "Tag3"})
+    expected = _expected(model, 200, 3, {"Tag1", "Tag3"})
+    assert proxy.accepted_rows.tolist() == expected
+    assert proxy.rowCount() == len(expected)
+    assert proxy.mapToSource(proxy.index(5, 6)).row() == expected[5]
+    assert proxy.index(5, 6).data() == model.index(expected[5], 6).data()
+
+    proxy.set_pid_filter("abc")  # can never match
+    assert proxy.rowCount() == 0
+    for setter, value in ((proxy.set_pid_filter, ""), (proxy.set_tag_filter, set()), (proxy.set_min_priority, "V")):
+        setter(value)
+    assert proxy.rowCount() == 8_000 and proxy.mapToSource(proxy.index(7_999, 0)).row() == 7_999
+    proxy.shutdown()
+
+
+def test_appends_and_evictions_update_the_mapping_in_place():
+    rnd = random.Random(5)
+    model = LogcatModel(maxlen=5_000)
+    proxy = LogcatFilterProxy()
+    proxy.setSourceModel(model)
+    proxy.set_min_priority("I")
+    proxy.set_pid_filter("100")
+    resets = []
+    proxy.modelReset.connect(lambda: resets.append(1))
+    start = 0
+    for count in (3_000, 1_500, 2_000, 40, 6_000, 1):
+        model.append_batch(_batch(model.symbols, rnd, start, count))
+        start += count
+        assert proxy.accepted_rows.tolist() == _expected(model, 100, 2)
+        reference = LogFilter()
+        reference.set_min_priority("I")
+        reference.set_pid("100")
+        assert proxy.accepted_rows.tolist() == reference.accepted_rows(model.storage).tolist()
+    assert not resets  # only row inserts and removals, never a full refilter
+    proxy.shutdown()
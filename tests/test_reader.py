@@ -0,0 +1,72 @@
+import queue
+import struct
+import zoneinfo
+
+import pytest
+
+from prycat.reader import AdbReader
+from prycat.storage import epoch_to_timestamp, format_timestamp
+from prycat.symbols import SymbolTable
+
+SEC, NSEC = 1_760_000_000, 123_456_789
+
+
+def _entry(hdr_size, pid, tid, priority, tag, message, uid=0):
+    payload = bytes([priority]) + tag + b"\0" + message + b"\0"
+    header = struct.pack("<HHiiII", len(payload), hdr_size, pid, tid, SEC, NSEC)
+    size = hdr_size or 20
+    if size >= 24:
+        header += struct.pack("<I", 3)  # lid: main
+    if size >= 28:
+        header += struct.pack("<I", uid)
+    return header + payload
+
+
+def _parse(data, symbols=None, zone=None):
+    reader = AdbReader(queue.Queue(), device="emulator-5554", symbols=symbols, binary=True)
+    reader._zone = zone
+    return reader._parse_binary(data, {}, None)
+
+
+@pytest.mark.parametrize("hdr_size", [0, 20, 24, 28])
+def test_binary_header_versions_decode(hdr_size):
+    data = _entry(hdr_size, 100, 101, 4, b"Tag", b"hello", uid=10_057) + _entry(hdr_size, 7, 8, 6, b"Other", b"a\nb")
+    symbols = SymbolTable()
+    records, used = _parse(data, symbols)
+    assert used == len(data)
+    assert [r.message for r in records] == ["hello", "a", "b"]
+    first = records[0]
+    assert (first.pid, first.tid, first.priority) == (100, 101, 2)  # ANDROID_LOG_INFO -> I
+    assert first.tag == symbols.code("Tag")
+    assert first.timestamp == epoch_to_timestamp(SEC, NSEC)
+    assert first.device == symbols.code("emulator-5554")
+    assert first.uid == (10_057 if hdr_size == 28 else -1)
+    assert records[1].priority == 4 and records[1].pid == 7
+
+
+def test_binary_partial_entry_is_left_for_next_read():
+    data = _entry(28, 1, 2, 4, b"Tag", b"whole", uid=0)
+    records, used = _parse(data + data[:30])
+    assert [r.message for r in records] == ["whole"] and used == len(data)
+
+
+def test_binary_rejects_unknown_header():
+    with pytest.raises(ValueError):
+        _parse(_entry(20, 1, 2, 4, b"Tag", b"x")[:2] + b"\x10\x00" + b"\0" * 40)
+
+
+def test_binary_timestamps_use_the_device_zone():
+    # 2025-10-09 08:53:20 UTC: summer time in Berlin, daylight time in New York
+    data = _entry(28, 1, 2, 4, b"Tag", b"x")
+    berlin, = _parse(data, zone=zoneinfo.ZoneInfo("Europe/Berlin"))[0]
+    new_york, = _parse(data, zone=zoneinfo.ZoneInfo("America/New_York"))[0]
+    assert format_timestamp(berlin.timestamp) == "10-09 10:53:20.123"
+    assert format_timestamp(new_york.timestamp) == "10-09 04:53:20.123"  # as threadtime prints them there
+
+
+def test_epoch_to_timestamp_follows_daylight_saving():
+    zone = zoneinfo.ZoneInfo("Europe/Berlin")
+    winter, summer = 1_736_935_200, 1_752_573_600  # 2025-01-15 and 2025-07-15, 10:00 UTC
+    assert format_timestamp(epoch_to_timestamp(winter, 0, zone)).endswith("11:00:00.000")
+    assert format_timestamp(epoch_to_timestamp(summer, 0, zone)).endswith("12:00:00.000")
+    assert epoch_to_timestamp(winter, 5, zoneinfo.ZoneInfo("UTC")) % 86_400_000_000_000 == 10 * 3_600_000_000_000 + 5
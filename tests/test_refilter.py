@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+from PySide6.QtCore import QCoreApplication
+
+from prycat.filtering import LogFilter
+from prycat.models import LogcatFilterProxy, LogcatModel
+from prycat.refilter import CHUNK_ROWS, TextMatchWorker
+from prycat.storage import LogRecord
+
+app = QCoreApplication.instance() or QCoreApplication([])  # for the proxy's pump timer
+
+
+def _results(worker, count, timeout=30):
+    done = []
+    deadline = time.monotonic() + timeout
+    while len(done) < count and time.monotonic() < deadline:
+        done.extend(worker.results())
+        time.sleep(0.01)
+    return done
+
+
+def _pump(proxy, timeout=60):
+    deadline = time.monotonic() + timeout
+    while proxy.is_filtering and time.monotonic() < deadline:
+        proxy._pump_text_stage()
+        time.sleep(0.005)
+    assert not proxy.is_filtering
+
+
+def test_worker_matches_and_drops_stale_generations():
+    worker = TextMatchWorker()
+    try:
+        seqs = np.arange(4, dtype=np.int64)
+        texts = ["Tag alpha", "Tag BETA", "Other gamma", "tag beta2"]
+        worker.cancel(1)  # start generation 1, as the proxy does
+        worker.submit(1, seqs, texts, "beta", False)
+        (generation, got, mask), = _results(worker, 1)
+        assert generation == 1 and got is seqs and mask.tolist() == [False, True, False, True]
+        worker.submit(1, seqs, texts, r"^tag \w+\d$", True)
+        assert _results(worker, 1)[0][2].tolist() == [False, False, False, True]
+
+        worker.cancel(2)
+        worker.submit(1, seqs, texts, "a", False)  # submitted under a cancelled generation
+        worker.submit(2, seqs, texts, "gamma", False)
+        assert [(g, m.tolist()) for g, _, m in _results(worker, 1)] == [(2, [False, False, True, False])]
+    finally:
+        worker.close()
+
+
+def test_cancel_kills_a_catastrophic_regex():
+    worker = TextMatchWorker()
+    try:
+        seqs = np.arange(2, dtype=np.int64)
+        worker.cancel(1)
+        worker.submit(1, seqs, ["a" * 40 + "!"] * 2, r"(a+)+$", True)
+        time.sleep(0.5)  # let the match start
+        started = time.monotonic()
+        worker.cancel(2)
+        worker.submit(2, seqs, ["quick", "match"], "quick", True)
+        (generation, _, mask), = _results(worker, 1)
+        assert generation == 2 and mask.tolist() == [True, False]
+        assert time.monotonic() - started < 10
+    finally:
+        worker.close()
+
+
+def test_text_filter_merges_newest_first():
+    model = LogcatModel(maxlen=100_000)
+    tag = model.symbols.intern("Tag")
+    model.append_batch([LogRecord(i, 1, 1, 2, tag, f"row {i} {'needle' if i % 3 == 0 else 'hay'}")
+                        for i in range(5 * CHUNK_ROWS)])
+    proxy = LogcatFilterProxy()
+    proxy.setSourceModel(model)
+    first_inserts = []
+    proxy.rowsInserted.connect(lambda parent, first, last: first_inserts.append(proxy.mapToSource(proxy.index(first, 0)).row()))
+
+    proxy.set_text_filter("nee")
+    proxy.set_text_filter("needle")  # typing on cancels the pass for "nee"
+    _pump(proxy)
+    reference = LogFilter()
+    reference.set_text("needle")
+    assert proxy.accepted_rows.tolist() == reference.accepted_rows(model.storage).tolist()
+    # The newest chunk lands first, then older ones above it
+    assert first_inserts == sorted(first_inserts, reverse=True)
+
+    # Rows appended meanwhile go through the same stage
+    model.append_batch([LogRecord(0, 1, 1, 2, tag, "late needle"), LogRecord(0, 1, 1, 2, tag, "late")])
+    _pump(proxy)
+    assert proxy.accepted_rows[-1] == len(model.storage) - 2
+    proxy.shutdown()
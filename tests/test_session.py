@@ -0,0 +1,81 @@
+import threading
+import time
+
+from prycat.session import SessionSaver, SessionStorage, save_session
+from prycat.storage import LogRecord, LogStorage
+from prycat.symbols import SymbolTable
+
+
+def _storage(rows):
+    storage = LogStorage(rows)
+    symbols = storage.symbols
+    tags = [symbols.intern(f"Tag{i}") for i in range(7)]
+    devices = [-1, symbols.intern("emulator-5554"), symbols.intern("R58M123")]
+    storage.extend(
+        LogRecord(i * 1_000_000, 1000 + i % 5, 2000 + i % 3, i % 7, tags[i % 7], f"message {i} ünïcode",
+                  10_000 + i if i % 2 else -1, devices[i % 3])
+        for i in range(rows)
+    )
+    return storage
+
+
+def test_round_trip(tmp_path):
+    storage = _storage(40_000)
+    path = str(tmp_path / "capture.prycat")
+    assert save_session(storage, path, {"package": "com.example"}) == len(storage)
+
+    # Reopened with a table that already knows other symbols, as the GUI does
+    symbols = SymbolTable()
+    symbols.intern("Unrelated")
+    session = SessionStorage(path, symbols)
+    try:
+        assert len(session) == len(storage)
+        assert session.metadata == {"package": "com.example"}
+        for row in (0, 1, 2, 8191, 8192, 39_999):
+            assert session.entry(row) == storage.entry(row)
+            assert session.uid(row) == storage.uid(row)
+        for name in ("timestamp", "pid", "tid", "priority", "uid"):
+            assert (session.column(name) == storage.column(name)).all()
+        assert [symbols.lookup(c) for c in session.column("tag")] == [storage.tag(r) for r in range(len(storage))]
+        assert [session.device(r) for r in range(len(session))] == [storage.device(r) for r in range(len(storage))]
+        assert session.text_candidates([b"mes"]).all()
+    finally:
+        session.close()
+
+
+def test_saver_writes_empty_session(tmp_path):
+    saver = SessionSaver(LogStorage(100), str(tmp_path / "empty.prycat"))
+    saver.start()
+    while saver.running:
+        time.sleep(0.01)
+    assert saver.error is None and saver.written == 0 and saver.progress == 1.0
+    session = SessionStorage(saver.path)
+    try:
+        assert len(session) == 0
+        assert session.column("timestamp").size == 0
+    finally:
+        session.close()
+
+
+def test_cancelled_save_leaves_nothing(tmp_path):
+    path = tmp_path / "capture.prycat"
+    cancel = threading.Event()
+    cancel.set()
+    assert save_session(_storage(1_000), str(path), cancel=cancel) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_saver_keeps_rows_held_at_start(tmp_path):
+    storage = _storage(20_000)
+    saver = SessionSaver(storage, str(tmp_path / "capture.prycat"))
+    saver.start()
+    storage.evict(100)  # ingestion goes on once start() returns
+    storage.extend(LogRecord(0, 1, 1, 2, 0, "late") for _ in range(100))
+    while saver.running:
+        time.sleep(0.01)
+    assert saver.error is None and saver.written == 20_000
+    session = SessionStorage(saver.path)
+    try:
+        assert session.message(0) == "message 0 ünïcode"
+    finally:
+        session.close()
@@ -0,0 +1,75 @@
+import queue
+
+from prycat.spill import SpillBuffer
+from prycat.storage import LogRecord
+
+
+def _batch(start, count):
+    return [LogRecord(i, 1, 2, 3, 0, f"line {i}", -1, -1) for i in range(start, start + count)]
+
+
+def _drain(out_queue, spill):
+    """What a consumer sees: queued batches first, then spilled ones."""
+    lines = []
+    while True:
+        try:
+            _, batch = out_queue.get_nowait()
+        except queue.Empty:
+            break
+        if batch is not None:
+            lines.extend(batch)
+    while records := spill.take(1_000):
+        lines.extend(records)
+    return lines
+
+
+def test_overflow_spills_and_replays_in_order():
+    out_queue = queue.Queue(maxsize=2)
+    spill = SpillBuffer()
+    for start in range(0, 1_000, 100):
+        assert spill.put(out_queue, _batch(start, 100), session=7)
+    assert spill.pending and spill.spilled_lines == 800 and spill.dropped_lines == 0
+    assert out_queue.queue[0][0] == 7
+
+    # Once lines are spilled, later batches follow them to disk even if
+    # the queue has room again, so nothing overtakes them
+    out_queue.get_nowait()
+    spill.put(out_queue, _batch(1_000, 100))
+    assert out_queue.qsize() == 1 and spill.spilled_lines == 900
+
+    lines = [r.message for r in _drain(out_queue, spill)]
+    assert lines == [f"line {i}" for i in range(100, 1_100)]
+    assert not spill.pending
+    assert spill.put(out_queue, _batch(0, 1)) and out_queue.qsize() == 1  # queued again
+    spill.close()
+
+
+def test_disabled_spill_drops_and_counts():
+    out_queue = queue.Queue(maxsize=1)
+    spill = SpillBuffer(enabled=False)
+    assert spill.put(out_queue, _batch(0, 10))
+    assert not spill.put(out_queue, _batch(10, 10))
+    assert spill.dropped_lines == 10 and spill.spilled_lines == 0 and not spill.pending
+
+
+def test_end_marker_comes_after_spilled_lines():
+    out_queue = queue.Queue(maxsize=1)
+    spill = SpillBuffer()
+    spill.put(out_queue, _batch(0, 5))
+    spill.put(out_queue, _batch(5, 5))
+    assert spill.put(out_queue, None)  # never blocks, even with the queue full
+    assert out_queue.qsize() == 1 and not spill.take_end()  # lines still spilled
+    assert len(_drain(out_queue, spill)) == 10
+    assert spill.take_end() and not spill.take_end()  # due once
+
+
+def test_reset_discards_without_replaying():
+    out_queue = queue.Queue(maxsize=1)
+    spill = SpillBuffer()
+    for start in range(0, 50, 10):
+        spill.put(out_queue, _batch(start, 10))
+    spill.put(out_queue, None)
+    spill.reset()
+    assert not spill.pending and not spill.take_end()
+    assert spill.spilled_lines == 0 and spill.take(100) == []
+    spill.close()
@@ -0,0 +1,77 @@
+import pytest
+
+from prycat.models import LogcatModel
+from prycat.storage import LogRecord, LogStorage
+
+
+def _records(symbols, count, length=200):
+    tag = symbols.intern("Tag")
+    return [LogRecord(i * 1_000_000, 100, 101, 3, tag, "x" * length) for i in range(count)]
+
+
+def test_room_is_what_extend_takes():
+    storage = LogStorage(100_000, max_bytes=1 << 20)
+    records = _records(storage.symbols, 20_000)
+    room = storage.room(len(records), sum(len(r.message) for r in records))
+    assert 0 < room < len(records)
+    storage.extend(records[-room:])
+    assert len(storage) == room
+
+
+def test_append_batch_under_budget_matches_storage():
+    model = LogcatModel(maxlen=100_000, max_bytes=1 << 20)
+    for count in (20_000, 250_000, 300, 5):
+        model.append_batch(_records(model.symbols, count))
+        assert model.rowCount() == len(model.storage)
+        assert model.storage.nbytes <= model.max_bytes
+        assert model.storage.message(model.rowCount() - 1) == "x" * 200
+
+
+def test_append_batch_without_budget_keeps_newest():
+    model = LogcatModel(maxlen=1_000)
+    model.append_batch(_records(model.symbols, 2_500))
+    assert model.rowCount() == len(model.storage) == 1_000
+    assert model.storage.timestamp(0) == 1_500 * 1_000_000
+
+
+def test_ring_keeps_newest_rows_across_wraps():
+    storage = LogStorage(1_000)
+    tag = storage.symbols.intern("Tag")
+    seq = 0
+    for count in (600, 700, 999, 3, 1_000):
+        storage.extend(LogRecord(i, i % 7, 2, i % 6, tag, f"línea {i}", -1, -1) for i in range(seq, seq + count))
+        seq += count
+        assert len(storage) == min(seq, 1_000)
+        assert storage.first_seq == seq - len(storage)
+        # Columns come back in row order even where the ring wraps
+        assert storage.column("timestamp").tolist() == list(range(storage.first_seq, seq))
+    for row in (0, 1, 499, 999):
+        value = storage.first_seq + row
+        assert storage.message(row) == f"línea {value}"
+        assert storage.entry(row).priority == "VDIWEF"[value % 6]
+        assert storage.pid(row) == value % 7 and storage.tag(row) == "Tag"
+
+
+def test_evict_and_clear():
+    storage = LogStorage(100)
+    storage.extend(_records(storage.symbols, 80, length=10))
+    storage.evict(30)
+    assert len(storage) == 50 and storage.first_seq == 30
+    assert storage.timestamp(0) == 30 * 1_000_000
+    with pytest.raises(IndexError):
+        storage.message(50)
+    storage.clear()
+    assert len(storage) == 0 and storage.first_seq == 80
+    storage.extend(_records(storage.symbols, 5, length=10))
+    assert storage.message(4) == "x" * 10
+
+
+def test_bytes_per_entry_is_mostly_the_message():
+    storage = LogStorage(100_000)
+    storage.extend(_records(storage.symbols, 100_000, length=80))
+    # Columns and index cost well under the message itself, and the arena
+    # does not grow with eviction
+    assert storage.bytes_per_entry < 80 + 96
+    before = storage.nbytes
+    storage.extend(_records(storage.symbols, 50_000, length=80))
+    assert storage.nbytes <= before * 1.3
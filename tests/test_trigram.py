@@ -0,0 +1,65 @@
+import random
+import re
+
+from prycat.trigram import BLOCK_ROWS, TrigramIndex, fold, regex_literals
+
+PATTERNS = [
+    "ActivityManager",
+    "colou?r",
+    "ab+c",
+    "ab*cd",
+    "(foo)?barbaz",
+    "(?:abc|abd)efg",
+    "abc|xyz",
+    "x{0}abcd",
+    "(abc){2,}",
+    "(?>abc)def",
+    r"\bbar\d+baz",
+    "[ab]cde.fgh",
+    "(?i:AbC)Dabc",
+    "(?-i:abc)DEF",
+    "^start.*end$",
+    "a.b.c",
+]
+
+
+def _texts(count, seed=1):
+    rnd = random.Random(seed)
+    words = ["abc", "ABC", "abd", "cde", "efg", "fgh", "bar", "baz", "foo", "xyz", "col", "our", "or",
+             "DEF", "d", "start", "end", "ActivityManager", "activitymanager", "7", " ", ".", "a", "b"]
+    return ["".join(rnd.choice(words) for _ in range(rnd.randint(1, 12))) for _ in range(count)]
+
+
+def test_regex_literals_are_in_every_match():
+    texts = _texts(20_000)
+    for pattern in PATTERNS:
+        regex = re.compile(pattern, re.IGNORECASE)
+        literals = [fold(literal) for literal in regex_literals(pattern)]
+        matched = [text for text in texts if regex.search(text)]
+        assert matched, pattern
+        for text in matched:
+            folded = fold(text)
+            assert all(literal in folded for literal in literals), (pattern, text)
+
+
+def test_regex_literals_skip_optional_parts():
+    assert regex_literals("(foo)?barbaz") == ["barbaz"]
+    assert regex_literals("abc|xyz") == []
+    assert regex_literals("colou?r") == ["colo", "r"]
+    assert regex_literals("[unclosed") == []
+
+
+def test_index_candidates_cover_every_match():
+    texts = _texts(10 * BLOCK_ROWS, seed=2)
+    index = TrigramIndex(len(texts))
+    index.add(0, texts)
+    last_block = (len(texts) - 1) // BLOCK_ROWS
+    for pattern in PATTERNS:
+        regex = re.compile(pattern, re.IGNORECASE)
+        needles = [n for n in map(fold, regex_literals(pattern)) if len(n) >= 3]
+        if not needles:
+            continue
+        candidates = set(index.candidate_blocks(needles, 0, last_block).tolist())
+        for row, text in enumerate(texts):
+            if regex.search(text):
+                assert row // BLOCK_ROWS in candidates, (pattern, text)